@@ -2,11 +2,19 @@
 
 PDFConverter 和 OfficeGenerator 存在相同的 executor / _owns_executor / cleanup 模式。
 提取到此 mixin 以消除重复代码。
+
+LazyProcessPoolExecutor 供预览渲染和文档解析使用，首次提交任务时才启动工作进程。
 """
 
 from __future__ import annotations
 
-from concurrent.futures import ThreadPoolExecutor
+import threading
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
 
 from astrbot.api import logger
 
@@ -22,7 +30,7 @@ class ExecutorOwnerMixin:
         self,
         executor: ThreadPoolExecutor | None,
         *,
-        max_workers: int = 2,
+        max_workers: int | None = None,
         label: str = "",
     ) -> None:
         current_executor = self._executor
@@ -35,6 +43,8 @@ class ExecutorOwnerMixin:
             current_executor.shutdown(wait=False)
 
         self._owns_executor = executor is None
+        # max_workers 为 None 时沿用标准库默认值 min(32, cpu_count + 4)，
+        # 生成/转换主要是文件 I/O 与序列化，不应只开 2 个线程
         self._executor = (
             executor
             if executor is not None
@@ -60,3 +70,34 @@ class ExecutorOwnerMixin:
                 "ExecutorOwnerMixin requires _init_executor() before use"
             )
         return executor
+
+
+class LazyProcessPoolExecutor(Executor):
+    """首次提交任务时才创建的进程池
+
+    插件加载时宿主已是多线程的 asyncio 进程，提前 fork/spawn 工作进程既有风险也浪费资源；
+    从未提交过任务时 shutdown 不会启动任何进程。
+    """
+
+    def __init__(self, max_workers: int | None = None) -> None:
+        self._max_workers = max_workers
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._shutdown = False
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+            executor = self._executor
+        return executor.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        with self._lock:
+            self._shutdown = True
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=cancel_futures)
@@ -9,6 +9,7 @@ from typing import TYPE_CHECKING, Any
 from .settings import PluginSettings
 
 if TYPE_CHECKING:
+    from .._executor_mixin import LazyProcessPoolExecutor
     from ..services.image_asset_service import ImageAssetService
     from ..services.message_buffer import MessageBuffer
     from ..services.office_generator import OfficeGenerator
@@ -42,6 +43,8 @@ class PluginRuntimeBundle:
     temp_dir: tempfile.TemporaryDirectory | None
     plugin_data_path: Path
     executor: ThreadPoolExecutor
+    render_executor: LazyProcessPoolExecutor | None
+    extract_executor: LazyProcessPoolExecutor | None
     office_gen: OfficeGenerator
     pdf_converter: PDFConverter
     preview_gen: PreviewGenerator
@@ -26,10 +26,12 @@ class PluginSettings:
     require_at_in_group: bool
     enable_features_in_group: bool
     allow_all_users: bool
+    whitelist_users: tuple[str, ...]
     auto_block_execution_tools: bool
     allow_local_excel_script: bool
     enable_preview: bool
     preview_dpi: int
+    preview_grayscale: bool
     allow_external_input_files: bool
     feature_settings: dict
     recent_text_ttl_seconds: int
@@ -131,12 +133,16 @@ def load_plugin_settings(config) -> PluginSettings:
     enable_features_in_group = trigger_settings.get("enable_features_in_group", False)
     permission_settings = config.get("permission_settings", {})
     allow_all_users = permission_settings.get("allow_all_users", False)
+    whitelist_users = tuple(
+        str(user_id) for user_id in permission_settings.get("whitelist_users") or []
+    )
     auto_block_execution_tools = trigger_settings.get(
         "auto_block_execution_tools", True
     )
     allow_local_excel_script = trigger_settings.get("allow_local_excel_script", False)
     enable_preview = preview_settings.get("enable", True)
-    preview_dpi = preview_settings.get("dpi", 150)
+    preview_dpi = preview_settings.get("dpi", 100)
+    preview_grayscale = bool(preview_settings.get("grayscale", False))
     allow_external_input_files = read_settings.get(
         "allow_external_input_files",
         path_settings.get("allow_external_input_files", False),
@@ -200,10 +206,12 @@ def load_plugin_settings(config) -> PluginSettings:
         require_at_in_group=require_at_in_group,
         enable_features_in_group=enable_features_in_group,
         allow_all_users=allow_all_users,
+        whitelist_users=whitelist_users,
         auto_block_execution_tools=auto_block_execution_tools,
         allow_local_excel_script=allow_local_excel_script,
         enable_preview=enable_preview,
         preview_dpi=preview_dpi,
+        preview_grayscale=preview_grayscale,
         allow_external_input_files=allow_external_input_files,
         feature_settings=feature_settings,
         recent_text_ttl_seconds=recent_text_ttl_seconds,
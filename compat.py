@@ -1,11 +1,13 @@
 """平台兼容性检测
 
-将 _IS_WINDOWS、_WIN32COM_AVAILABLE、_ANTIWORD_AVAILABLE 等跨模块共享的
-平台检测逻辑集中于此，避免 utils.py 和 pdf_converter.py 各自重复定义。
+将 _IS_WINDOWS、_WIN32COM_AVAILABLE、_ANTIWORD_AVAILABLE、LibreOffice 探测等
+跨模块共享的平台检测逻辑集中于此，避免 utils.py 和 pdf_converter.py 各自重复定义。
 """
 
+import os
 import platform
 import shutil
+from functools import lru_cache
 
 _IS_WINDOWS: bool = platform.system() == "Windows"
 _ANTIWORD_AVAILABLE: bool = shutil.which("antiword") is not None
@@ -20,3 +22,30 @@ if _IS_WINDOWS:
         _WIN32COM_AVAILABLE = True
     except ImportError:
         pass
+
+
+# LibreOffice 可执行文件的可能位置：命令名需在 PATH 中查找，完整路径直接检查文件
+_LIBREOFFICE_COMMANDS = (
+    "soffice",  # Linux/macOS (在 PATH 中)
+    "libreoffice",  # Linux 备选
+)
+_LIBREOFFICE_ABSOLUTE_PATHS = (
+    r"C:\Program Files\LibreOffice\program\soffice.exe",  # Windows 默认
+    r"C:\Program Files (x86)\LibreOffice\program\soffice.exe",  # Windows 32位
+    "/Applications/LibreOffice.app/Contents/MacOS/soffice",  # macOS
+    "/usr/bin/libreoffice",  # Linux
+    "/usr/bin/soffice",  # Linux
+    "/opt/libreoffice/program/soffice",  # Docker/自定义安装
+)
+
+
+@lru_cache(maxsize=1)
+def _discover_libreoffice(path_env: str) -> str | None:
+    """按 PATH 缓存 LibreOffice 探测结果，插件重载时不再重复扫描"""
+    for command in _LIBREOFFICE_COMMANDS:
+        if shutil.which(command, path=path_env):
+            return command
+    for path in _LIBREOFFICE_ABSOLUTE_PATHS:
+        if os.path.isfile(path):
+            return path
+    return None
@@ -74,16 +74,23 @@ EXCEL_SUFFIXES = frozenset(
     if office_type is OfficeType.EXCEL
 )
 
+WORD_SUFFIXES = frozenset(
+    suffix
+    for suffix, office_type in SUFFIX_TO_OFFICE_TYPE.items()
+    if office_type is OfficeType.WORD
+)
+
 # 所有可读取的 Office 格式（新旧）
 ALL_OFFICE_SUFFIXES = frozenset(SUFFIX_TO_OFFICE_TYPE.keys())
 
 DEFAULT_MAX_FILE_SIZE_MB = 20
-DEFAULT_CHUNK_SIZE = 64 * 1024  # 64 KB
+DEFAULT_CHUNK_SIZE = 256 * 1024  # 256 KB
 DEFAULT_MAX_INLINE_DOCX_IMAGE_MB = 2
 DEFAULT_MAX_INLINE_DOCX_IMAGE_COUNT = 3
 DEFAULT_MAX_EXCEL_PREVIEW_ROWS = 2000
 DEFAULT_MAX_EXCEL_PREVIEW_CHARS = 200_000
 DEFAULT_MAX_EXCEL_PREVIEW_SHEETS = 0
+DEFAULT_MAX_EXTRACTED_TEXT_CHARS = 1024 * 1024  # 1 Mi 字符
 DOCUMENT_BLOCK_FONT_SCALE_MIN = 0.75
 DOCUMENT_BLOCK_FONT_SCALE_MAX = 2.0
 DOCUMENT_BLOCK_SPACING_MIN = 0.0
@@ -118,10 +125,16 @@ EXECUTION_TOOLS = (
     "astrbot_execute_ipython",
 )
 
+# 批量移除工具时使用的集合形式
+FILE_TOOL_NAMES = frozenset(FILE_TOOLS)
+EXECUTION_TOOL_NAMES = frozenset(EXECUTION_TOOLS)
+
 MSG_DOCUMENT_EXPORTED = "✅ 文档已导出"
 
 # PDF 相关常量
 PDF_SUFFIX = ".pdf"
+# 可直接读取的上传文件后缀（Office / 文本 / PDF）
+SUPPORTED_UPLOAD_SUFFIXES = ALL_OFFICE_SUFFIXES | TEXT_SUFFIXES | {PDF_SUFFIX}
 PDF_LIBS = {
     "pdf2docx": ("pdf2docx", "pdf2docx"),
     "tabula": ("tabula", "tabula-py"),
@@ -51,6 +51,9 @@ class TableRenderer:
             + header_row_offset
         )
         table = doc.add_table(rows=row_count, cols=column_count)
+        # python-docx 的 table.rows[i] 每次都会重建整张行列表，row.cells 也会重新遍历
+        # 单元格，这里只物化一次行列表，并按行绑定 cells
+        table_rows = list(table.rows)
         style_name = (
             getattr(block.style, "table_grid", None)
             or getattr(block, "table_style", "")
@@ -86,18 +89,22 @@ class TableRenderer:
 
         if getattr(block, "column_widths", None):
             table.autofit = False
-            for col_index, width_cm in enumerate(block.column_widths[:column_count]):
-                if width_cm <= 0:
-                    continue
-                target_width = Cm(width_cm)
-                for row in table.rows:
-                    row.cells[col_index].width = target_width
+            column_widths = [
+                (col_index, Cm(width_cm))
+                for col_index, width_cm in enumerate(block.column_widths[:column_count])
+                if width_cm > 0
+            ]
+            for row in table_rows:
+                cells = row.cells
+                for col_index, target_width in column_widths:
+                    cells[col_index].width = target_width
 
         row_index = 0
         if block.caption:
-            title_cell = table.rows[0].cells[0]
+            title_cells = table_rows[0].cells
+            title_cell = title_cells[0]
             for col_index in range(1, column_count):
-                title_cell = title_cell.merge(table.rows[0].cells[col_index])
+                title_cell = title_cell.merge(title_cells[col_index])
             self._set_cell_text(
                 title_cell,
                 block.caption,
@@ -113,26 +120,28 @@ class TableRenderer:
                 color=self._caption_color(block, theme),
                 background=self._caption_fill(block, theme),
             )
-            self._set_row_cant_split(table.rows[0])
+            self._set_row_cant_split(table_rows[0])
             row_index = 1
 
         if block.header_groups:
+            group_header_row = table_rows[row_index]
             self._render_group_header_row(
-                table.rows[row_index],
+                group_header_row,
                 block.header_groups,
                 block=block,
                 style_name=style_name,
                 theme=theme,
             )
-            self._set_row_as_header(table.rows[row_index])
-            self._set_row_cant_split(table.rows[row_index])
+            self._set_row_as_header(group_header_row)
+            self._set_row_cant_split(group_header_row)
             row_index += 1
 
         if block.headers:
-            header_row = table.rows[row_index]
+            header_row = table_rows[row_index]
+            header_cells = header_row.cells
             for col_index, value in enumerate(block.headers):
                 self._set_cell_text(
-                    header_row.cells[col_index],
+                    header_cells[col_index],
                     value,
                     bold=True,
                     alignment=WD_ALIGN_PARAGRAPH.CENTER,
@@ -146,7 +155,8 @@ class TableRenderer:
             row_index += 1
 
         for data_row_index, values in enumerate(block.rows):
-            current_row = row_index + data_row_index
+            current_row = table_rows[row_index + data_row_index]
+            row_cells = current_row.cells
             for col_index in range(column_count):
                 default_alignment = (
                     WD_ALIGN_PARAGRAPH.CENTER
@@ -156,7 +166,7 @@ class TableRenderer:
                 if body_alignment is None and col_index in numeric_columns:
                     default_alignment = WD_ALIGN_PARAGRAPH.RIGHT
                 self._set_cell_text(
-                    table.rows[current_row].cells[col_index],
+                    row_cells[col_index],
                     values[col_index] if col_index < len(values) else "",
                     bold=bool(self._first_column_bold(block, theme) and col_index == 0),
                     alignment=resolve_alignment(
@@ -174,7 +184,7 @@ class TableRenderer:
                         theme,
                     ),
                 )
-            self._set_row_cant_split(table.rows[current_row])
+            self._set_row_cant_split(current_row)
 
     def _render_group_header_row(
         self,
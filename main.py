@@ -16,8 +16,10 @@ from astrbot.core.star.star import star_map
 
 from .app.runtime import PluginRuntimeBundle
 from .constants import EXCEL_SUFFIXES
+from .services.buffered_event_registry import is_buffered_event
 from .services.message_buffer import BufferedMessage
 from .services import build_plugin_runtime
+from .utils import shutdown_com_applications
 
 
 def _is_retry_exhausted_excel_result(payload: object) -> bool:
@@ -173,6 +175,16 @@ class FileOperationPlugin(Star):
             rt.executor.shutdown(wait=False)
             logger.debug("[文件管理] 主线程池已关闭")
 
+        if getattr(rt, "render_executor", None):
+            rt.render_executor.shutdown(wait=False, cancel_futures=True)
+            logger.debug("[文件管理] 预览渲染进程池已关闭")
+
+        if getattr(rt, "extract_executor", None):
+            rt.extract_executor.shutdown(wait=False, cancel_futures=True)
+            logger.debug("[文件管理] 文档解析进程池已关闭")
+
+        shutdown_com_applications()
+
         if rt.temp_dir:
             try:
                 rt.temp_dir.cleanup()
@@ -224,8 +236,8 @@ class FileOperationPlugin(Star):
 
     @filter.on_llm_request()
     async def before_llm_chat(self, event: AstrMessageEvent, req: ProviderRequest):
-        if getattr(event, "_has_pending_images", False) and not getattr(
-            event, "_buffered", False
+        if getattr(event, "_has_pending_images", False) and not is_buffered_event(
+            event
         ):
             import asyncio
 
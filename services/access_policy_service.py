@@ -15,8 +15,10 @@ class AccessPolicyService:
         enable_features_in_group: bool,
         allow_all_users: bool = False,
     ) -> None:
-        self._whitelist_users = {str(user_id) for user_id in whitelist_users or []}
-        self._admin_users = {str(user_id) for user_id in admin_users or []}
+        self._whitelist_users = frozenset(
+            str(user_id) for user_id in whitelist_users or []
+        )
+        self._admin_users = frozenset(str(user_id) for user_id in admin_users or [])
         self._get_admin_users = get_admin_users
         self._allow_all_users = bool(allow_all_users)
         self._enable_features_in_group = bool(enable_features_in_group)
@@ -25,12 +27,13 @@ class AccessPolicyService:
         return self._allow_all_users
 
     def check_permission(self, event) -> bool:
-        logger.debug("正在检查用户权限")
         if event.is_admin():
             return True
         if self._allow_all_users:
             return True
         user_id = str(event.get_sender_id())
+        if user_id in self._whitelist_users:
+            return True
         admin_users = self._admin_users
         if self._get_admin_users is not None:
             try:
@@ -41,11 +44,7 @@ class AccessPolicyService:
                     f"读取框架管理员配置失败: {exc}",
                     exc_info=True,
                 )
-        if user_id in admin_users:
-            return True
-        if not self._whitelist_users:
-            return False
-        return user_id in self._whitelist_users
+        return user_id in admin_users
 
     def is_group_message(self, event) -> bool:
         return event.message_obj.type == MessageType.GROUP_MESSAGE
@@ -65,14 +64,20 @@ class AccessPolicyService:
             platform_level_mention = getattr(event, "is_mentioned", None)
             if callable(platform_level_mention) and platform_level_mention():
                 return True
-            bot_id = str(event.message_obj.self_id)
+            # 仅在出现 At/Reply 时才需要 bot_id，普通消息不做字符串转换
+            bot_id = None
             for segment in event.message_obj.message:
-                if isinstance(segment, (At, Reply)):
-                    target_id = getattr(segment, "qq", None) or getattr(
-                        segment, "target", None
-                    )
-                    if target_id and str(target_id) == bot_id:
-                        return True
+                if not isinstance(segment, (At, Reply)):
+                    continue
+                target_id = getattr(segment, "qq", None) or getattr(
+                    segment, "target", None
+                )
+                if not target_id:
+                    continue
+                if bot_id is None:
+                    bot_id = str(event.message_obj.self_id)
+                if str(target_id) == bot_id:
+                    return True
             return False
         except Exception as exc:
             logger.error(f"未知错误{exc}")
@@ -0,0 +1,39 @@
+"""
+已聚合事件登记表：记录由消息缓冲器重新分发的事件及其重入次数，
+避免在第三方事件对象上写入私有属性。
+"""
+
+import weakref
+
+_BUFFER_REENTRY_ATTR = "_buffer_reentry_count"
+
+# 按对象身份（id）登记：事件类可能自定义 __eq__/__hash__，
+# copy.copy 出的新事件不能命中原事件的登记。事件被回收时由 finalize 移除条目，
+# 回收前 id 不会被复用，登记表也不持有事件引用
+_reentry_counts: dict[int, int] = {}
+
+
+def mark_buffered_event(event: object, reentry_count: int = 1) -> None:
+    """登记重新分发的事件及其重入次数"""
+    key = id(event)
+    if key not in _reentry_counts:
+        try:
+            weakref.finalize(event, _reentry_counts.pop, key, None)
+        except TypeError:
+            # 不支持弱引用的事件对象，退回到属性标记
+            setattr(event, _BUFFER_REENTRY_ATTR, reentry_count)
+            return
+    _reentry_counts[key] = reentry_count
+
+
+def is_buffered_event(event: object) -> bool:
+    """检查事件是否为消息缓冲器重新分发的事件"""
+    return get_buffer_reentry_count(event) > 0
+
+
+def get_buffer_reentry_count(event: object) -> int:
+    """获取事件的重入次数，未登记的事件返回 0"""
+    count = _reentry_counts.get(id(event))
+    if count is None:
+        count = getattr(event, _BUFFER_REENTRY_ATTR, 0)
+    return count if isinstance(count, int) else 0
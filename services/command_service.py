@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import os
+from functools import lru_cache
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -11,6 +13,15 @@ from ..utils import format_file_size
 if TYPE_CHECKING:
     from .image_asset_service import ImageAssetService
 
+# str.endswith 需要元组
+_OFFICE_SUFFIX_TUPLE = tuple(ALL_OFFICE_SUFFIXES)
+
+
+@lru_cache(maxsize=1024)
+def _format_listing_size(size: int) -> str:
+    """列表展示用的文件大小格式化，同一大小只计算一次"""
+    return format_file_size(size)
+
 
 class CommandService:
     def __init__(
@@ -55,7 +66,8 @@ class CommandService:
         if access_error:
             return access_error
 
-        parts = message_text.strip().split(maxsplit=1)
+        # split() 默认会跳过首尾空白，无需先 strip
+        parts = message_text.split(maxsplit=1)
         if len(parts) < 2:
             return "❌ 用法: /delete_file 文件名"
 
@@ -65,12 +77,11 @@ class CommandService:
         if not valid:
             return f"❌ {error}"
 
-        if not file_path.exists():
-            return f"错误：找不到文件 '{display_name}'"
-
         try:
-            file_path.unlink(missing_ok=True)
+            file_path.unlink()
             return f"成功：文件 '{display_name}' 已删除。"
+        except FileNotFoundError:
+            return f"错误：找不到文件 '{display_name}'"
         except IsADirectoryError:
             return f"'{display_name}'是目录,拒绝删除"
         except PermissionError:
@@ -124,27 +135,39 @@ class CommandService:
         if access_error:
             return access_error
 
-        files = [
-            file_path
-            for file_path in self._plugin_data_path.glob("*")
-            if file_path.is_file() and file_path.suffix.lower() in ALL_OFFICE_SUFFIXES
-        ]
+        files = self._scan_office_files()
         if not files:
             result = "文件库当前没有 Office 文件"
             if self._auto_delete:
                 result += "（自动删除模式已开启，文件发送后会自动清理）"
             return result
 
-        files.sort(key=lambda item: item.stat().st_mtime, reverse=True)
         lines = ["📂 机器人工作区 Office 文件列表："]
         if self._auto_delete:
             lines.append("⚠️ 自动删除模式已开启")
-        for file_path in files:
-            lines.append(
-                f"- {file_path.name} ({format_file_size(file_path.stat().st_size)})"
-            )
+        for name, stat_result in files:
+            lines.append(f"- {name} ({_format_listing_size(stat_result.st_size)})")
         return "\n".join(lines)
 
+    def _scan_office_files(self) -> list[tuple[str, os.stat_result]]:
+        """单次扫描工作区，返回按修改时间倒序排列的 (文件名, stat) 列表"""
+        files: list[tuple[str, os.stat_result]] = []
+        try:
+            with os.scandir(self._plugin_data_path) as entries:
+                for entry in entries:
+                    if not entry.name.lower().endswith(_OFFICE_SUFFIX_TUPLE):
+                        continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                        files.append((entry.name, entry.stat()))
+                    except OSError:
+                        continue
+        except FileNotFoundError:
+            return []
+        files.sort(key=lambda item: item[1].st_mtime, reverse=True)
+        return files
+
     def pdf_status(self, event) -> str:
         if not self._is_group_feature_enabled(event):
             return "❌ " + self._group_feature_disabled_error()
@@ -327,18 +350,19 @@ class CommandService:
                 "当前没有待注册的图片。请在消息中附带图片并发送 /img add，或先上传图片再使用 /img add。",
             )
 
-        parts = selection.strip().split(maxsplit=1) if selection.strip() else []
+        selection = selection.strip()
+        parts = selection.split(maxsplit=1)
         selector = parts[0] if parts else "all"
         note = parts[1] if len(parts) > 1 else ""
 
-        if source_count == 1 and selection.strip() and not note:
-            return [0], selection.strip(), ""
+        if source_count == 1 and selection and not note:
+            return [0], selection, ""
         if selector == "all":
             return list(range(source_count)), note, ""
         try:
             idx = int(selector)
         except ValueError:
-            return list(range(source_count)), selection.strip(), ""
+            return list(range(source_count)), selection, ""
         if idx < 1 or idx > source_count:
             return [], note, f"序号超出范围。当前有 {source_count} 张待注册图片。"
         return [idx - 1], note, ""
@@ -398,7 +422,7 @@ class CommandService:
             )
             lines.append(f"已注册 {len(registered)} 张图片：")
             for info in registered:
-                size_str = format_file_size(info["size_bytes"])
+                size_str = _format_listing_size(info["size_bytes"])
                 lines.append(
                     f"  {info['ref']} ({info['width']}x{info['height']}, {size_str})"
                 )
@@ -425,7 +449,7 @@ class CommandService:
         }
         lines = [f"📷 当前会话图片（共 {len(images)} 张）："]
         for i, info in enumerate(images, 1):
-            size_str = format_file_size(info["size_bytes"])
+            size_str = _format_listing_size(info["size_bytes"])
             note_str = f" — {info['note']}" if info["note"] else ""
             active_mark = " [当前使用]" if info["ref"] in active_refs else ""
             detail_parts = []
@@ -530,7 +554,7 @@ class CommandService:
     def _format_image_info_lines(self, images: list[dict]) -> list[str]:
         lines: list[str] = []
         for i, info in enumerate(images, 1):
-            size_str = format_file_size(info["size_bytes"])
+            size_str = _format_listing_size(info["size_bytes"])
             note_str = f" — {info['note']}" if info.get("note") else ""
             detail_parts = []
             if info.get("original_name"):
@@ -1,4 +1,3 @@
-import asyncio
 from pathlib import Path
 
 import astrbot.api.message_components as Comp
@@ -8,6 +7,8 @@ from astrbot.core.agent.run_context import ContextWrapper
 from astrbot.core.astr_agent_context import AstrAgentContext
 from astrbot.core.message.message_event_result import MessageChain
 
+from .preview_generator import generate_preview_async
+
 
 class DeliveryService:
     def __init__(
@@ -15,12 +16,14 @@ class DeliveryService:
         *,
         executor,
         preview_generator,
+        render_executor=None,
         enable_preview: bool,
         auto_delete: bool,
         reply_to_user: bool,
     ) -> None:
         self._executor = executor
         self._preview_generator = preview_generator
+        self._render_executor = render_executor
         self._enable_preview = enable_preview
         self._auto_delete = auto_delete
         self._reply_to_user = reply_to_user
@@ -30,12 +33,11 @@ class DeliveryService:
             return None
 
         try:
-            loop = asyncio.get_running_loop()
-            return await loop.run_in_executor(
-                self._executor,
-                self._preview_generator.generate_preview,
+            return await generate_preview_async(
+                self._preview_generator,
                 file_path,
-                None,
+                executor=self._executor,
+                render_executor=self._render_executor,
             )
         except Exception as exc:
             logger.warning(f"[预览生成] 生成预览图失败: {exc}")
@@ -61,7 +63,9 @@ class DeliveryService:
         if not preview_path or not preview_path.exists():
             return
 
-        await event.send(MessageChain([Comp.Image(file=str(preview_path.resolve()))]))
+        if not preview_path.is_absolute():
+            preview_path = preview_path.resolve()
+        await event.send(MessageChain([Comp.Image(file=str(preview_path))]))
         await self._delete_file_if_needed(preview_path, "预览文件")
 
     async def _send_output_file(
@@ -70,9 +74,7 @@ class DeliveryService:
         file_path: Path,
     ) -> None:
         await event.send(
-            MessageChain(
-                [Comp.File(file=str(file_path.resolve()), name=file_path.name)]
-            )
+            MessageChain([Comp.File(file=str(file_path), name=file_path.name)])
         )
 
     async def _delete_file_if_needed(self, file_path: Path, label: str) -> None:
@@ -94,6 +96,8 @@ class DeliveryService:
         file_path: Path,
         success_message: str = "✅ 文件已处理成功",
     ) -> None:
+        # 只解析一次，默认预览图路径由该路径派生，发送时无需再次 resolve
+        file_path = file_path.resolve()
         preview_path = await self._generate_preview(file_path)
         await self._send_success_message(event, file_path, success_message)
         await self._send_preview_if_available(event, preview_path)
@@ -79,9 +79,18 @@ def build_runner_script(
             result_path = (workspace_root / result_path).resolve()
         script = json.loads({serialized_script!r})
         helper_script = json.loads({serialized_helper_script!r})
-        initial_exists = output_path.exists() if output_path is not None else False
-        initial_size = output_path.stat().st_size if initial_exists else None
-        initial_mtime_ns = output_path.stat().st_mtime_ns if initial_exists else None
+
+        def output_signature():
+            # 单次 stat 同时得到是否存在、大小与修改时间
+            if output_path is None:
+                return None
+            try:
+                stat_result = output_path.stat()
+            except OSError:
+                return None
+            return (stat_result.st_size, stat_result.st_mtime_ns)
+
+        initial_signature = output_signature()
 
         try:
             import openpyxl
@@ -126,15 +135,11 @@ def build_runner_script(
                         candidates.append(candidate)
                 if len(candidates) == 1:
                     shutil.copy2(candidates[0], output_path)
-            output_changed = False
-            if output_path is not None and output_path.exists():
-                if not initial_exists:
-                    output_changed = True
-                else:
-                    output_changed = (
-                        output_path.stat().st_size != initial_size
-                        or output_path.stat().st_mtime_ns != initial_mtime_ns
-                    )
+            current_signature = output_signature()
+            output_changed = (
+                current_signature is not None
+                and current_signature != initial_signature
+            )
             postprocess_output = namespace.get(
                 "_office_assistant_postprocess_output_file"
             )
@@ -148,15 +153,11 @@ def build_runner_script(
 
             result_text = namespace.get("result_text")
             has_text = result_text is not None
-            has_file = False
-            if output_path is not None and output_path.exists():
-                if not initial_exists:
-                    has_file = True
-                else:
-                    has_file = (
-                        output_path.stat().st_size != initial_size
-                        or output_path.stat().st_mtime_ns != initial_mtime_ns
-                    )
+            current_signature = output_signature()
+            has_file = (
+                current_signature is not None
+                and current_signature != initial_signature
+            )
             if has_text and has_file:
                 payload = {{
                     "success": False,
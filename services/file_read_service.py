@@ -72,12 +72,14 @@ class FileReadService:
         if not filename:
             return None, "错误：请提供要读取的文件名"
 
+        # 存在性由下方的 stat 一并检查，避免重复的文件系统调用
         ok, resolved_path, err = self._workspace_service.pre_check(
             event,
             filename,
-            require_exists=True,
+            require_exists=False,
             allowed_suffixes=allowed_suffixes,
             allow_external_path=self._allow_external_input_files,
+            reject_recently_missing=True,
             is_group_feature_enabled=self._is_group_feature_enabled,
             check_permission_fn=self._check_permission,
             group_feature_disabled_error=self._group_feature_disabled_error,
@@ -91,6 +93,9 @@ class FileReadService:
         display_name = self._workspace_service.display_name(resolved_path)
         try:
             file_size = (await asyncio.to_thread(resolved_path.stat)).st_size
+        except FileNotFoundError:
+            self._workspace_service.remember_missing_file(resolved_path)
+            return None, self._workspace_service.missing_file_error(display_name)
         except OSError as exc:
             logger.error(f"获取文件状态失败: {exc}")
             return None, f"错误：无法读取文件信息 ({display_name})"
@@ -784,14 +784,19 @@ class GeneratedFileDeliveryService:
         block_quality_warnings: bool = False,
         quality_warning_input_paths: Sequence[Path] | None = None,
     ) -> GeneratedFileDeliveryResult:
-        if output_path is None or not output_path.exists():
+        try:
+            file_size = output_path.stat().st_size if output_path is not None else None
+        except OSError:
+            file_size = None
+        if file_size is None:
             logger.info(
                 "[文件管理] 生成文件不存在，跳过发送: %s",
                 str(output_path) if output_path is not None else "<none>",
             )
             return GeneratedFileDeliveryResult(status="missing")
 
-        file_size = output_path.stat().st_size
+        # 生成前可能被 read_file 记为不存在，文件已落盘后立即清除该记录
+        self._workspace_service.forget_missing_file(output_path.resolve())
         max_size = self._workspace_service.get_max_file_size()
         if file_size > max_size:
             try:
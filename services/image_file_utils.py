@@ -8,8 +8,17 @@ IMAGE_FILE_SUFFIXES = frozenset({".png", ".jpg", ".jpeg", ".webp"})
 IMAGE_MIME_TYPES = frozenset({"image/png", "image/jpeg", "image/webp"})
 
 
+def filename_suffix(filename: str) -> str:
+    """与 Path(filename).suffix.lower() 等价，但不构造 Path 对象"""
+    name = filename[max(filename.rfind("/"), filename.rfind("\\")) + 1 :]
+    index = name.rfind(".")
+    if index <= 0 or index == len(name) - 1:
+        return ""
+    return name[index:].lower()
+
+
 def is_supported_image_filename(filename: str) -> bool:
-    return Path(filename).suffix.lower() in IMAGE_FILE_SUFFIXES
+    return filename_suffix(filename) in IMAGE_FILE_SUFFIXES
 
 
 def is_supported_image_reference(value: str) -> bool:
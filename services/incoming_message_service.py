@@ -1,10 +1,9 @@
-from pathlib import Path
-
 import astrbot.api.message_components as Comp
 from astrbot.api import logger
 
-from ..constants import ALL_OFFICE_SUFFIXES, PDF_SUFFIX, TEXT_SUFFIXES
-from .image_file_utils import is_image_file_component
+from ..constants import SUPPORTED_UPLOAD_SUFFIXES
+from .buffered_event_registry import is_buffered_event
+from .image_file_utils import filename_suffix, is_image_file_component
 
 
 class IncomingMessageService:
@@ -54,7 +53,7 @@ class IncomingMessageService:
         return has_image
 
     async def handle_file_message(self, event) -> None:
-        if getattr(event, "_buffered", False):
+        if is_buffered_event(event):
             return
 
         if not self._is_group_feature_enabled(event):
@@ -67,12 +66,7 @@ class IncomingMessageService:
         for component in event.message_obj.message:
             if isinstance(component, Comp.File):
                 name = component.name or ""
-                suffix = Path(name).suffix.lower() if name else ""
-                if (
-                    suffix in ALL_OFFICE_SUFFIXES
-                    or suffix in TEXT_SUFFIXES
-                    or suffix == PDF_SUFFIX
-                ):
+                if filename_suffix(name) in SUPPORTED_UPLOAD_SUFFIXES:
                     has_supported_file = True
                     break
 
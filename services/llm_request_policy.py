@@ -9,8 +9,9 @@ from astrbot.core.provider.entities import ProviderRequest
 
 from ..constants import (
     DOC_COMMAND_TRIGGER_EVENT_KEY,
-    EXECUTION_TOOLS,
+    EXECUTION_TOOL_NAMES,
     EXPLICIT_FILE_TOOL_EVENT_KEY,
+    FILE_TOOL_NAMES,
     FILE_TOOLS,
 )
 from ..internal_hooks import (
@@ -21,8 +22,37 @@ from ..internal_hooks import (
     run_notice_hooks,
     run_tool_exposure_hooks,
 )
+from .buffered_event_registry import is_buffered_event
 from .prompt_context_service import PromptContextService
 from .request_hook_service import RequestHookService
+from .tool_set_utils import remove_tools
+
+_TOOL_INVOCATION_PREFIX = (
+    r"(?:调用|使用|请求(?:调用|使用)?|请(?!问)(?:调用|使用)?|"
+    r"\b(?:call|use|invoke)\b|\bplease\s+(?:call|use|invoke)\b)"
+)
+
+
+def _compile_explicit_tool_patterns(
+    tool_name: str,
+) -> tuple[re.Pattern[str], ...]:
+    escaped = re.escape(tool_name)
+    return tuple(
+        re.compile(pattern, flags=re.IGNORECASE)
+        for pattern in (
+            rf"(?P<tool>{_TOOL_INVOCATION_PREFIX}\s*`?{escaped}`?)",
+            rf"(?P<tool>`{escaped}`)",
+            rf"(?P<tool>{escaped}\s*\()",
+            rf"(?P<tool>{escaped}\s*[,，]\s*[a-zA-Z_]\w*\s*=)",
+        )
+    )
+
+
+# 工具名集合固定，启动时编译一次，长名优先匹配
+_EXPLICIT_FILE_TOOL_PATTERNS = tuple(
+    (tool_name, _compile_explicit_tool_patterns(tool_name))
+    for tool_name in sorted(FILE_TOOLS, key=len, reverse=True)
+)
 
 
 class LLMRequestPolicy:
@@ -99,19 +129,9 @@ class LLMRequestPolicy:
             return None
 
         explicit_matches: set[str] = set()
-        tool_invocation_prefix = (
-            r"(?:调用|使用|请求(?:调用|使用)?|请(?!问)(?:调用|使用)?|"
-            r"\b(?:call|use|invoke)\b|\bplease\s+(?:call|use|invoke)\b)"
-        )
-        for tool_name in sorted(FILE_TOOLS, key=len, reverse=True):
-            patterns = (
-                rf"(?P<tool>{tool_invocation_prefix}\s*`?{re.escape(tool_name)}`?)",
-                rf"(?P<tool>`{re.escape(tool_name)}`)",
-                rf"(?P<tool>{re.escape(tool_name)}\s*\()",
-                rf"(?P<tool>{re.escape(tool_name)}\s*[,，]\s*[a-zA-Z_]\w*\s*=)",
-            )
+        for tool_name, patterns in _EXPLICIT_FILE_TOOL_PATTERNS:
             for pattern in patterns:
-                for match in re.finditer(pattern, text, flags=re.IGNORECASE):
+                for match in pattern.finditer(text):
                     tool_start = match.start("tool")
                     prefix = text[max(0, tool_start - 20) : tool_start]
                     if self._NEGATIVE_TOOL_PREFIX_RE.search(prefix):
@@ -132,7 +152,7 @@ class LLMRequestPolicy:
         if not prompt_text:
             return ""
 
-        is_buffered_prompt = getattr(event, "_buffered", False) is True
+        is_buffered_prompt = is_buffered_event(event)
         if is_buffered_prompt or "[System Notice]" in prompt_text:
             match = self._BUFFERED_USER_INSTRUCTION_RE.search(prompt_text)
             if match:
@@ -168,14 +188,12 @@ class LLMRequestPolicy:
     @staticmethod
     def _remove_file_tools(req: ProviderRequest) -> None:
         if req.func_tool:
-            for tool_name in FILE_TOOLS:
-                req.func_tool.remove_tool(tool_name)
+            remove_tools(req.func_tool, FILE_TOOL_NAMES)
 
     @staticmethod
     def _remove_execution_tools(req: ProviderRequest) -> None:
         if req.func_tool:
-            for tool_name in EXECUTION_TOOLS:
-                req.func_tool.remove_tool(tool_name)
+            remove_tools(req.func_tool, EXECUTION_TOOL_NAMES)
 
     def _merge_notice_sections(
         self,
@@ -5,7 +5,6 @@
 from __future__ import annotations
 
 import asyncio
-import contextlib
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
@@ -17,6 +16,18 @@ from .image_file_utils import is_image_file_component
 if TYPE_CHECKING:
     from astrbot.api.event import AstrMessageEvent
 
+# 缓冲完成后的批量派发：短时间窗口内到期的缓冲合并为一次派发，
+# 达到批量上限时立即派发
+_COMPLETION_BATCH_MAX = 16
+_COMPLETION_FLUSH_DELAY = 0.01
+# 同时存在的缓冲上限，超出时最早的缓冲提前完成
+_DEFAULT_MAX_BUFFERS = 1024
+
+# 每条群消息都会经过组件分类，组件类型提前绑定为模块级名称
+_FILE_COMPONENT = Comp.File
+_IMAGE_COMPONENT = Comp.Image
+_PLAIN_COMPONENT = Comp.Plain
+
 
 @dataclass
 class BufferedMessage:
@@ -26,7 +37,7 @@ class BufferedMessage:
     files: list[Comp.File] = field(default_factory=list)  # 文件列表
     images: list[Comp.Image] = field(default_factory=list)  # 图片列表
     texts: list[str] = field(default_factory=list)  # 文本内容列表
-    timer_task: asyncio.Task | None = None  # 定时器任务
+    timer_handle: asyncio.TimerHandle | None = None  # 定时器句柄
     wait_seconds: float = 0.0  # 当前缓冲计时窗口
 
 
@@ -38,18 +49,26 @@ class MessageBuffer:
     收到文件消息后等待一段时间以聚合后续消息。
     """
 
-    def __init__(self, wait_seconds: float = 4):
+    def __init__(
+        self, wait_seconds: float = 4, max_buffers: int = _DEFAULT_MAX_BUFFERS
+    ):
         """
         Args:
             wait_seconds: 缓冲等待时间（秒）
+            max_buffers: 同时存在的缓冲数量上限
         """
         self._wait_seconds = wait_seconds
+        self._max_buffers = max(1, int(max_buffers))
         # 缓冲区: key = (platform_id, sender_id, session_id)
+        # 读写都在事件循环线程内完成，且读改写之间没有 await，无需加锁
         self._buffers: dict[tuple[str, str, str], BufferedMessage] = {}
         # 回调函数，当消息聚合完成时调用
         self._on_complete_callback = None
-        # 锁，保证线程安全
-        self._lock = asyncio.Lock()
+        # 待派发的已完成缓冲及其延迟派发任务
+        self._completion_batch: list[BufferedMessage] = []
+        self._flush_task: asyncio.Task | None = None
+        # 达到批量上限时立即派发的任务，保留引用避免被回收
+        self._dispatch_tasks: set[asyncio.Task] = set()
 
     def set_complete_callback(self, callback):
         """设置消息聚合完成后的回调函数（有文件时）"""
@@ -72,11 +91,11 @@ class MessageBuffer:
         texts = []
 
         for component in event.message_obj.message:
-            if isinstance(component, Comp.File):
+            if isinstance(component, _FILE_COMPONENT):
                 files.append(component)
-            elif isinstance(component, Comp.Image):
+            elif isinstance(component, _IMAGE_COMPONENT):
                 images.append(component)
-            elif isinstance(component, Comp.Plain):
+            elif isinstance(component, _PLAIN_COMPONENT):
                 text = component.text.strip()
                 if text:
                     texts.append(text)
@@ -111,77 +130,132 @@ class MessageBuffer:
         files, images, texts = self._extract_components(event)
         key = self._get_buffer_key(event)
 
-        async with self._lock:
-            # 检查是否已有缓冲
-            if key in self._buffers:
-                buf = self._buffers[key]
+        # 检查是否已有缓冲
+        if key in self._buffers:
+            buf = self._buffers[key]
+            # 大多数追加消息只有文本，空列表无需合并
+            if files:
                 buf.files.extend(files)
+            if images:
                 buf.images.extend(images)
+            if texts:
                 buf.texts.extend(texts)
+            logger.debug(
+                "[消息缓冲] 追加消息到缓冲区: %s, 文件数: %d, 图片数: %d, 文本数: %d",
+                key,
+                len(files),
+                len(images),
+                len(texts),
+            )
+            if (
+                wait_seconds is not None
+                and effective_wait != buf.wait_seconds
+                and buf.timer_handle
+                and not buf.timer_handle.cancelled()
+            ):
+                buf.timer_handle.cancel()
+                buf.wait_seconds = effective_wait
+                buf.timer_handle = self._schedule_timer(key, effective_wait)
                 logger.debug(
-                    f"[消息缓冲] 追加消息到缓冲区: {key}, "
-                    f"文件数: {len(files)}, 图片数: {len(images)}, 文本数: {len(texts)}"
+                    "[消息缓冲] 已调整缓冲等待时间: %s, 等待 %s 秒", key, effective_wait
                 )
-                if (
-                    wait_seconds is not None
-                    and effective_wait != buf.wait_seconds
-                    and buf.timer_task
-                    and not buf.timer_task.done()
-                ):
-                    buf.timer_task.cancel()
-                    with contextlib.suppress(asyncio.CancelledError):
-                        await buf.timer_task
-                    buf.wait_seconds = effective_wait
-                    buf.timer_task = asyncio.create_task(
-                        self._wait_and_process(key, effective_wait)
-                    )
-                    logger.debug(
-                        f"[消息缓冲] 已调整缓冲等待时间: {key}, 等待 {effective_wait} 秒"
-                    )
-                return True
-
-            # 没有缓冲，开始新的缓冲
-            buf = BufferedMessage(
-                event=event,
-                files=files,
-                images=images,
-                texts=texts,
-                wait_seconds=effective_wait,
-            )
+            return True
 
-            logger.info(f"[消息缓冲] 开始缓冲: {key}, 等待 {effective_wait} 秒")
+        # 没有缓冲，开始新的缓冲
+        self._evict_buffers()
+        buf = BufferedMessage(
+            event=event,
+            files=files,
+            images=images,
+            texts=texts,
+            wait_seconds=effective_wait,
+        )
 
-            buf.timer_task = asyncio.create_task(
-                self._wait_and_process(key, effective_wait)
+        logger.info("[消息缓冲] 开始缓冲: %s, 等待 %s 秒", key, effective_wait)
+
+        buf.timer_handle = self._schedule_timer(key, effective_wait)
+        self._buffers[key] = buf
+        return True
+
+    def _evict_buffers(self) -> None:
+        """按插入顺序清理最早的缓冲：定时器已丢失的直接完成，超出上限的提前完成"""
+        now = asyncio.get_running_loop().time()
+        while self._buffers:
+            oldest_key = next(iter(self._buffers))
+            oldest = self._buffers[oldest_key]
+            handle = oldest.timer_handle
+            # 正常情况下定时器到期即移除缓冲；超过到期时间一个窗口仍在，说明定时器已丢失
+            stale = handle is None or handle.when() + oldest.wait_seconds < now
+            if not stale and len(self._buffers) < self._max_buffers:
+                return
+            if handle:
+                handle.cancel()
+            logger.warning(
+                "[消息缓冲] %s，提前完成: %s",
+                "缓冲超时未完成" if stale else "缓冲数量达到上限",
+                oldest_key,
             )
-            self._buffers[key] = buf
-            return True
+            self._on_timer_expired(oldest_key)
+
+    def _schedule_timer(
+        self, key: tuple[str, str, str], wait_time: float
+    ) -> asyncio.TimerHandle:
+        # call_later 只在事件循环的定时堆中登记一个句柄，取消为 O(1)，
+        # 不必为每个缓冲创建 Task
+        loop = asyncio.get_running_loop()
+        return loop.call_later(wait_time, self._on_timer_expired, key)
 
-    async def _wait_and_process(self, key: tuple[str, str, str], wait_time: float):
+    def _on_timer_expired(self, key: tuple[str, str, str]) -> None:
         """等待超时后处理缓冲的消息"""
-        try:
-            await asyncio.sleep(wait_time)
-        except asyncio.CancelledError:
-            # 定时器被取消，正常退出
+        buf = self._buffers.pop(key, None)
+        if buf is None:
             return
 
-        async with self._lock:
-            if key not in self._buffers:
-                return
-
-            buf = self._buffers.pop(key)
-
         # 有文件或图片时才调用回调
-        if (buf.files or buf.images) and self._on_complete_callback:
-            try:
-                logger.info(
-                    f"[消息缓冲] 缓冲完成，"
-                    f"文件数: {len(buf.files)}, 图片数: {len(buf.images)}, "
-                    f"缓冲文本数: {len(buf.texts)}"
-                )
-                await self._on_complete_callback(buf)
-            except Exception as e:
-                logger.error(f"[消息缓冲] 处理回调时出错: {e}")
+        if not (buf.files or buf.images) or not self._on_complete_callback:
+            return
+
+        self._completion_batch.append(buf)
+        if len(self._completion_batch) >= _COMPLETION_BATCH_MAX:
+            task = asyncio.create_task(
+                self._dispatch_completions(self._take_completion_batch())
+            )
+            self._dispatch_tasks.add(task)
+            task.add_done_callback(self._dispatch_tasks.discard)
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_after_delay())
+
+    def _take_completion_batch(self) -> list[BufferedMessage]:
+        batch = self._completion_batch
+        self._completion_batch = []
+        return batch
+
+    async def _flush_after_delay(self):
+        """等待短暂窗口后派发累计的已完成缓冲"""
+        await asyncio.sleep(_COMPLETION_FLUSH_DELAY)
+        await self._dispatch_completions(self._take_completion_batch())
+
+    async def _dispatch_completions(self, batch: list[BufferedMessage]):
+        """并发执行一批已完成缓冲的回调：批量只合并定时唤醒，各缓冲的处理互不等待"""
+        if len(batch) > 1:
+            logger.debug("[消息缓冲] 批量派发缓冲完成: %d 条", len(batch))
+        await asyncio.gather(*(self._run_complete_callback(buf) for buf in batch))
+
+    async def _run_complete_callback(self, buf: BufferedMessage):
+        callback = self._on_complete_callback
+        if callback is None:
+            return
+        try:
+            logger.info(
+                "[消息缓冲] 缓冲完成，文件数: %d, 图片数: %d, 缓冲文本数: %d",
+                len(buf.files),
+                len(buf.images),
+                len(buf.texts),
+            )
+            await callback(buf)
+        except Exception as e:
+            logger.error(f"[消息缓冲] 处理回调时出错: {e}")
 
     def is_buffering(self, event: AstrMessageEvent) -> bool:
         """检查指定用户是否正在缓冲状态"""
@@ -191,34 +265,31 @@ class MessageBuffer:
     async def pop_images(self, event: AstrMessageEvent) -> list[Comp.Image | Comp.File]:
         """取出当前用户缓冲中的图片，保留非图片文件/文本继续等待聚合完成。"""
         key = self._get_buffer_key(event)
-        async with self._lock:
-            buf = self._buffers.get(key)
-            if buf is None:
-                return []
-            images = list(buf.images)
-            image_files = [file for file in buf.files if is_image_file_component(file)]
-            if not images and not image_files:
-                return []
-            buf.images.clear()
-            if image_files:
-                image_file_ids = {id(file) for file in image_files}
-                buf.files = [
-                    file for file in buf.files if id(file) not in image_file_ids
-                ]
-                images.extend(image_files)
-            if buf.files or buf.texts:
-                return images
-            self._buffers.pop(key, None)
-            if buf.timer_task and not buf.timer_task.done():
-                buf.timer_task.cancel()
+        buf = self._buffers.get(key)
+        if buf is None:
+            return []
+        images = list(buf.images)
+        image_files = [file for file in buf.files if is_image_file_component(file)]
+        if not images and not image_files:
+            return []
+        buf.images.clear()
+        if image_files:
+            image_file_ids = {id(file) for file in image_files}
+            buf.files = [file for file in buf.files if id(file) not in image_file_ids]
+            images.extend(image_files)
+        if buf.files or buf.texts:
             return images
+        self._buffers.pop(key, None)
+        if buf.timer_handle:
+            buf.timer_handle.cancel()
+        return images
 
     async def cancel_buffer(self, event: AstrMessageEvent):
         """取消指定用户的缓冲"""
         key = self._get_buffer_key(event)
-        async with self._lock:
-            if key in self._buffers:
-                buf = self._buffers.pop(key)
-                if buf.timer_task and not buf.timer_task.done():
-                    buf.timer_task.cancel()
-                logger.debug(f"[消息缓冲] 取消缓冲: {key}")
+        buf = self._buffers.pop(key, None)
+        if buf is None:
+            return
+        if buf.timer_handle:
+            buf.timer_handle.cancel()
+        logger.debug("[消息缓冲] 取消缓冲: %s", key)
@@ -1,9 +1,13 @@
 import asyncio
 import importlib.util
+import io
 import json
+import pkgutil
 import re
+import time
+from collections.abc import Iterator
 from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime
+from functools import cache
 from pathlib import Path
 
 from pydantic import BaseModel, TypeAdapter, ValidationError
@@ -40,8 +44,91 @@ from ..domain.document.session_store import DocumentSessionStore
 from ..domain.document.session_store import attach_document_style_defaults
 from ..domain.document.session_store import merge_document_style_defaults
 
+# Office 库在模块加载时导入一次，避免每次生成都触发 lxml/schema 的导入开销
+_OPENPYXL_AVAILABLE = False
+_PPTX_AVAILABLE = False
+
+try:
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Font, PatternFill
+
+    _OPENPYXL_AVAILABLE = True
+except ImportError:
+    pass
+
+try:
+    from pptx import Presentation
+
+    # 默认模板只从磁盘读取一次，之后每次生成都从内存中的字节打开
+    _DEFAULT_PPTX_BYTES = pkgutil.get_data("pptx", "templates/default.pptx")
+    _PPTX_AVAILABLE = True
+except ImportError:
+    pass
+
 _BLOCK_INPUT_ADAPTER = TypeAdapter(BlockInput)
 
+# Excel 表头与单元格样式，所有单元格共享同一组样式对象
+if _OPENPYXL_AVAILABLE:
+    _EXCEL_HEADER_FONT = Font(bold=True)
+    _EXCEL_HEADER_FILL = PatternFill(
+        start_color="DDDDDD", end_color="DDDDDD", fill_type="solid"
+    )
+    _EXCEL_CELL_ALIGNMENT = Alignment(horizontal="left", vertical="center")
+
+# 默认模板中“标题和内容”版式的索引
+_DEFAULT_PPT_LAYOUT_IDX = 1
+
+_FILENAME_EXTRA_CHARS = frozenset(" -_.")
+
+
+class _FilenameSanitizeTable(dict):
+    """str.translate 用的映射表：首次遇到某个码位时判定并缓存，非法字符映射为 None"""
+
+    def __missing__(self, codepoint: int) -> str | None:
+        char = chr(codepoint)
+        value = char if char.isalnum() or char in _FILENAME_EXTRA_CHARS else None
+        self[codepoint] = value
+        return value
+
+
+_FILENAME_SANITIZE_TABLE = _FilenameSanitizeTable()
+
+# 匹配 [幻灯片 N]、[幻灯片N]、[Slide N]、[slide N] 等格式
+_SLIDE_PATTERN = re.compile(r"\[(?:幻灯片|Slide|slide)\s*\d+\]")
+# 按 | 分割单元格，同时去掉分隔符两侧的空白
+_PIPE_SPLIT_PATTERN = re.compile(r"\s*\|\s*")
+
+
+@cache
+def _probe_office_support() -> dict[OfficeType, bool]:
+    """检查Office库支持（进程内只探测一次，缺失提示也只记录一次）"""
+    support = {}
+
+    for office_type in OfficeType:
+        module_name, package_name = OFFICE_LIBS[office_type]
+        available = importlib.util.find_spec(module_name) is not None
+        support[office_type] = available
+
+        if not available:
+            logger.warning(f"[文件生成器] {package_name} 未安装")
+
+    return support
+
+
+def _split_on_blank_lines(text: str) -> Iterator[list[str]]:
+    """按空行分组，逐组产出去除首尾空白后的非空行"""
+    group: list[str] = []
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped:
+            group.append(stripped)
+        elif group:
+            yield group
+            group = []
+    if group:
+        yield group
+
 
 class OfficeGenerator(ExecutorOwnerMixin):
     """Office文件生成器"""
@@ -54,7 +141,8 @@ class OfficeGenerator(ExecutorOwnerMixin):
         default_document_style: dict[str, object] | None = None,
     ):
         self.data_path = data_path
-        self.support = self._check_support()
+        # 复制一份，避免实例修改影响模块级缓存
+        self.support = dict(_probe_office_support())
         self._render_backend_config = render_backend_config
         self._default_document_style = dict(default_document_style or {})
         self._structured_document_store = DocumentSessionStore(
@@ -95,20 +183,6 @@ class OfficeGenerator(ExecutorOwnerMixin):
             self._require_executor(), self._generate_ppt_sync, file_path, content
         )
 
-    def _check_support(self) -> dict[OfficeType, bool]:
-        """检查Office库支持"""
-        support = {}
-
-        for office_type in OfficeType:
-            module_name, package_name = OFFICE_LIBS[office_type]
-            available = importlib.util.find_spec(module_name) is not None
-            support[office_type] = available
-
-            if not available:
-                logger.warning(f"[文件生成器] {package_name} 未安装")
-
-        return support
-
     def _is_generation_supported(self, office_type: OfficeType) -> bool:
         if office_type == OfficeType.WORD:
             backend = NodeDocumentRenderBackend(
@@ -141,19 +215,22 @@ class OfficeGenerator(ExecutorOwnerMixin):
             )
             payload = content.get("content", {})
 
-            # 解析content
+            # 解析content：只有以 { 或 [ 开头的文本才可能是 JSON，
+            # 普通文本直接走默认解析，省去一次失败的 json.loads
             if isinstance(payload, str):
-                try:
-                    payload = json.loads(payload)
-                except json.JSONDecodeError:
+                if payload.lstrip()[:1] in ("{", "["):
+                    try:
+                        payload = json.loads(payload)
+                    except json.JSONDecodeError:
+                        payload = self._create_default_content(office_type, payload)
+                else:
                     payload = self._create_default_content(office_type, payload)
 
             # 清理文件名并添加扩展名
-            resolved_filename = self._sanitize_filename(resolved_filename)
             extension = OFFICE_EXTENSIONS[office_type]
-
+            resolved_filename = self._sanitize_filename(resolved_filename)
             if not resolved_filename.endswith(extension):
-                resolved_filename = resolved_filename + extension
+                resolved_filename += extension
 
             file_path = self._get_unique_filepath(resolved_filename)
             generator = getattr(self, self._GENERATORS[office_type])
@@ -188,19 +265,7 @@ class OfficeGenerator(ExecutorOwnerMixin):
             return {"paragraphs": ["（空文档）"]}
 
         # 按空行分割段落
-        paragraphs = []
-        current_para = []
-
-        for line in text.split("\n"):
-            if line.strip():
-                current_para.append(line.strip())
-            else:
-                if current_para:
-                    paragraphs.append(" ".join(current_para))
-                    current_para = []
-
-        if current_para:
-            paragraphs.append(" ".join(current_para))
+        paragraphs = [" ".join(group) for group in _split_on_blank_lines(text)]
 
         if not paragraphs:
             return {"paragraphs": [text]}
@@ -222,17 +287,14 @@ class OfficeGenerator(ExecutorOwnerMixin):
         - 用 | 分隔每个单元格
         - 换行分隔每一行
         """
-        lines = [line.strip() for line in text.strip().split("\n") if line.strip()]
+        lines = [stripped for line in text.splitlines() if (stripped := line.strip())]
         if not lines:
             return {"sheets": [{"name": "Sheet1", "data": [["（空表格）"]]}]}
 
-        data = []
-        for line in lines:
-            if "|" in line:
-                cells = [cell.strip() for cell in line.split("|")]
-            else:
-                cells = [line]
-            data.append(cells)
+        data = [
+            _PIPE_SPLIT_PATTERN.split(line) if "|" in line else [line]
+            for line in lines
+        ]
 
         return {"sheets": [{"name": "Sheet1", "data": data}]}
 
@@ -249,63 +311,30 @@ class OfficeGenerator(ExecutorOwnerMixin):
         if not text:
             return {"slides": [{"title": "空白幻灯片", "content": []}]}
 
-        # 匹配 [幻灯片 N]、[幻灯片N]、[Slide N]、[slide N] 等格式
-        slide_pattern = r"\[(?:幻灯片|Slide|slide)\s*\d+\]"
-
-        # 检查是否有幻灯片标记
-        if not re.search(slide_pattern, text):
+        # 一次扫描找出全部幻灯片标记，标记之间的文本即为该页内容
+        markers = list(_SLIDE_PATTERN.finditer(text))
+        if not markers:
             # 没有标记，尝试按空行分割成多页
             return self._parse_ppt_by_blank_lines(text)
 
-        # 按幻灯片标记分割
         slides = []
-        parts = re.split(f"({slide_pattern})", text)
-
-        current_slide = None
-        for part in parts:
-            part = part.strip()
-            if not part:
-                continue
-
-            if re.match(slide_pattern, part):
-                # 这是一个幻灯片标记，准备新幻灯片
-                if current_slide:
-                    slides.append(current_slide)
-                current_slide = {"title": "", "content": []}
-            elif current_slide is not None:
-                # 解析幻灯片内容
-                lines = [ln.strip() for ln in part.split("\n") if ln.strip()]
-                if lines:
-                    current_slide["title"] = lines[0]
-                    current_slide["content"] = lines[1:] if len(lines) > 1 else []
-
-        if current_slide:
-            slides.append(current_slide)
-
-        if not slides:
-            return {"slides": [{"title": "内容", "content": [text]}]}
+        for index, marker in enumerate(markers):
+            end = markers[index + 1].start() if index + 1 < len(markers) else None
+            lines = [
+                stripped
+                for ln in text[marker.end() : end].splitlines()
+                if (stripped := ln.strip())
+            ]
+            slides.append({"title": lines[0] if lines else "", "content": lines[1:]})
 
         return {"slides": slides}
 
     def _parse_ppt_by_blank_lines(self, text: str) -> dict:
         """按空行分割 PPT 内容为多页"""
-        slides = []
-        current_lines = []
-
-        for line in text.split("\n"):
-            if line.strip():
-                current_lines.append(line.strip())
-            else:
-                if current_lines:
-                    title = current_lines[0]
-                    content = current_lines[1:] if len(current_lines) > 1 else []
-                    slides.append({"title": title, "content": content})
-                    current_lines = []
-
-        if current_lines:
-            title = current_lines[0]
-            content = current_lines[1:] if len(current_lines) > 1 else []
-            slides.append({"title": title, "content": content})
+        slides = [
+            {"title": group[0], "content": group[1:]}
+            for group in _split_on_blank_lines(text)
+        ]
 
         if not slides:
             return {"slides": [{"title": "内容", "content": [text]}]}
@@ -520,14 +549,12 @@ class OfficeGenerator(ExecutorOwnerMixin):
 
     def _generate_excel_sync(self, file_path: Path, content: dict):
         """生成Excel表格"""
-        from openpyxl import Workbook
-        from openpyxl.styles import Alignment, Font, PatternFill
-
-        wb = Workbook()
+        if not _OPENPYXL_AVAILABLE:
+            raise ImportError("openpyxl 未安装")
 
-        # 删除默认sheet
-        if "Sheet" in wb.sheetnames:
-            wb.remove(wb["Sheet"])
+        # 只写模式逐行流式写入 XML，不在内存中保留整张单元格网格；
+        # 只写工作簿初始没有默认 sheet
+        wb = Workbook(write_only=True)
 
         # 添加工作表
         sheets = content.get("sheets", [])
@@ -542,25 +569,27 @@ class OfficeGenerator(ExecutorOwnerMixin):
 
             # 写入数据
             for row_idx, row_data in enumerate(sheet_data, 1):
-                for col_idx, cell_value in enumerate(row_data, 1):
-                    cell = ws.cell(row=row_idx, column=col_idx, value=cell_value)
+                row_cells = []
+                for cell_value in row_data:
+                    cell = WriteOnlyCell(ws, value=cell_value)
 
                     # 第一行加粗
                     if row_idx == 1:
-                        cell.font = Font(bold=True)
-                        cell.fill = PatternFill(
-                            start_color="DDDDDD", end_color="DDDDDD", fill_type="solid"
-                        )
+                        cell.font = _EXCEL_HEADER_FONT
+                        cell.fill = _EXCEL_HEADER_FILL
 
-                    cell.alignment = Alignment(horizontal="left", vertical="center")
+                    cell.alignment = _EXCEL_CELL_ALIGNMENT
+                    row_cells.append(cell)
+                ws.append(row_cells)
 
         wb.save(str(file_path))
 
     def _generate_ppt_sync(self, file_path: Path, content: dict):
         """生成PowerPoint演示文稿"""
-        from pptx import Presentation
+        if not _PPTX_AVAILABLE:
+            raise ImportError("python-pptx 未安装")
 
-        prs = Presentation()
+        prs = Presentation(io.BytesIO(_DEFAULT_PPTX_BYTES))
 
         # 添加幻灯片
         slides_data = content.get("slides", [])
@@ -569,7 +598,7 @@ class OfficeGenerator(ExecutorOwnerMixin):
 
         for slide_info in slides_data:
             # 使用标题和内容布局
-            slide_layout = prs.slide_layouts[1]  # Title and Content
+            slide_layout = prs.slide_layouts[_DEFAULT_PPT_LAYOUT_IDX]
             slide = prs.slides.add_slide(slide_layout)
 
             # 设置标题
@@ -586,10 +615,10 @@ class OfficeGenerator(ExecutorOwnerMixin):
                 text_frame = slide.shapes[1].text_frame
                 text_frame.clear()
 
+                # 新段落默认即为 0 级，无需再设置 level
+                add_paragraph = text_frame.add_paragraph
                 for item in content_list:
-                    p = text_frame.add_paragraph()
-                    p.text = item
-                    p.level = 0
+                    add_paragraph().text = item
 
         prs.save(str(file_path))
 
@@ -604,9 +633,7 @@ class OfficeGenerator(ExecutorOwnerMixin):
         """
 
         # 保留字母、数字、中文、空格、连字符、下划线、点号
-        filename = "".join(
-            c for c in filename if c.isalnum() or c in (" ", "-", "_", ".")
-        ).strip()
+        filename = filename.translate(_FILENAME_SANITIZE_TABLE).strip()
 
         # 移除开头的点号
         filename = filename.lstrip(".")
@@ -635,7 +662,7 @@ class OfficeGenerator(ExecutorOwnerMixin):
 
         # 如果清理后为空，使用默认文件名
         if not filename or filename == ".":
-            filename = f"office_file_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            filename = f"office_file_{time.strftime('%Y%m%d_%H%M%S')}"
 
         return filename
 
@@ -12,24 +12,35 @@ PDF 转换器模块
 from __future__ import annotations
 
 import asyncio
+import os
 import shutil
 import subprocess
-from concurrent.futures import ThreadPoolExecutor
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from contextlib import suppress
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
 from astrbot.api import logger
 
 from .._executor_mixin import ExecutorOwnerMixin
-from ..compat import _IS_WINDOWS, _WIN32COM_AVAILABLE
-from ..utils import com_application
+from ..compat import _IS_WINDOWS, _WIN32COM_AVAILABLE, _discover_libreoffice
+from ..constants import SUFFIX_TO_OFFICE_TYPE, WORD_SUFFIXES, OfficeType
+from ..utils import _on_com_thread, com_application
 
 # 可选依赖的导入状态
 _PDF2DOCX_AVAILABLE = False
 _TABULA_AVAILABLE = False
 _PDFPLUMBER_AVAILABLE = False
 _DOCX2PDF_AVAILABLE = False
+_PANDAS_AVAILABLE = False
+_XLSXWRITER_AVAILABLE = False
+# PDF→Excel 写出引擎：xlsxwriter 不为每个单元格构建对象图，写出更快、内存更省。
+# 不开启 constant_memory：pandas 按列写单元格，流式模式会丢弃已落盘行之后写入的数据
+_EXCEL_WRITER_ENGINE = "openpyxl"
 
 try:
     from pdf2docx import Converter
@@ -55,32 +66,139 @@ except ImportError:
 # Windows 专用：docx2pdf（仅支持 Word）
 if _IS_WINDOWS:
     try:
-        import docx2pdf  # noqa: F401
+        import docx2pdf
 
         _DOCX2PDF_AVAILABLE = True
     except ImportError:
         pass
 
+# pandas 仅用于 PDF→Excel 写出表格，有可用的表格提取库时才在加载时导入
+if _TABULA_AVAILABLE or _PDFPLUMBER_AVAILABLE:
+    try:
+        import pandas as pd
+
+        _PANDAS_AVAILABLE = True
+    except ImportError:
+        pass
+
+    try:
+        import xlsxwriter
+
+        _XLSXWRITER_AVAILABLE = True
+        _EXCEL_WRITER_ENGINE = "xlsxwriter"
+    except ImportError:
+        pass
+
+
+@lru_cache(maxsize=1)
+def _discover_java(path_env: str) -> str | None:
+    """按 PATH 缓存 java 查找结果（Windows 上需遍历 PATH × PATHEXT）"""
+    return shutil.which("java", path=path_env)
+
+
+# win32com 后端按文档类型选择 Office 应用；应用由 utils 中的 COM 线程统一缓存和退出
+_COM_APP_NAMES = {
+    OfficeType.WORD: "Word.Application",
+    OfficeType.EXCEL: "Excel.Application",
+    OfficeType.POWERPOINT: "PowerPoint.Application",
+}
+
+
+# pdf2docx 的版面分析同样较慢，页数足够多时使用其内置的多进程转换
+_PDF2DOCX_PAGES_PER_WORKER = 4
+
+# pdfplumber 的版面分析是纯 Python 计算，页数足够多时按进程并行提取；
+# 每个进程至少分到这么多页，否则进程启动开销大于收益
+_PDFPLUMBER_PAGES_PER_WORKER = 4
+
+
+def _collect_pdfplumber_page_tables(pdf, page_indexes) -> list[tuple[int, list]]:
+    """提取指定页中的非空表格，返回 (页码, 表格行) 列表"""
+    page_tables = []
+    for page_index in page_indexes:
+        for table in pdf.pages[page_index].extract_tables():
+            if table:
+                page_tables.append((page_index + 1, table))
+    return page_tables
+
+
+def _write_table_rows_xlsxwriter(
+    output_path: Path, sheets: list[tuple[str, list]]
+) -> None:
+    """将 (工作表名, 表格行) 逐行写入 xlsx，第一行作为表头
+
+    行按顺序写出，可以使用 constant_memory 流式落盘，内存只保留当前行
+    """
+    workbook = xlsxwriter.Workbook(
+        str(output_path),
+        {
+            "constant_memory": True,
+            # PDF 中提取的文本按原样保存，不转换为公式或超链接
+            "strings_to_formulas": False,
+            "strings_to_urls": False,
+        },
+    )
+    try:
+        # 与 pandas to_excel 的表头样式保持一致
+        header_format = workbook.add_format(
+            {"bold": True, "border": 1, "align": "center", "valign": "top"}
+        )
+        for sheet_name, rows in sheets:
+            worksheet = workbook.add_worksheet(sheet_name)
+            write_row = worksheet.write_row
+            write_row(0, 0, rows[0], header_format)
+            for row_index, row in enumerate(rows[1:], 1):
+                write_row(row_index, 0, row)
+    finally:
+        workbook.close()
+
+
+def _extract_pdfplumber_tables_worker(
+    pdf_path: str, page_indexes: range
+) -> list[tuple[int, list]]:
+    """在子进程中打开 PDF 并提取分配到的页（模块级函数，便于跨进程序列化）"""
+    with pdfplumber.open(pdf_path) as pdf:
+        return _collect_pdfplumber_page_tables(pdf, page_indexes)
+
+
+def _extract_pdfplumber_tables_parallel(
+    input_path: Path, page_count: int, worker_count: int
+) -> list[tuple[int, list]] | None:
+    """多进程提取全部页面的表格，进程池不可用时返回 None 以回退到单进程"""
+    try:
+        with ProcessPoolExecutor(max_workers=worker_count) as pool:
+            # 交错分配页码，使各进程的负载大致均衡
+            futures = [
+                pool.submit(
+                    _extract_pdfplumber_tables_worker,
+                    str(input_path),
+                    range(offset, page_count, worker_count),
+                )
+                for offset in range(worker_count)
+            ]
+            page_tables = [item for future in futures for item in future.result()]
+    except (BrokenProcessPool, OSError) as e:
+        logger.warning(f"[PDF转换器] pdfplumber 多进程提取失败，改为单进程: {e}")
+        return None
+    # 排序是稳定的，同一页内的表格保持原有顺序
+    page_tables.sort(key=lambda item: item[0])
+    return page_tables
+
 
 class PDFConverter(ExecutorOwnerMixin):
     """PDF 转换器"""
 
-    # LibreOffice 可执行文件的可能路径
-    LIBREOFFICE_PATHS = [
-        "soffice",  # Linux/macOS (在 PATH 中)
-        "libreoffice",  # Linux 备选
-        r"C:\Program Files\LibreOffice\program\soffice.exe",  # Windows 默认
-        r"C:\Program Files (x86)\LibreOffice\program\soffice.exe",  # Windows 32位
-        "/Applications/LibreOffice.app/Contents/MacOS/soffice",  # macOS
-        "/usr/bin/libreoffice",  # Linux
-        "/usr/bin/soffice",  # Linux
-        "/opt/libreoffice/program/soffice",  # Docker/自定义安装
-    ]
-
     def __init__(self, data_path: Path, executor: ThreadPoolExecutor | None = None):
         self.data_path = data_path
         self._init_executor(executor, label="PDF转换器")
         self._libreoffice_path = self._find_libreoffice()
+        # 每个工作线程使用独立且持久的 LibreOffice 用户配置目录：
+        # 并发转换不会争用同一个配置锁，后续启动也无需重新初始化配置
+        self._libreoffice_profile_root = (
+            Path(tempfile.gettempdir())
+            / f"astrbot_office_lo_{os.getpid()}_{id(self):x}"
+        )
+        self._libreoffice_profiles = threading.local()
         self._java_available = self._check_java()
 
         # tabula 需要 Java，如果 Java 不可用则降级到 pdfplumber
@@ -117,6 +235,9 @@ class PDFConverter(ExecutorOwnerMixin):
         else:
             self._excel_backend = None
 
+        # 依赖探测只在初始化时进行一次，结果不会在运行期间变化
+        self._missing_dependencies = self._collect_missing_dependencies()
+
         logger.info(
             f"[PDF转换器] 初始化完成，功能状态: {self._capabilities}, "
             f"Office→PDF 后端: {self._office_to_pdf_backend}"
@@ -134,7 +255,7 @@ class PDFConverter(ExecutorOwnerMixin):
         """检查 Java 是否可用（tabula-py 依赖 Java）"""
         # 只检查 java 是否在 PATH 中，不执行验证
         # 因为多版本 Java 环境下 subprocess 可能有环境变量问题
-        java_path = shutil.which("java")
+        java_path = _discover_java(os.environ.get("PATH", os.defpath))
         if java_path:
             logger.debug(f"[PDF转换器] Java 可用: {java_path}")
             return True
@@ -143,14 +264,10 @@ class PDFConverter(ExecutorOwnerMixin):
 
     def _find_libreoffice(self) -> str | None:
         """查找 LibreOffice 可执行文件"""
-        for path in self.LIBREOFFICE_PATHS:
-            if shutil.which(path):
-                logger.debug(f"[PDF转换器] 找到 LibreOffice: {path}")
-                return path
-            # 对于完整路径，直接检查文件是否存在
-            if Path(path).exists():
-                logger.debug(f"[PDF转换器] 找到 LibreOffice: {path}")
-                return path
+        path = _discover_libreoffice(os.environ.get("PATH", os.defpath))
+        if path:
+            logger.debug(f"[PDF转换器] 找到 LibreOffice: {path}")
+            return path
         # Windows 平台有其他后端可用，不需要警告
         if _IS_WINDOWS and (_DOCX2PDF_AVAILABLE or _WIN32COM_AVAILABLE):
             logger.debug(
@@ -171,6 +288,9 @@ class PDFConverter(ExecutorOwnerMixin):
 
     def get_missing_dependencies(self) -> list[str]:
         """获取缺失的依赖列表"""
+        return list(self._missing_dependencies)
+
+    def _collect_missing_dependencies(self) -> tuple[str, ...]:
         missing = []
         if not self._capabilities["office_to_pdf"]:
             if _IS_WINDOWS:
@@ -187,7 +307,7 @@ class PDFConverter(ExecutorOwnerMixin):
             missing.append(
                 "pdfplumber (pip install pdfplumber，推荐) 或 tabula-py (需要 Java)"
             )
-        return missing
+        return tuple(missing)
 
     def get_detailed_status(self) -> dict:
         """获取详细状态信息（用于调试/状态显示）"""
@@ -254,13 +374,11 @@ class PDFConverter(ExecutorOwnerMixin):
             logger.exception(f"[PDF转换器] {self._office_to_pdf_backend} 转换失败")
             return None
 
+    @_on_com_thread
     def _office_to_pdf_docx2pdf(self, input_path: Path) -> Path | None:
         """使用 docx2pdf 转换（仅支持 Word，需要 MS Office）"""
-        import docx2pdf
-        import pythoncom
-
         suffix = input_path.suffix.lower()
-        if suffix not in (".doc", ".docx"):
+        if suffix not in WORD_SUFFIXES:
             logger.warning(f"[PDF转换器] docx2pdf 仅支持 Word 文件，当前: {suffix}")
             # 尝试用 win32com 作为备选
             if _WIN32COM_AVAILABLE:
@@ -272,12 +390,8 @@ class PDFConverter(ExecutorOwnerMixin):
 
         output_path = self.data_path / f"{input_path.stem}.pdf"
         try:
-            # Windows COM 需要在当前线程初始化
-            pythoncom.CoInitialize()
-            try:
-                docx2pdf.convert(str(input_path), str(output_path))
-            finally:
-                pythoncom.CoUninitialize()
+            # 在共享 COM 线程中执行，COM 已在该线程初始化
+            docx2pdf.convert(str(input_path), str(output_path))
 
             if output_path.exists():
                 logger.info(f"[PDF转换器] docx2pdf 转换成功: {output_path}")
@@ -287,25 +401,33 @@ class PDFConverter(ExecutorOwnerMixin):
             logger.error(f"[PDF转换器] docx2pdf 转换失败: {e}")
             return None
 
+    @_on_com_thread
     def _office_to_pdf_win32com(self, input_path: Path) -> Path | None:
         """使用 win32com 转换（支持 Word/Excel/PPT，需要 MS Office）"""
         suffix = input_path.suffix.lower()
+        office_type = SUFFIX_TO_OFFICE_TYPE.get(suffix)
+        app_name = _COM_APP_NAMES.get(office_type)
+        if app_name is None:
+            logger.error(f"[PDF转换器] win32com 不支持的格式: {suffix}")
+            return None
+
         output_path = self.data_path / f"{input_path.stem}.pdf"
-        input_abs = str(input_path.resolve())
-        output_abs = str(output_path.resolve())
+        # COM 只需要绝对路径，abspath 纯字符串拼接，不像 resolve() 那样逐级访问文件系统
+        input_abs = os.path.abspath(input_path)
+        output_abs = os.path.abspath(output_path)
 
         try:
-            if suffix in (".doc", ".docx"):
-                with com_application("Word.Application") as app:
+            # 只打开、导出、关闭文档，应用本身保留给后续转换复用
+            with com_application(app_name) as app:
+                if office_type is OfficeType.WORD:
                     doc = app.Documents.Open(input_abs)
                     try:
                         doc.SaveAs(output_abs, FileFormat=17)  # 17 = PDF
                     finally:
                         with suppress(Exception):
-                            doc.Close()
+                            doc.Close(SaveChanges=False)
 
-            elif suffix in (".xls", ".xlsx"):
-                with com_application("Excel.Application") as app:
+                elif office_type is OfficeType.EXCEL:
                     wb = app.Workbooks.Open(input_abs)
                     try:
                         wb.ExportAsFixedFormat(0, output_abs)  # 0 = PDF
@@ -313,33 +435,41 @@ class PDFConverter(ExecutorOwnerMixin):
                         with suppress(Exception):
                             wb.Close(SaveChanges=False)
 
-            elif suffix in (".ppt", ".pptx"):
-                with com_application("PowerPoint.Application") as app:
+                else:
                     ppt = app.Presentations.Open(input_abs, WithWindow=False)
                     try:
                         ppt.SaveAs(output_abs, 32)  # 32 = PDF
                     finally:
                         with suppress(Exception):
                             ppt.Close()
-            else:
-                logger.error(f"[PDF转换器] win32com 不支持的格式: {suffix}")
-                return None
 
-            if output_path.exists():
+            if os.path.isfile(output_abs):
                 logger.info(f"[PDF转换器] win32com 转换成功: {output_path}")
                 return output_path
             return None
 
         except Exception as e:
+            # com_application 已丢弃失去响应的应用，下次转换重新启动
             logger.error(f"[PDF转换器] win32com 转换失败: {e}")
             return None
 
+    def _libreoffice_profile_uri(self) -> str:
+        """当前工作线程的 LibreOffice 配置目录 URI"""
+        profile_dir = getattr(self._libreoffice_profiles, "path", None)
+        if profile_dir is None:
+            profile_dir = (
+                self._libreoffice_profile_root / f"worker_{threading.get_ident()}"
+            )
+            self._libreoffice_profiles.path = profile_dir
+        return profile_dir.as_uri()
+
     def _office_to_pdf_libreoffice(self, input_path: Path, timeout: int) -> Path | None:
         """使用 LibreOffice 转换（跨平台）"""
         output_dir = self.data_path
 
         cmd = [
             self._libreoffice_path,
+            f"-env:UserInstallation={self._libreoffice_profile_uri()}",
             "--headless",
             "--invisible",
             "--nologo",
@@ -354,15 +484,17 @@ class PDFConverter(ExecutorOwnerMixin):
         logger.debug(f"[PDF转换器] 执行命令: {' '.join(cmd)}")
 
         try:
+            # stdout 只有进度信息，直接丢弃；stderr 保留字节，仅在失败时解码
             result = subprocess.run(
                 cmd,
-                capture_output=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
                 timeout=timeout,
-                text=True,
             )
 
             if result.returncode != 0:
-                logger.error(f"[PDF转换器] LibreOffice 返回错误: {result.stderr}")
+                stderr = result.stderr.decode("utf-8", errors="replace")
+                logger.error(f"[PDF转换器] LibreOffice 返回错误: {stderr}")
                 return None
 
             # 构建输出文件路径
@@ -418,7 +550,24 @@ class PDFConverter(ExecutorOwnerMixin):
         try:
             cv = Converter(str(input_path))
             try:
-                cv.convert(str(output_path))
+                worker_count = min(
+                    os.cpu_count() or 1,
+                    len(cv.fitz_doc) // _PDF2DOCX_PAGES_PER_WORKER,
+                )
+                if worker_count > 1:
+                    try:
+                        cv.convert(
+                            str(output_path),
+                            multi_processing=True,
+                            cpu_count=worker_count,
+                        )
+                    except Exception as e:
+                        logger.warning(
+                            f"[PDF转换器] pdf2docx 多进程转换失败，改为单进程: {e}"
+                        )
+                        cv.convert(str(output_path))
+                else:
+                    cv.convert(str(output_path))
             finally:
                 cv.close()
 
@@ -487,7 +636,8 @@ class PDFConverter(ExecutorOwnerMixin):
 
     def _pdf_to_excel_tabula(self, input_path: Path) -> Path | None:
         """使用 tabula 提取 PDF 表格到 Excel"""
-        import pandas as pd
+        if not _PANDAS_AVAILABLE:
+            raise ImportError("pandas 未安装，请安装: pip install pandas")
 
         output_path = self.data_path / f"{input_path.stem}.xlsx"
 
@@ -506,7 +656,9 @@ class PDFConverter(ExecutorOwnerMixin):
                 tables = [pd.DataFrame({"提示": ["PDF 中未检测到表格数据"]})]
 
             # 写入 Excel，每个表格一个工作表
-            with pd.ExcelWriter(str(output_path), engine="openpyxl") as writer:
+            with pd.ExcelWriter(
+                str(output_path), engine=_EXCEL_WRITER_ENGINE
+            ) as writer:
                 for i, table in enumerate(tables):
                     sheet_name = f"表格_{i + 1}" if len(tables) > 1 else "Sheet1"
                     # 限制工作表名称长度
@@ -524,31 +676,49 @@ class PDFConverter(ExecutorOwnerMixin):
 
     def _pdf_to_excel_pdfplumber(self, input_path: Path) -> Path | None:
         """使用 pdfplumber 提取 PDF 表格到 Excel"""
-        import pandas as pd
+        if not (_XLSXWRITER_AVAILABLE or _PANDAS_AVAILABLE):
+            raise ImportError("pandas 未安装，请安装: pip install pandas")
 
         output_path = self.data_path / f"{input_path.stem}.xlsx"
 
         try:
-            all_tables = []
-
             with pdfplumber.open(str(input_path)) as pdf:
-                for page_num, page in enumerate(pdf.pages):
-                    tables = page.extract_tables()
-                    for table in tables:
-                        if table:
-                            # 第一行作为表头
-                            df = pd.DataFrame(table[1:], columns=table[0])
-                            all_tables.append((page_num + 1, df))
-
-            if not all_tables:
+                page_count = len(pdf.pages)
+                worker_count = min(
+                    os.cpu_count() or 1,
+                    page_count // _PDFPLUMBER_PAGES_PER_WORKER,
+                )
+                page_tables = None
+                if worker_count > 1:
+                    page_tables = _extract_pdfplumber_tables_parallel(
+                        input_path, page_count, worker_count
+                    )
+                if page_tables is None:
+                    page_tables = _collect_pdfplumber_page_tables(
+                        pdf, range(page_count)
+                    )
+
+            if not page_tables:
                 logger.warning("[PDF转换器] PDF 中未检测到表格")
-                all_tables = [(1, pd.DataFrame({"提示": ["PDF 中未检测到表格数据"]}))]
+                page_tables = [(1, [["提示"], ["PDF 中未检测到表格数据"]])]
 
-            # 写入 Excel
-            with pd.ExcelWriter(str(output_path), engine="openpyxl") as writer:
-                for i, (page_num, table) in enumerate(all_tables):
-                    sheet_name = f"页{page_num}_表{i + 1}"[:31]
-                    table.to_excel(writer, sheet_name=sheet_name, index=False)
+            sheets = [
+                (f"页{page_num}_表{i + 1}"[:31], table)
+                for i, (page_num, table) in enumerate(page_tables)
+            ]
+
+            # 表格已是行列表，直接逐行写出，不再经过 DataFrame
+            if _XLSXWRITER_AVAILABLE:
+                _write_table_rows_xlsxwriter(output_path, sheets)
+            else:
+                # 第一行作为表头
+                with pd.ExcelWriter(
+                    str(output_path), engine=_EXCEL_WRITER_ENGINE
+                ) as writer:
+                    for sheet_name, table in sheets:
+                        pd.DataFrame(table[1:], columns=table[0]).to_excel(
+                            writer, sheet_name=sheet_name, index=False
+                        )
 
             if output_path.exists():
                 logger.info(f"[PDF转换器] PDF→Excel 成功 (pdfplumber): {output_path}")
@@ -572,3 +742,4 @@ class PDFConverter(ExecutorOwnerMixin):
     def cleanup(self):
         """清理资源"""
         self._shutdown_executor()
+        shutil.rmtree(self._libreoffice_profile_root, ignore_errors=True)
@@ -1,4 +1,4 @@
-import asyncio
+from collections.abc import Callable
 from pathlib import Path
 
 import astrbot.api.message_components as Comp
@@ -8,6 +8,8 @@ from astrbot.core.agent.run_context import ContextWrapper
 from astrbot.core.astr_agent_context import AstrAgentContext
 from astrbot.core.message.message_event_result import MessageChain
 
+from .preview_generator import generate_preview_async
+
 
 class PostExportHookService:
     def __init__(
@@ -15,29 +17,32 @@ class PostExportHookService:
         *,
         executor,
         preview_generator,
+        render_executor=None,
         enable_preview: bool,
         auto_delete: bool,
         reply_to_user: bool,
         exported_message: str,
+        forget_missing_file: Callable[[Path], None] | None = None,
     ) -> None:
         self._executor = executor
         self._preview_generator = preview_generator
+        self._render_executor = render_executor
         self._enable_preview = enable_preview
         self._auto_delete = auto_delete
         self._reply_to_user = reply_to_user
         self._exported_message = exported_message
+        self._forget_missing_file = forget_missing_file
 
     async def _generate_preview(self, file_path: Path) -> Path | None:
         if not self._enable_preview:
             return None
 
         try:
-            loop = asyncio.get_running_loop()
-            return await loop.run_in_executor(
-                self._executor,
-                self._preview_generator.generate_preview,
+            return await generate_preview_async(
+                self._preview_generator,
                 file_path,
-                None,
+                executor=self._executor,
+                render_executor=self._render_executor,
             )
         except Exception as exc:
             logger.warning(f"[预览生成] 生成预览图失败: {exc}")
@@ -96,6 +101,9 @@ class PostExportHookService:
     ) -> str:
         if not file_path.exists():
             return self._missing_export_message(file_path)
+        if self._forget_missing_file is not None:
+            # 导出前可能被 read_file 记为不存在
+            self._forget_missing_file(file_path.resolve())
 
         preview_path = await self._generate_preview(file_path)
         await self._send_success_message(event, file_path)
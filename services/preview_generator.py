@@ -2,24 +2,84 @@
 预览图生成器：为 Office/PDF 文件生成第一页预览图
 """
 
-import sys
+import asyncio
+import hashlib
+import os
+import shutil
 import tempfile
+from collections.abc import Iterator
+from concurrent.futures import Executor
+from contextlib import contextmanager, suppress
 from pathlib import Path
 
 from astrbot.api import logger
 
-from ..constants import ALL_OFFICE_SUFFIXES, PDF_SUFFIX
+from ..compat import _IS_WINDOWS, _WIN32COM_AVAILABLE
+from ..constants import ALL_OFFICE_SUFFIXES, PDF_SUFFIX, WORD_SUFFIXES
+
+# 可选依赖的导入状态
+_FITZ_AVAILABLE = False
+_DOCX2PDF_AVAILABLE = False
+
+try:
+    import fitz
+
+    _FITZ_AVAILABLE = True
+except ImportError:
+    pass
+
+# Windows 专用：Office 预览需要先用 docx2pdf 转为 PDF
+if _WIN32COM_AVAILABLE:
+    import pythoncom
+
+    try:
+        from docx2pdf import convert as docx2pdf_convert
+
+        _DOCX2PDF_AVAILABLE = True
+    except ImportError:
+        pass
+
+
+# 按输出文件后缀选择编码格式，缩略图用 JPEG 可显著减小体积
+_JPEG_SUFFIXES = frozenset({".jpg", ".jpeg"})
+_JPEG_QUALITY = 80
+# 预览图磁盘缓存上限，超出后按修改时间淘汰最早的条目
+_PREVIEW_CACHE_MAX_ENTRIES = 256
+
+
+def _encode_pixmap(pix, image_format: str) -> bytes:
+    if image_format == "jpeg":
+        return pix.tobytes("jpeg", jpg_quality=_JPEG_QUALITY)
+    return pix.tobytes("png")
+
+
+def _render_pixmap(page, zoom: float, grayscale: bool):
+    # 预览图不需要透明通道；灰度像素只有 RGB 的三分之一
+    return page.get_pixmap(
+        matrix=fitz.Matrix(zoom, zoom),
+        colorspace=fitz.csGRAY if grayscale else fitz.csRGB,
+        alpha=False,
+    )
 
 
 class PreviewGenerator:
     """文件预览图生成器"""
 
-    def __init__(self, dpi: int = 150):
+    def __init__(
+        self,
+        dpi: int = 100,
+        grayscale: bool = False,
+        cache_dir: Path | None = None,
+    ):
         """
         Args:
-            dpi: 预览图分辨率，默认 150
+            dpi: 预览图分辨率，默认 100
+            grayscale: 是否渲染为灰度图
+            cache_dir: 预览图缓存目录，为 None 时不缓存
         """
         self.dpi = dpi
+        self.grayscale = grayscale
+        self.cache_dir = cache_dir
         self._zoom = dpi / 72  # PDF 默认 72 DPI
 
     def generate_preview(
@@ -30,22 +90,94 @@ class PreviewGenerator:
 
         Args:
             file_path: 源文件路径
-            output_path: 输出图片路径，默认为源文件同目录下的 {filename}_preview.png
+            output_path: 输出图片路径，默认为源文件同目录下的 {filename}_preview.png；
+                后缀为 .jpg/.jpeg 时编码为 JPEG
 
         Returns:
             生成的预览图路径，失败返回 None
         """
-        suffix = file_path.suffix.lower()
-
         if output_path is None:
             output_path = file_path.with_name(f"{file_path.stem}_preview.png")
 
+        image_format = (
+            "jpeg" if output_path.suffix.lower() in _JPEG_SUFFIXES else "png"
+        )
+        cache_path = self._cache_path(file_path, image_format)
+        if cache_path is not None and cache_path.is_file():
+            try:
+                shutil.copyfile(cache_path, output_path)
+                logger.debug(f"[预览生成] 命中预览图缓存: {output_path.name}")
+                return output_path
+            except OSError as e:
+                logger.debug(f"[预览生成] 读取预览图缓存失败: {e}")
+
+        image_bytes = self.generate_preview_bytes(file_path, image_format)
+        if image_bytes is None:
+            return None
+
+        try:
+            output_path.write_bytes(image_bytes)
+        except Exception as e:
+            logger.error(f"[预览生成] 写入预览图失败: {e}")
+            return None
+
+        if cache_path is not None:
+            self._store_cache(cache_path, image_bytes)
+
+        logger.info(f"[预览生成] 已生成预览图: {output_path.name}")
+        return output_path
+
+    def _cache_path(self, file_path: Path, image_format: str) -> Path | None:
+        """按 (路径, 修改时间, 大小, 渲染参数) 计算缓存文件路径"""
+        if self.cache_dir is None:
+            return None
+        try:
+            st = file_path.stat()
+        except OSError:
+            return None
+        key = hashlib.blake2b(
+            f"{file_path}\0{st.st_mtime_ns}\0{st.st_size}\0"
+            f"{self.dpi}\0{self.grayscale}".encode(),
+            digest_size=16,
+        ).hexdigest()
+        suffix = ".jpg" if image_format == "jpeg" else ".png"
+        return self.cache_dir / f"{key}{suffix}"
+
+    def _store_cache(self, cache_path: Path, image_bytes: bytes) -> None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_bytes(image_bytes)
+            with os.scandir(cache_path.parent) as entries:
+                cached = [entry for entry in entries if entry.is_file()]
+            if len(cached) > _PREVIEW_CACHE_MAX_ENTRIES:
+                cached.sort(key=lambda entry: entry.stat().st_mtime_ns)
+                for entry in cached[: len(cached) - _PREVIEW_CACHE_MAX_ENTRIES]:
+                    with suppress(OSError):
+                        os.unlink(entry.path)
+        except OSError as e:
+            logger.debug(f"[预览生成] 写入预览图缓存失败: {e}")
+
+    def generate_preview_bytes(
+        self, file_path: Path, image_format: str = "png"
+    ) -> bytes | None:
+        """
+        生成文件第一页预览图的图片字节，不落盘
+
+        Args:
+            file_path: 源文件路径
+            image_format: 编码格式，"png" 或 "jpeg"
+
+        Returns:
+            图片字节，失败返回 None
+        """
+        suffix = file_path.suffix.lower()
+
         try:
             if suffix == PDF_SUFFIX:
-                return self._generate_from_pdf(file_path, output_path)
+                return self._render_pdf_first_page(file_path, image_format)
 
             if suffix in ALL_OFFICE_SUFFIXES:
-                return self._generate_from_office(file_path, output_path)
+                return self._render_office_first_page(file_path, image_format)
 
             logger.warning(f"[预览生成] 不支持的文件格式: {suffix}")
             return None
@@ -54,77 +186,126 @@ class PreviewGenerator:
             logger.error(f"[预览生成] 生成预览图失败: {e}")
             return None
 
-    def _generate_from_pdf(self, pdf_path: Path, output_path: Path) -> Path | None:
-        """从 PDF 生成预览图"""
-        try:
-            import fitz
-        except ImportError:
+    def _render_pdf_first_page(
+        self, pdf_path: Path, image_format: str = "png"
+    ) -> bytes | None:
+        """将 PDF 第一页渲染为图片字节"""
+        if not _FITZ_AVAILABLE:
             logger.warning("[预览生成] PyMuPDF (fitz) 未安装，无法生成预览图")
             return None
 
         try:
-            doc = fitz.open(str(pdf_path))
-            if doc.page_count == 0:
-                logger.warning(f"[预览生成] PDF 文件为空: {pdf_path.name}")
-                doc.close()
-                return None
+            # 渲染失败时也要关闭文档，避免渲染进程池中的常驻进程泄漏文件句柄
+            with fitz.open(str(pdf_path)) as doc:
+                if doc.page_count == 0:
+                    logger.warning(f"[预览生成] PDF 文件为空: {pdf_path.name}")
+                    return None
 
-            page = doc[0]
-            mat = fitz.Matrix(self._zoom, self._zoom)
-            pix = page.get_pixmap(matrix=mat)
-            pix.save(str(output_path))
-            doc.close()
-
-            logger.info(f"[预览生成] 已生成预览图: {output_path.name}")
-            return output_path
+                pix = _render_pixmap(doc[0], self._zoom, self.grayscale)
+                return _encode_pixmap(pix, image_format)
 
         except Exception as e:
             logger.error(f"[预览生成] PDF 预览生成失败: {e}")
             return None
 
-    def _generate_from_office(
-        self, office_path: Path, output_path: Path
-    ) -> Path | None:
-        """从 Office 文件生成预览图（先转 PDF）
+    def _render_office_first_page(
+        self, office_path: Path, image_format: str = "png"
+    ) -> bytes | None:
+        """将 Office 文件第一页渲染为图片字节（先转 PDF）
 
         注意：docx2pdf 仅支持 Word 文件，Excel/PPT 暂不支持预览图生成
         """
+        with self._office_to_pdf(office_path) as pdf_path:
+            if pdf_path is None:
+                return None
+            return self._render_pdf_first_page(pdf_path, image_format)
+
+    @contextmanager
+    def _office_to_pdf(self, office_path: Path) -> Iterator[Path | None]:
+        """将 Office 文件转换为临时 PDF，退出时删除；失败时产出 None"""
         suffix = office_path.suffix.lower()
 
         # docx2pdf 仅支持 Word 格式
-        if suffix not in (".doc", ".docx"):
+        if suffix not in WORD_SUFFIXES:
             logger.debug(f"[预览生成] 暂不支持 {suffix} 格式预览图（仅支持 Word）")
-            return None
+            yield None
+            return
 
-        if sys.platform != "win32":
+        if not _IS_WINDOWS:
             logger.warning("[预览生成] Office 预览仅支持 Windows 系统")
-            return None
+            yield None
+            return
 
-        try:
-            from docx2pdf import convert
-        except ImportError:
+        if not _DOCX2PDF_AVAILABLE:
             logger.warning("[预览生成] docx2pdf 未安装，无法生成 Office 预览")
-            return None
+            yield None
+            return
 
         # 创建临时 PDF
         with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
             tmp_pdf = Path(tmp.name)
 
         try:
-            # Windows COM 需要在当前线程初始化
-            import pythoncom
-
-            pythoncom.CoInitialize()
             try:
-                convert(str(office_path), str(tmp_pdf))
-            finally:
-                pythoncom.CoUninitialize()
+                # Windows COM 需要在当前线程初始化
+                pythoncom.CoInitialize()
+                try:
+                    docx2pdf_convert(str(office_path), str(tmp_pdf))
+                finally:
+                    pythoncom.CoUninitialize()
+            except Exception as e:
+                logger.error(f"[预览生成] Office 转 PDF 失败: {e}")
+                yield None
+                return
 
-            return self._generate_from_pdf(tmp_pdf, output_path)
-        except Exception as e:
-            logger.error(f"[预览生成] Office 转 PDF 失败: {e}")
-            return None
+            yield tmp_pdf
         finally:
             # 清理临时文件
             if tmp_pdf.exists():
                 tmp_pdf.unlink()
+
+
+def render_preview(
+    file_path: str,
+    dpi: int,
+    cache_dir: Path | None = None,
+    grayscale: bool = False,
+) -> str | None:
+    """在渲染进程池中生成预览图（模块级函数，便于跨进程序列化）"""
+    generator = PreviewGenerator(dpi=dpi, grayscale=grayscale, cache_dir=cache_dir)
+    preview_path = generator.generate_preview(Path(file_path))
+    return str(preview_path) if preview_path else None
+
+
+async def generate_preview_async(
+    preview_generator: PreviewGenerator,
+    file_path: Path,
+    *,
+    executor: Executor,
+    render_executor: Executor | None = None,
+) -> Path | None:
+    """在渲染进程池中生成预览图，进程池不可用时回退到线程池
+
+    工作进程崩溃或被杀后进程池进入 broken 状态，之后的提交会立即抛出
+    BrokenProcessPool；进程池已关闭时提交会抛出 RuntimeError。
+    两种情况都改用 executor 调用 preview_generator.generate_preview。
+    """
+    loop = asyncio.get_running_loop()
+    if render_executor is not None:
+        try:
+            # 光栅化是 CPU 密集型任务，放到独立进程中避免与 GIL 争用
+            preview_path = await loop.run_in_executor(
+                render_executor,
+                render_preview,
+                str(file_path),
+                preview_generator.dpi,
+                preview_generator.cache_dir,
+                preview_generator.grayscale,
+            )
+            return Path(preview_path) if preview_path else None
+        except RuntimeError as exc:
+            # BrokenProcessPool 是 RuntimeError 的子类
+            logger.warning(f"[预览生成] 渲染进程池不可用，改为在线程中生成预览: {exc}")
+    return await loop.run_in_executor(
+        executor, preview_generator.generate_preview, file_path, None
+    )
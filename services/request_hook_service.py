@@ -10,8 +10,8 @@ from astrbot.api.event import AstrMessageEvent
 from ..constants import (
     ALL_OFFICE_SUFFIXES,
     EXCEL_SCRIPT_RETRY_EXHAUSTED_EVENT_KEY,
-    EXECUTION_TOOLS,
-    FILE_TOOLS,
+    EXECUTION_TOOL_NAMES,
+    FILE_TOOL_NAMES,
     PDF_SUFFIX,
     TEXT_SUFFIXES,
 )
@@ -23,6 +23,7 @@ from ..internal_hooks import (
     run_notice_hooks,
     run_tool_exposure_hooks,
 )
+from .buffered_event_registry import is_buffered_event
 from .prompt_context_service import PromptContextService, PromptSection
 from .excel_intent_router import ExcelIntentRouter
 from .request_follow_up import (
@@ -35,6 +36,7 @@ from .request_hook_notice_helpers import (
     FollowUpNoticeHelper,
     FollowUpNoticeRule,
 )
+from .tool_set_utils import remove_tools
 from .upload_types import UploadInfo
 from .runtime_config import (
     SUPPORTED_COMPUTER_RUNTIME_MODES,
@@ -623,7 +625,7 @@ class RequestHookService:
     ) -> NoticeBuildContext:
         if not context.can_process_upload:
             return context
-        if getattr(context.event, "_buffered", False) is True:
+        if is_buffered_event(context.event):
             return context
 
         event = context.event
@@ -727,8 +729,7 @@ class RequestHookService:
             and context.request.func_tool
             and self._auto_block_execution_tools
         ):
-            for tool_name in EXECUTION_TOOLS:
-                context.request.func_tool.remove_tool(tool_name)
+            remove_tools(context.request.func_tool, EXECUTION_TOOL_NAMES)
             logger.debug("[文件管理] 已自动屏蔽 shell/python 执行类工具")
         return context
 
@@ -746,8 +747,7 @@ class RequestHookService:
         )
         if not retry_exhausted:
             return context
-        for tool_name in FILE_TOOLS:
-            context.request.func_tool.remove_tool(tool_name)
+        remove_tools(context.request.func_tool, FILE_TOOL_NAMES)
         logger.info("[文件管理] Excel 脚本重试次数已用尽，已隐藏本次请求剩余文件工具")
         return context
 
@@ -798,16 +798,15 @@ class RequestHookService:
         ):
             exposed_file_tool_names = self._get_exposed_tool_names(
                 context.request.func_tool
-            ).intersection(FILE_TOOLS)
+            ).intersection(FILE_TOOL_NAMES)
             if context.explicit_tool_name not in exposed_file_tool_names:
                 logger.info(
                     "[文件管理] 检测到用户显式指定工具 %s，但该工具当前未暴露，跳过工具收窄",
                     context.explicit_tool_name,
                 )
                 return context
-            for tool_name in exposed_file_tool_names:
-                if tool_name != context.explicit_tool_name:
-                    context.request.func_tool.remove_tool(tool_name)
+            exposed_file_tool_names.discard(context.explicit_tool_name)
+            remove_tools(context.request.func_tool, exposed_file_tool_names)
             logger.info(
                 "[文件管理] 检测到用户显式指定工具 %s，本轮仅保留该文件工具",
                 context.explicit_tool_name,
@@ -1,4 +1,5 @@
-import importlib
+import importlib.util
+import os
 import tempfile
 from collections.abc import Iterable
 from concurrent.futures import ThreadPoolExecutor
@@ -7,6 +8,7 @@ from pathlib import Path
 from astrbot.api import logger
 from astrbot.api.star import StarTools
 
+from .._executor_mixin import LazyProcessPoolExecutor
 from ..agent_tools import build_document_toolset
 
 # workbook toolset may be introduced incrementally
@@ -50,6 +52,10 @@ from .upload_session_service import UploadSessionService
 from .word_read_service import WordReadService
 from .workspace_service import WorkspaceService
 
+# 共享线程池承担 Office 生成、PDF 转换和文件读取，均以 I/O 与序列化为主，
+# 按标准库默认公式放宽并发，避免多个生成请求互相排队
+_IO_EXECUTOR_MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
 
 def build_plugin_runtime(
     *,
@@ -70,7 +76,7 @@ def build_plugin_runtime(
     temp_dir, plugin_data_path = _prepare_workspace(
         settings.auto_delete, plugin_name=plugin_name
     )
-    executor = ThreadPoolExecutor(max_workers=4)
+    executor = ThreadPoolExecutor(max_workers=_IO_EXECUTOR_MAX_WORKERS)
     document_render_backend_config = _build_document_render_backend_config(settings)
     default_document_style = _build_default_document_style(settings)
     office_gen = OfficeGenerator(
@@ -80,8 +86,25 @@ def build_plugin_runtime(
         default_document_style=default_document_style,
     )
     pdf_converter = PDFConverter(plugin_data_path, executor=executor)
-    preview_gen = PreviewGenerator(dpi=settings.preview_dpi)
+    preview_gen = PreviewGenerator(
+        dpi=settings.preview_dpi,
+        grayscale=settings.preview_grayscale,
+        cache_dir=_resolve_preview_cache_dir(temp_dir, plugin_data_path),
+    )
+    # 预览渲染进程池在首次生成预览时才启动工作进程，避免在插件加载时 fork 多线程宿主
+    render_executor = (
+        LazyProcessPoolExecutor(max_workers=min(4, os.cpu_count() or 2))
+        if settings.enable_preview
+        else None
+    )
     office_libs = _check_office_libs()
+    # 文档解析是 CPU 密集型任务；工作进程在首次提取时才启动，
+    # 没有可用的 Office 解析库时不会有任务提交，直接不创建
+    extract_executor = (
+        LazyProcessPoolExecutor(max_workers=min(4, os.cpu_count() or 2))
+        if any(office_libs.values())
+        else None
+    )
 
     workspace_service = WorkspaceService(
         plugin_data_path=plugin_data_path,
@@ -89,11 +112,10 @@ def build_plugin_runtime(
         office_libs=office_libs,
         max_file_size=settings.max_file_size,
         feature_settings=settings.feature_settings,
+        extract_executor=extract_executor,
     )
     access_policy_service = AccessPolicyService(
-        whitelist_users=config.get("permission_settings", {}).get(
-            "whitelist_users", []
-        ),
+        whitelist_users=list(settings.whitelist_users),
         admin_users=list(admin_users),
         get_admin_users=get_admin_users,
         allow_all_users=settings.allow_all_users,
@@ -113,6 +135,7 @@ def build_plugin_runtime(
     delivery_service = DeliveryService(
         executor=executor,
         preview_generator=preview_gen,
+        render_executor=render_executor,
         enable_preview=settings.enable_preview,
         auto_delete=settings.auto_delete,
         reply_to_user=settings.reply_to_user,
@@ -120,10 +143,12 @@ def build_plugin_runtime(
     post_export_hook_service = PostExportHookService(
         executor=executor,
         preview_generator=preview_gen,
+        render_executor=render_executor,
         enable_preview=settings.enable_preview,
         auto_delete=settings.auto_delete,
         reply_to_user=settings.reply_to_user,
         exported_message=MSG_DOCUMENT_EXPORTED,
+        forget_missing_file=workspace_service.forget_missing_file,
     )
     image_asset_service = ImageAssetService(plugin_data_path=plugin_data_path)
 
@@ -211,6 +236,8 @@ def build_plugin_runtime(
         temp_dir=temp_dir,
         plugin_data_path=plugin_data_path,
         executor=executor,
+        render_executor=render_executor,
+        extract_executor=extract_executor,
         office_gen=office_gen,
         pdf_converter=pdf_converter,
         preview_gen=preview_gen,
@@ -491,13 +518,28 @@ def _prepare_workspace(
     return None, plugin_data_path
 
 
-def _check_office_libs() -> dict:
+def _resolve_preview_cache_dir(
+    temp_dir: tempfile.TemporaryDirectory | None,
+    plugin_data_path: Path,
+) -> Path | None:
+    # 缓存放在文件库之外，避免被列出或按文件名解析；
+    # 自动删除模式下源文件发送后即被删除，缓存不会命中，直接不启用
+    if temp_dir is not None:
+        return None
+    return plugin_data_path.parent / "preview_cache"
+
+
+def _check_office_libs() -> dict[str, bool]:
+    # 仅检测是否已安装，实际导入推迟到首次使用时，避免启动时加载 lxml 等重型依赖
     libs = {}
     for office_type, (module_name, package_name) in OFFICE_LIBS.items():
         try:
-            libs[module_name] = importlib.import_module(module_name)
-            logger.debug(f"[文件管理] {package_name} 已加载")
-        except ImportError:
-            libs[module_name] = None
+            available = importlib.util.find_spec(module_name) is not None
+        except (ImportError, ValueError):
+            available = False
+        libs[module_name] = available
+        if available:
+            logger.debug(f"[文件管理] {package_name} 已安装")
+        else:
             logger.warning(f"[文件管理] {package_name} 未安装")
     return libs
@@ -0,0 +1,15 @@
+from collections.abc import Collection
+
+
+def remove_tools(func_tool, tool_names: Collection[str]) -> None:
+    """一次过滤移除多个工具。
+
+    ToolSet.remove_tool 每次都会重建工具列表，逐个移除 N 个工具需要 N 次重建；
+    工具列表可直接访问时改为单次过滤，否则退回逐个移除。
+    """
+    tools = getattr(func_tool, "tools", None)
+    if isinstance(tools, list):
+        func_tool.tools = [tool for tool in tools if tool.name not in tool_names]
+        return
+    for tool_name in tool_names:
+        func_tool.remove_tool(tool_name)
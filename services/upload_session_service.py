@@ -11,7 +11,12 @@ from astrbot.core.utils.active_event_registry import active_event_registry
 from astrbot.core.platform.message_type import MessageType
 
 from ..constants import ALL_OFFICE_SUFFIXES, PDF_SUFFIX, TEXT_SUFFIXES
-from .image_file_utils import is_supported_image_reference
+from .buffered_event_registry import (
+    get_buffer_reentry_count,
+    is_buffered_event,
+    mark_buffered_event,
+)
+from .image_file_utils import filename_suffix, is_supported_image_reference
 from .message_buffer import BufferedMessage
 from .upload_prompt_service import UploadInfo, UploadPromptService
 
@@ -194,7 +199,7 @@ class UploadSessionService:
         self._recent_text_last_cleanup_ts = now
 
     def _extract_recent_text_candidate(self, event: AstrMessageEvent) -> str:
-        if getattr(event, "_buffered", False):
+        if is_buffered_event(event):
             return ""
 
         message = getattr(getattr(event, "message_obj", None), "message", None) or []
@@ -405,8 +410,7 @@ class UploadSessionService:
                 event.unified_msg_origin,
                 exclude=event,
             )
-            setattr(requeued_event, "_buffered", True)
-            setattr(requeued_event, "_buffer_reentry_count", reentry_count + 1)
+            mark_buffered_event(requeued_event, reentry_count + 1)
             requeued_event._result = None
             if force_command_wake:
                 requeued_event.is_wake = True
@@ -446,8 +450,7 @@ class UploadSessionService:
             return cached
         return []
 
-    def _resolve_upload_type(self, filename: str) -> tuple[str, bool]:
-        suffix = Path(filename).suffix.lower() if filename else ""
+    def _resolve_upload_type(self, suffix: str) -> tuple[str, bool]:
         if suffix in ALL_OFFICE_SUFFIXES:
             return "Office文档 (Word/Excel/PPT)", True
         if suffix in TEXT_SUFFIXES:
@@ -471,10 +474,11 @@ class UploadSessionService:
             if isinstance(file_component, Comp.File):
                 name = file_component.name or ""
             name = name or "未命名文件"
-            type_desc, is_supported = self._resolve_upload_type(name)
+            suffix = filename_suffix(name)
+            type_desc, is_supported = self._resolve_upload_type(suffix)
             info: UploadInfo = {
                 "original_name": name,
-                "file_suffix": Path(name).suffix.lower() if name else "",
+                "file_suffix": suffix,
                 "type_desc": type_desc,
                 "is_supported": is_supported,
                 "stored_name": "",
@@ -488,11 +492,12 @@ class UploadSessionService:
                     )
                     if original_name:
                         info["original_name"] = original_name
-                        info["file_suffix"] = Path(original_name).suffix.lower()
+                        suffix = filename_suffix(original_name)
+                        info["file_suffix"] = suffix
                         (
                             info["type_desc"],
                             info["is_supported"],
-                        ) = self._resolve_upload_type(original_name)
+                        ) = self._resolve_upload_type(suffix)
                     if src_path and src_path.exists():
                         actual_name = original_name or name
                         if self.is_image_file(actual_name) or self.is_image_file(
@@ -523,7 +528,7 @@ class UploadSessionService:
 
         buffered_text_count = len(texts)
 
-        reentry_count = getattr(event, "_buffer_reentry_count", 0)
+        reentry_count = get_buffer_reentry_count(event)
         if reentry_count >= 3:
             logger.warning("[消息缓冲] 事件重入次数过多，停止处理")
             return
@@ -1,3 +1,4 @@
+import asyncio
 import base64
 import mimetypes
 from collections.abc import AsyncGenerator
@@ -18,6 +19,24 @@ from ..utils import (
     safe_error_message,
 )
 
+# 可选依赖：pybase64 使用 SIMD 加速 base64 编码，未安装时回退到标准库
+_PYBASE64_AVAILABLE = False
+
+try:
+    import pybase64
+
+    _PYBASE64_AVAILABLE = True
+except ImportError:
+    pass
+
+
+def _encode_file_base64(file_path: Path) -> str:
+    """一次读取并编码；内联图片已受 max_inline_docx_image_bytes 限制"""
+    data = file_path.read_bytes()
+    if _PYBASE64_AVAILABLE:
+        return pybase64.b64encode_as_string(data)
+    return base64.b64encode(data).decode("ascii")
+
 
 class WordReadService:
     def __init__(
@@ -42,7 +61,7 @@ class WordReadService:
         content: list[mcp.types.ImageContent] = []
         for image_path in image_paths:
             try:
-                base64_data = base64.b64encode(image_path.read_bytes()).decode("utf-8")
+                base64_data = _encode_file_base64(image_path)
             except Exception as exc:
                 logger.warning(
                     "[文件管理] 读取嵌入图片失败: %s",
@@ -113,7 +132,8 @@ class WordReadService:
         suffix: str,
         file_size: int,
     ) -> AsyncGenerator[str | mcp.types.CallToolResult, None]:
-        extracted = self._workspace_service.extract_word_content(
+        extracted = await asyncio.to_thread(
+            self._workspace_service.extract_word_content,
             resolved_path,
             include_images=self._enable_docx_image_review,
         )
@@ -149,7 +169,9 @@ class WordReadService:
                 )
             return
 
-        skipped_image_reasons = self._plan_inline_word_images(extracted.image_paths)
+        skipped_image_reasons = await asyncio.to_thread(
+            self._plan_inline_word_images, extracted.image_paths
+        )
         fallback_image_index = 0
         text_chunks: list[str] = []
         selected_image_paths: list[Path] = []
@@ -183,7 +205,9 @@ class WordReadService:
                 yield self._workspace_service.format_file_result(
                     display_name, suffix, file_size, final_text
                 )
-            image_result = self._build_image_tool_result(selected_image_paths)
+            image_result = await asyncio.to_thread(
+                self._build_image_tool_result, selected_image_paths
+            )
             if image_result is not None:
                 yield image_result
             return
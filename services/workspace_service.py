@@ -1,6 +1,12 @@
 import asyncio
+import os
 import shutil
+import stat
+import threading
+import time
+from collections import OrderedDict
 from collections.abc import Callable, Mapping
+from concurrent.futures import Executor
 from pathlib import Path
 
 try:
@@ -14,10 +20,15 @@ except ImportError:
 from astrbot.api import logger
 from astrbot.api.event import AstrMessageEvent
 
-from ..constants import DEFAULT_CHUNK_SIZE, OfficeType
+from ..constants import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_MAX_EXTRACTED_TEXT_CHARS,
+    OfficeType,
+)
 from ..utils import (
     ExtractedWordContent,
     extract_excel_text,
+    extract_pdf_pages_text,
     extract_ppt_text,
     extract_word_content,
     format_extracted_word_content,
@@ -25,6 +36,27 @@ from ..utils import (
 )
 
 STORE_UPLOADED_FILE_MAX_ATTEMPTS = 1000
+# 不存在文件的负缓存：LLM 反复试探同一个不存在的文件名时直接返回
+MISSING_FILE_CACHE_TTL_SECONDS = 2.0
+MISSING_FILE_CACHE_MAX_ENTRIES = 256
+# Excel/PPT/PDF 提取结果缓存：文件大小与修改时间不变时直接复用
+EXTRACTED_TEXT_CACHE_MAX_ENTRIES = 32
+
+# 旧格式依赖 COM（单线程单元）或 antiword 子进程，只能在线程中提取
+_THREAD_ONLY_EXTRACT_SUFFIXES = frozenset({".doc", ".xls", ".ppt"})
+
+# Word 走结构化提取，其余类型按 (依赖库, 提取函数) 分派
+_OFFICE_TEXT_EXTRACTORS: dict[
+    OfficeType, tuple[str, Callable[[Path], str | None]]
+] = {
+    OfficeType.EXCEL: ("openpyxl", extract_excel_text),
+    OfficeType.POWERPOINT: ("pptx", extract_ppt_text),
+}
+
+
+def _call_extractor(extractor: Callable, file_path: Path, *args, **kwargs):
+    """在当前线程直接执行提取函数，与 _run_extractor 的调用签名一致"""
+    return extractor(file_path, *args, **kwargs)
 
 
 class WorkspaceService:
@@ -36,19 +68,53 @@ class WorkspaceService:
         office_libs: dict,
         max_file_size: int,
         feature_settings: Mapping[str, bool] | None = None,
+        extract_executor: Executor | None = None,
     ) -> None:
         self.plugin_data_path = plugin_data_path
+        # 工作区根目录不会变化，只解析一次
+        self._resolved_base = plugin_data_path.resolve()
+        self._resolved_base_str = str(self._resolved_base)
         self._executor = executor
+        # 纯 Python 解析的 Office 提取放到进程池执行，避免与事件循环线程争用 GIL
+        self._extract_executor = extract_executor
         self._office_libs = office_libs
         self._max_file_size = max_file_size
         self._feature_settings = dict(feature_settings or {})
+        self._missing_files: OrderedDict[str, float] = OrderedDict()
+        # 提取在工作线程中执行，缓存读写需加锁
+        self._extracted_text_cache: OrderedDict[str, tuple[int, int, str]] = (
+            OrderedDict()
+        )
+        self._extracted_text_lock = threading.Lock()
 
     def get_max_file_size(self) -> int:
         return self._max_file_size
 
+    @staticmethod
+    def _is_plain_filename(filename: str) -> bool:
+        """不含目录、盘符和 ~ 的单层文件名"""
+        return (
+            bool(filename)
+            and filename not in (".", "..")
+            and not filename.startswith("~")
+            and not any(ch in filename for ch in "/\\:\0")
+        )
+
     def validate_path(
         self, filename: str, *, allow_external: bool = False
     ) -> tuple[bool, Path, str]:
+        # 单层文件名直接拼接到已解析的工作区根目录，只需一次 lstat 排除符号链接
+        if self._is_plain_filename(filename):
+            candidate = os.path.join(self._resolved_base_str, filename)
+            try:
+                is_link = stat.S_ISLNK(os.lstat(candidate).st_mode)
+            except FileNotFoundError:
+                is_link = False
+            except OSError:
+                is_link = True  # 交给下方 resolve() 处理
+            if not is_link:
+                return True, Path(candidate), ""
+
         input_path = Path(filename).expanduser()
         try:
             if input_path.is_absolute():
@@ -56,8 +122,7 @@ class WorkspaceService:
             else:
                 resolved = (self.plugin_data_path / input_path).resolve()
 
-            base = self.plugin_data_path.resolve()
-            if resolved.is_relative_to(base):
+            if resolved.is_relative_to(self._resolved_base):
                 return True, resolved, ""
 
             if allow_external and input_path.is_absolute():
@@ -79,6 +144,26 @@ class WorkspaceService:
         name = Path(value).name
         return name or value
 
+    def remember_missing_file(self, file_path: Path) -> None:
+        key = str(file_path)
+        self._missing_files[key] = time.monotonic()
+        self._missing_files.move_to_end(key)
+        while len(self._missing_files) > MISSING_FILE_CACHE_MAX_ENTRIES:
+            self._missing_files.popitem(last=False)
+
+    def forget_missing_file(self, file_path: Path) -> None:
+        self._missing_files.pop(str(file_path), None)
+
+    def is_recently_missing(self, file_path: Path) -> bool:
+        key = str(file_path)
+        ts = self._missing_files.get(key)
+        if ts is None:
+            return False
+        if time.monotonic() - ts < MISSING_FILE_CACHE_TTL_SECONDS:
+            return True
+        del self._missing_files[key]
+        return False
+
     def try_copy_uploaded_file(self, src_path: Path, dst_path: Path) -> bool:
         try:
             with src_path.open("rb") as src, dst_path.open("xb") as dst:
@@ -87,6 +172,7 @@ class WorkspaceService:
                 shutil.copystat(src_path, dst_path)
             except OSError:
                 pass
+            self.forget_missing_file(dst_path)
             return True
         except FileExistsError:
             return False
@@ -115,9 +201,9 @@ class WorkspaceService:
     async def read_text_file(
         self, file_path: Path, max_size: int, chunk_size: int = DEFAULT_CHUNK_SIZE
     ) -> str:
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(
-            self._executor, self.read_text_file_sync, file_path, max_size, chunk_size
+        # 短小的文本读取走默认线程池，避免排在共享执行器里的长时间转换任务之后
+        return await asyncio.to_thread(
+            self.read_text_file_sync, file_path, max_size, chunk_size
         )
 
     def read_text_file_sync(
@@ -126,18 +212,22 @@ class WorkspaceService:
         if chunk_size <= 0:
             chunk_size = DEFAULT_CHUNK_SIZE
 
-        chunks = []
-        bytes_read = 0
-        with open(file_path, encoding="utf-8", errors="replace") as file:
-            while bytes_read < max_size:
-                chunk = file.read(chunk_size)
+        # 无缓冲读取直接落到 os.read，且不会读取超过 max_size 的字节
+        data = bytearray()
+        with open(file_path, "rb", buffering=0) as file:
+            while len(data) < max_size:
+                chunk = file.read(min(chunk_size, max_size - len(data)))
                 if not chunk:
                     break
-                chunks.append(chunk)
-                bytes_read += len(chunk.encode("utf-8"))
+                data += chunk
 
-        content = "".join(chunks)
-        if bytes_read >= max_size:
+        # 与文本模式的通用换行一致：CRLF 与单独的 CR（旧版 Mac）都转换为 LF
+        content = (
+            data.decode("utf-8", errors="replace")
+            .replace("\r\n", "\n")
+            .replace("\r", "\n")
+        )
+        if len(data) >= max_size:
             content += (
                 f"\n\n[警告: 文件内容已截断，仅显示前 {format_file_size(max_size)}]"
             )
@@ -150,24 +240,45 @@ class WorkspaceService:
             extracted = self.extract_word_content(file_path)
             return self.format_word_content(extracted)
 
-        extractors = {
-            OfficeType.EXCEL: ("openpyxl", extract_excel_text),
-            OfficeType.POWERPOINT: ("pptx", extract_ppt_text),
-        }
-        lib_key, extractor = extractors.get(office_type, (None, None))
-        if not lib_key or not self._office_libs.get(lib_key):
+        entry = _OFFICE_TEXT_EXTRACTORS.get(office_type)
+        if entry is None or not self._office_libs.get(entry[0]):
             logger.debug(
                 f"[文件管理] Office 类型 '{office_type.name}' 对应的库未加载或类型不支持。"
             )
             return None
 
-        if not callable(extractor):
-            logger.error(
-                f"[文件管理] 针对 Office 类型 '{office_type.name}' 的文本提取器不可调用。"
-            )
-            return None
+        return self._extract_text_cached(file_path, entry[1])
 
-        return extractor(file_path)
+    def _extract_text_cached(
+        self,
+        file_path: Path,
+        extractor: Callable[[Path], str | None],
+        *,
+        offload: bool = True,
+    ) -> str | None:
+        """按 (路径, 大小, 修改时间) 复用提取结果；offload 为 False 时在当前线程提取"""
+        run = self._run_extractor if offload else _call_extractor
+        try:
+            stat_result = file_path.stat()
+        except OSError:
+            return run(extractor, file_path)
+        key = str(file_path)
+        signature = (stat_result.st_size, stat_result.st_mtime_ns)
+        with self._extracted_text_lock:
+            cached = self._extracted_text_cache.get(key)
+            if cached is not None and cached[:2] == signature:
+                self._extracted_text_cache.move_to_end(key)
+                return cached[2]
+
+        text = run(extractor, file_path)
+        if text is None:
+            return None
+        with self._extracted_text_lock:
+            self._extracted_text_cache[key] = (*signature, text)
+            self._extracted_text_cache.move_to_end(key)
+            while len(self._extracted_text_cache) > EXTRACTED_TEXT_CACHE_MAX_ENTRIES:
+                self._extracted_text_cache.popitem(last=False)
+        return text
 
     def extract_word_content(
         self,
@@ -178,12 +289,30 @@ class WorkspaceService:
         if file_path.suffix.lower() != ".doc" and not self._office_libs.get("docx"):
             logger.debug("[文件管理] Word 解析库未加载，无法提取结构化内容。")
             return None
-        return extract_word_content(
+        return self._run_extractor(
+            extract_word_content,
             file_path,
             self.plugin_data_path,
             include_images=include_images,
         )
 
+    def _run_extractor(self, extractor: Callable, file_path: Path, *args, **kwargs):
+        """在进程池中执行提取函数；调用方已位于工作线程，直接等待结果"""
+        if (
+            self._extract_executor is None
+            or file_path.suffix.lower() in _THREAD_ONLY_EXTRACT_SUFFIXES
+        ):
+            return extractor(file_path, *args, **kwargs)
+        try:
+            return self._extract_executor.submit(
+                extractor, file_path, *args, **kwargs
+            ).result()
+        except Exception as exc:
+            # 工作进程崩溃、进程池已关闭、参数无法序列化或 spawn 下无法重新导入插件包；
+            # 提取函数本身出错时在线程中重试也会再次抛出，不会被吞掉
+            logger.warning(f"[文件管理] 提取进程池不可用，改为在线程中提取: {exc}")
+            return extractor(file_path, *args, **kwargs)
+
     def format_word_content(
         self,
         content: ExtractedWordContent | None,
@@ -208,21 +337,32 @@ class WorkspaceService:
         if not _PDFPLUMBER_AVAILABLE:
             logger.warning("[文件管理] pdfplumber 未安装，无法提取 PDF 文本")
             return None
+        return self._extract_text_cached(
+            file_path, self._read_pdf_text, offload=False
+        )
+
+    def _read_pdf_text(self, file_path: Path) -> str | None:
         try:
-            text_parts = []
             with pdfplumber.open(file_path) as pdf:
-                for index, page in enumerate(pdf.pages, 1):
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_parts.append(f"--- 第 {index} 页 ---\n{page_text}")
-            if text_parts:
-                return "\n\n".join(text_parts)
+                text = extract_pdf_pages_text(
+                    pdf, max_chars=DEFAULT_MAX_EXTRACTED_TEXT_CHARS
+                )
+            if text:
+                return text
             logger.warning(f"[文件管理] PDF 文件 {file_path.name} 未提取到文本")
             return None
         except Exception as exc:
             logger.error(f"[文件管理] 提取 PDF 文本失败: {exc}")
             return None
 
+    @staticmethod
+    def missing_file_error(display_name: str) -> str:
+        return (
+            f"错误：文件 '{display_name}' 不存在。"
+            " 这里只能读取工作区内文件，或在开启外部路径后读取绝对路径。"
+            " 不要联网搜索；请让用户重新上传文件或提供正确的本地路径。"
+        )
+
     def pre_check(
         self,
         event: AstrMessageEvent,
@@ -234,6 +374,7 @@ class WorkspaceService:
         allowed_suffixes: frozenset | set | None = None,
         required_suffix: str | None = None,
         allow_external_path: bool = False,
+        reject_recently_missing: bool = False,
         is_group_feature_enabled: Callable[[AstrMessageEvent], bool],
         check_permission_fn: Callable[[AstrMessageEvent], bool],
         group_feature_disabled_error: Callable[[], str],
@@ -257,14 +398,11 @@ class WorkspaceService:
         if not valid:
             return False, None, f"错误：{error}"
 
+        if reject_recently_missing and self.is_recently_missing(file_path):
+            return False, None, self.missing_file_error(display_name)
+
         if require_exists and not file_path.exists():
-            return (
-                False,
-                None,
-                f"错误：文件 '{display_name}' 不存在。"
-                " 这里只能读取工作区内文件，或在开启外部路径后读取绝对路径。"
-                " 不要联网搜索；请让用户重新上传文件或提供正确的本地路径。",
-            )
+            return False, None, self.missing_file_error(display_name)
 
         suffix = file_path.suffix.lower()
         if required_suffix and suffix != required_suffix:
@@ -1,8 +1,12 @@
+import os
 from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
-from astrbot_plugin_office_assistant._executor_mixin import ExecutorOwnerMixin
+from astrbot_plugin_office_assistant._executor_mixin import (
+    ExecutorOwnerMixin,
+    LazyProcessPoolExecutor,
+)
 
 
 class _DummyExecutorOwner(ExecutorOwnerMixin):
@@ -78,3 +82,38 @@ def test_require_executor_raises_before_init():
 
     with pytest.raises(RuntimeError, match="_init_executor"):
         owner._require_executor()
+
+
+def test_init_executor_uses_stdlib_default_worker_count():
+    owner = _DummyExecutorOwner()
+    owner._init_executor(None, label="默认线程池")
+    try:
+        expected_workers = min(32, (os.cpu_count() or 1) + 4)
+        assert owner._require_executor()._max_workers == expected_workers
+    finally:
+        owner._shutdown_executor()
+
+
+def test_lazy_process_pool_starts_workers_on_first_submit():
+    executor = LazyProcessPoolExecutor(max_workers=1)
+    try:
+        assert executor._executor is None
+
+        assert executor.submit(pow, 2, 5).result(timeout=30) == 32
+        assert executor._executor is not None
+    finally:
+        executor.shutdown(wait=True)
+
+    assert executor._executor is None
+    with pytest.raises(RuntimeError, match="shutdown"):
+        executor.submit(pow, 2, 5)
+
+
+def test_lazy_process_pool_shutdown_without_submit_never_creates_pool():
+    executor = LazyProcessPoolExecutor(max_workers=1)
+
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    assert executor._executor is None
+    with pytest.raises(RuntimeError, match="shutdown"):
+        executor.submit(pow, 2, 5)
@@ -18,6 +18,9 @@ from astrbot_plugin_office_assistant.internal_hooks import (
     ToolExposureContext,
 )
 from astrbot_plugin_office_assistant.main import FileOperationPlugin
+from astrbot_plugin_office_assistant.services.buffered_event_registry import (
+    mark_buffered_event,
+)
 from astrbot_plugin_office_assistant.services.message_buffer import BufferedMessage
 from astrbot_plugin_office_assistant.services.llm_request_policy import (
     LLMRequestPolicy,
@@ -85,7 +88,6 @@ def _build_event(
     event.is_admin.return_value = is_admin
     event.unified_msg_origin = "session-1"
     event.message_str = ""
-    event._buffer_reentry_count = 0
     event.set_extra.side_effect = lambda key, value: extras.__setitem__(key, value)
     event.get_extra.side_effect = lambda key=None, default=None: (
         dict(extras) if key is None else extras.get(key, default)
@@ -214,7 +216,6 @@ async def test_before_llm_chat_keeps_pending_images_after_delay_timeout():
             message_type=MessageType.FRIEND_MESSAGE, sender_id="user-1"
         )
         event._has_pending_images = True
-        event._buffered = False
         req = _build_provider_request(
             "看看这张图",
             tool_names=["existing_tool"],
@@ -244,7 +245,6 @@ async def test_before_llm_chat_timeout_preserves_newer_pending_images():
         old_resource = Path("old.png")
         newer_resource = Path("newer.png")
         event._has_pending_images = True
-        event._buffered = False
         event._pending_image_resources = [old_resource]
         req = _build_provider_request(
             "看看这张图",
@@ -518,7 +518,7 @@ async def test_before_llm_chat_injects_document_guide_for_buffered_word_instruct
             message_type=MessageType.FRIEND_MESSAGE,
             sender_id="user-1",
         )
-        event._buffered = True
+        mark_buffered_event(event)
         req = _build_provider_request(
             (
                 "[System Notice] 用户上传了 1 个文件\n\n"
@@ -838,7 +838,7 @@ async def test_before_llm_chat_uses_buffered_user_instruction_for_explicit_tool_
             message_type=MessageType.FRIEND_MESSAGE,
             sender_id="user-1",
         )
-        event._buffered = True
+        mark_buffered_event(event)
         req = _build_provider_request(
             (
                 "[System Notice] 用户上传了 1 个文件\n\n"
@@ -979,7 +979,7 @@ async def test_before_llm_chat_can_still_restrict_tool_from_buffered_user_instru
             message_type=MessageType.FRIEND_MESSAGE,
             sender_id="user-1",
         )
-        event._buffered = True
+        mark_buffered_event(event)
         req = _build_provider_request(
             (
                 "[System Notice] 用户上传了 1 个文件\n\n"
@@ -1634,7 +1634,7 @@ async def test_before_llm_chat_exposes_file_tools_for_group_doc_command_without_
             sender_id="user-1",
         )
         event.is_mentioned.return_value = False
-        event._buffered = True
+        mark_buffered_event(event)
         event.set_extra(DOC_COMMAND_TRIGGER_EVENT_KEY, True)
         event.message_str = (
             "[System Notice] 用户上传了 1 个文件\n\n"
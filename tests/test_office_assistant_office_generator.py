@@ -347,3 +347,156 @@ def test_build_word_document_model_normalizes_non_string_status_to_draft(
     )
 
     assert document.status.name == "DRAFT"
+
+
+def test_generate_excel_sync_styles_header_row(workspace_root: Path):
+    openpyxl = pytest.importorskip("openpyxl")
+    generator = OfficeGenerator(data_path=workspace_root)
+    file_path = workspace_root / "report.xlsx"
+
+    generator._generate_excel_sync(
+        file_path,
+        {
+            "sheets": [
+                {"name": "Summary", "data": [["Metric", "Value"], ["Users", 42]]},
+                {"name": "Empty", "data": []},
+            ]
+        },
+    )
+
+    workbook = openpyxl.load_workbook(file_path)
+    assert workbook.sheetnames == ["Summary", "Empty"]
+    sheet = workbook["Summary"]
+    assert [[cell.value for cell in row] for row in sheet.iter_rows()] == [
+        ["Metric", "Value"],
+        ["Users", 42],
+    ]
+    assert sheet["A1"].font.b is True
+    assert sheet["A1"].fill.fgColor.rgb.endswith("DDDDDD")
+    assert not sheet["A2"].font.b
+    assert sheet["B2"].alignment.horizontal == "left"
+
+
+def test_parse_ppt_content_splits_on_slide_markers(workspace_root: Path):
+    generator = OfficeGenerator(data_path=workspace_root)
+
+    parsed = generator._parse_ppt_content(
+        "[幻灯片 1]\n开场\n要点一\n\n[Slide2]\nAgenda\n- item\n[slide 3]\n"
+    )
+
+    assert parsed == {
+        "slides": [
+            {"title": "开场", "content": ["要点一"]},
+            {"title": "Agenda", "content": ["- item"]},
+            {"title": "", "content": []},
+        ]
+    }
+
+
+def test_parse_word_content_groups_lines_between_blank_lines(workspace_root: Path):
+    generator = OfficeGenerator(data_path=workspace_root)
+
+    parsed = generator._parse_word_content(
+        "  周报  \n\n第一行\n  第二行  \n   \n\n第三段\r\n"
+    )
+
+    assert parsed == {"title": "周报", "paragraphs": ["第一行 第二行", "第三段"]}
+
+
+def test_parse_ppt_content_falls_back_to_blank_line_slides(workspace_root: Path):
+    generator = OfficeGenerator(data_path=workspace_root)
+
+    parsed = generator._parse_ppt_content("标题一\n要点A\n要点B\n\n\n标题二")
+
+    assert parsed == {
+        "slides": [
+            {"title": "标题一", "content": ["要点A", "要点B"]},
+            {"title": "标题二", "content": []},
+        ]
+    }
+
+
+def test_generate_ppt_sync_writes_title_and_bullets(workspace_root: Path):
+    pptx = pytest.importorskip("pptx")
+    generator = OfficeGenerator(data_path=workspace_root)
+    file_path = workspace_root / "deck.pptx"
+
+    generator._generate_ppt_sync(
+        file_path,
+        {"slides": [{"title": "Overview", "content": ["First", "Second"]}]},
+    )
+
+    presentation = pptx.Presentation(str(file_path))
+    slide = presentation.slides[0]
+    assert slide.shapes.title.text == "Overview"
+    assert [p.text for p in slide.shapes[1].text_frame.paragraphs][-2:] == [
+        "First",
+        "Second",
+    ]
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("季度报告 2024.docx", "季度报告 2024.docx"),
+        ("../secret/..report?.xlsx", "secret.report.xlsx"),
+        ("a*b<c>d|e.pptx", "abcde.pptx"),
+    ],
+)
+def test_sanitize_filename_drops_disallowed_characters(
+    workspace_root: Path, raw: str, expected: str
+):
+    generator = OfficeGenerator(data_path=workspace_root)
+
+    assert generator._sanitize_filename(raw) == expected
+
+
+def test_parse_excel_content_splits_pipe_rows(workspace_root: Path):
+    generator = OfficeGenerator(data_path=workspace_root)
+
+    parsed = generator._parse_excel_content(" 名称 | 数量 |\n苹果|3\n\n  备注  \n")
+
+    assert parsed == {
+        "sheets": [
+            {"name": "Sheet1", "data": [["名称", "数量", ""], ["苹果", "3"], ["备注"]]}
+        ]
+    }
+
+
+@pytest.mark.asyncio
+async def test_generate_parses_plain_text_payload_without_json(
+    workspace_root: Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    generator = OfficeGenerator(data_path=workspace_root)
+    generator.support = {OfficeType.EXCEL: True}
+    generator._generate_excel = AsyncMock()
+    json_loads = MagicMock()
+    monkeypatch.setattr(
+        "astrbot_plugin_office_assistant.services.office_generator.json.loads",
+        json_loads,
+    )
+
+    output_path = await generator.generate(
+        MagicMock(),
+        OfficeType.EXCEL,
+        "inventory",
+        {"content": "名称|数量\n苹果|3"},
+    )
+
+    json_loads.assert_not_called()
+    generator._generate_excel.assert_awaited_once_with(
+        workspace_root / "inventory.xlsx",
+        {"sheets": [{"name": "Sheet1", "data": [["名称", "数量"], ["苹果", "3"]]}]},
+    )
+    assert output_path == workspace_root / "inventory.xlsx"
+
+
+def test_office_support_probe_is_shared_across_instances(workspace_root: Path):
+    first = OfficeGenerator(data_path=workspace_root)
+    second = OfficeGenerator(data_path=workspace_root)
+
+    first.support[OfficeType.EXCEL] = not first.support[OfficeType.EXCEL]
+
+    assert second.support[OfficeType.EXCEL] is not first.support[OfficeType.EXCEL]
+    assert OfficeGenerator(data_path=workspace_root).support == second.support
@@ -1,3 +1,4 @@
+import asyncio
 import base64
 import contextlib
 import json
@@ -6,12 +7,13 @@ import os
 import shutil
 import traceback
 import zipfile
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
+import astrbot_plugin_office_assistant.services.workspace_service as workspace_service_module
 import astrbot_plugin_office_assistant.utils as office_utils
 import mcp
 import pytest
@@ -30,8 +32,14 @@ from astrbot_plugin_office_assistant.domain.document.session_store import (
     get_document_style_defaults,
 )
 from astrbot_plugin_office_assistant.services.office_generator import OfficeGenerator
+from astrbot_plugin_office_assistant.services.preview_generator import PreviewGenerator
 from astrbot_plugin_office_assistant.internal_hooks import NoticeBuildContext
 from astrbot_plugin_office_assistant.services.message_buffer import MessageBuffer
+from astrbot_plugin_office_assistant.services.buffered_event_registry import (
+    get_buffer_reentry_count,
+    is_buffered_event,
+    mark_buffered_event,
+)
 from astrbot_plugin_office_assistant.services.message_buffer import BufferedMessage
 from astrbot_plugin_office_assistant.services import (
     AccessPolicyService,
@@ -63,6 +71,8 @@ from astrbot_plugin_office_assistant.services.excel_intent_router import (
 from astrbot_plugin_office_assistant.services.image_asset_service import (
     ImageAssetService,
 )
+from astrbot_plugin_office_assistant.services.image_file_utils import filename_suffix
+from astrbot_plugin_office_assistant.services.tool_set_utils import remove_tools
 from astrbot_plugin_office_assistant.services.prompt_context_service import (
     SECTION_DYNAMIC_DOCUMENT_FOLLOW_UP,
     SECTION_DYNAMIC_WORKBOOK_FOLLOW_UP,
@@ -111,8 +121,6 @@ def _build_event(
     event.unified_msg_origin = "session-1"
     event.message_str = ""
     event.is_admin.return_value = False
-    event._buffer_reentry_count = 0
-    event._buffered = False
     event.set_extra.side_effect = lambda key, value: extras.__setitem__(key, value)
     event.get_extra.side_effect = lambda key=None, default=None: (
         dict(extras) if key is None else extras.get(key, default)
@@ -388,6 +396,38 @@ def _build_command_service(
     )
 
 
+@pytest.mark.parametrize(
+    "filename",
+    ["report.DOCX", "a.b.c", "a.", ".bashrc", "..", "dir.d/file", "x/y.TXT", ""],
+)
+def test_filename_suffix_matches_path_suffix(filename):
+    assert filename_suffix(filename) == Path(filename).suffix.lower()
+
+
+@pytest.mark.parametrize(
+    ("size", "expected"),
+    [
+        (0, "0 B"),
+        (512, "512.00 B"),
+        (1024, "1.00 KB"),
+        (1536, "1.50 KB"),
+        (5 * 1024 * 1024, "5.00 MB"),
+        (3 * 1024**3, "3.00 GB"),
+        (2048 * 1024**4, "2048.00 TB"),
+    ],
+)
+def test_format_file_size_picks_unit(size, expected):
+    assert office_utils.format_file_size(size) == expected
+
+
+def test_remove_tools_filters_tool_set_once():
+    tool_set = ToolSet([_tool("read_file"), _tool("keep_me"), _tool("export_workbook")])
+
+    remove_tools(tool_set, frozenset({"read_file", "export_workbook", "absent"}))
+
+    assert tool_set.names() == ["keep_me"]
+
+
 def test_get_session_config_prefers_positional_before_umo_keyword():
     calls: list[tuple[str, str | None]] = []
 
@@ -1149,6 +1189,7 @@ def test_build_plugin_runtime_returns_temp_workspace_and_services():
         assert runtime.settings.auto_delete is True
         assert runtime.plugin_data_path.exists()
         assert runtime.temp_dir is not None
+        assert runtime.preview_gen.cache_dir is None
         assert runtime.settings.enable_docx_image_review is False
         assert runtime.settings.max_inline_docx_image_bytes == 3 * 1024 * 1024
         assert runtime.settings.max_inline_docx_image_count == 4
@@ -1517,6 +1558,7 @@ def test_build_plugin_runtime_uses_persistent_workspace_when_auto_delete_disable
         "preview_settings": {
             "enable": True,
             "dpi": 180,
+            "grayscale": True,
         },
         "permission_settings": {
             "allow_all_users": True,
@@ -1564,6 +1606,8 @@ def test_build_plugin_runtime_uses_persistent_workspace_when_auto_delete_disable
         assert runtime.settings.allow_local_excel_script is True
         assert runtime.settings.enable_preview is True
         assert runtime.settings.preview_dpi == 180
+        assert runtime.preview_gen.grayscale is True
+        assert runtime.preview_gen.cache_dir == data_root / "preview_cache"
         assert runtime.settings.allow_external_input_files is True
         assert runtime.settings.recent_text_ttl_seconds == 45
         assert runtime.settings.upload_session_ttl_seconds == 900
@@ -1750,6 +1794,70 @@ async def test_post_export_hook_service_returns_missing_message_without_sending(
     event.send.assert_not_awaited()
 
 
+def test_preview_generator_writes_rendered_bytes_to_default_path():
+    workspace_dir = _make_workspace("preview-bytes")
+    pdf_path = workspace_dir / "report.pdf"
+    pdf_path.write_bytes(b"%PDF")
+    generator = PreviewGenerator(dpi=96)
+
+    try:
+        with patch.object(
+            generator, "_render_pdf_first_page", return_value=b"png-bytes"
+        ) as render:
+            assert generator.generate_preview_bytes(pdf_path) == b"png-bytes"
+            preview_path = generator.generate_preview(pdf_path)
+
+        assert preview_path == workspace_dir / "report_preview.png"
+        assert preview_path.read_bytes() == b"png-bytes"
+        assert render.call_count == 2
+    finally:
+        shutil.rmtree(workspace_dir, ignore_errors=True)
+
+
+def test_preview_generator_encodes_jpeg_for_jpg_output_path():
+    workspace_dir = _make_workspace("preview-jpeg")
+    pdf_path = workspace_dir / "report.pdf"
+    pdf_path.write_bytes(b"%PDF")
+    output_path = workspace_dir / "thumb.JPG"
+    generator = PreviewGenerator(grayscale=True)
+
+    try:
+        with patch.object(
+            generator, "_render_pdf_first_page", return_value=b"jpeg-bytes"
+        ) as render:
+            assert generator.generate_preview(pdf_path, output_path) == output_path
+
+        render.assert_called_once_with(pdf_path, "jpeg")
+        assert generator.dpi == 100
+        assert output_path.read_bytes() == b"jpeg-bytes"
+    finally:
+        shutil.rmtree(workspace_dir, ignore_errors=True)
+
+
+def test_preview_generator_reuses_cached_preview_until_source_changes():
+    workspace_dir = _make_workspace("preview-cache")
+    pdf_path = workspace_dir / "report.pdf"
+    pdf_path.write_bytes(b"%PDF")
+    generator = PreviewGenerator(cache_dir=workspace_dir / ".preview_cache")
+
+    try:
+        with patch.object(
+            generator, "_render_pdf_first_page", return_value=b"first"
+        ) as render:
+            first = generator.generate_preview(pdf_path)
+            first.unlink()
+            second = generator.generate_preview(pdf_path)
+            assert render.call_count == 1
+            assert second.read_bytes() == b"first"
+
+            pdf_path.write_bytes(b"%PDF-changed")
+            render.return_value = b"second"
+            assert generator.generate_preview(pdf_path).read_bytes() == b"second"
+            assert render.call_count == 2
+    finally:
+        shutil.rmtree(workspace_dir, ignore_errors=True)
+
+
 @pytest.mark.asyncio
 async def test_post_export_hook_service_sends_preview_reply_and_deletes_files():
     workspace_dir = _make_workspace("post-export-preview")
@@ -2404,7 +2512,7 @@ async def test_request_hook_service_skips_scene_notice_for_file_only_buffered_pr
         tool_names=["read_file"],
     )
     event = _build_event()
-    event._buffered = True
+    mark_buffered_event(event)
     event.message_obj.message = [
         Comp.File(name=f"file-{idx}.txt", file=f"file-{idx}.txt") for idx in range(2)
     ]
@@ -2438,7 +2546,7 @@ async def test_request_hook_service_skips_additional_notice_for_buffered_prompt_
         tool_names=["read_file"],
     )
     event = _build_event()
-    event._buffered = True
+    mark_buffered_event(event)
     event.message_obj.message = [Comp.File(name="report.docx", file="report.docx")]
     service = _build_request_hook_service(
         get_cached_upload_infos=lambda _event: [
@@ -4880,6 +4988,250 @@ def test_workspace_service_pre_check_rejects_outside_workspace():
         executor.shutdown(wait=False)
 
 
+def test_workspace_service_validate_path_checks_symlinked_plain_names(tmp_path):
+    with _managed_workspace_service(name="validate-symlink") as managed:
+        service = managed.workspace_service
+        outside_file = tmp_path / "secret.txt"
+        outside_file.write_text("secret", encoding="utf-8")
+        link_path = managed.workspace_dir / "link.txt"
+        try:
+            link_path.symlink_to(outside_file)
+        except (OSError, NotImplementedError):
+            pytest.skip("symlinks are not supported here")
+
+        ok, resolved, _ = service.validate_path("report.docx")
+        assert ok
+        assert resolved == managed.workspace_dir.resolve() / "report.docx"
+
+        ok, _, err = service.validate_path("link.txt")
+        assert not ok
+        assert err == "非法路径：禁止访问工作区外的文件"
+
+
+def test_workspace_service_reuses_extracted_text_until_file_changes():
+    with _managed_workspace_service(
+        name="extract-cache", office_libs={"openpyxl": True}
+    ) as managed:
+        service = managed.workspace_service
+        workbook_path = managed.workspace_dir / "report.xlsx"
+        workbook_path.write_bytes(b"v1")
+
+        extractor = MagicMock(side_effect=["first", "second"])
+        with patch.dict(
+            workspace_service_module._OFFICE_TEXT_EXTRACTORS,
+            {OfficeType.EXCEL: ("openpyxl", extractor)},
+        ):
+            assert service.extract_office_text(workbook_path, OfficeType.EXCEL) == "first"
+            assert service.extract_office_text(workbook_path, OfficeType.EXCEL) == "first"
+            assert extractor.call_count == 1
+
+            workbook_path.write_bytes(b"version-2")
+            assert (
+                service.extract_office_text(workbook_path, OfficeType.EXCEL) == "second"
+            )
+            assert extractor.call_count == 2
+
+
+def test_workspace_service_reuses_extracted_pdf_text_until_file_changes():
+    pdf = MagicMock()
+    pdf.__enter__.return_value = SimpleNamespace(
+        pages=[SimpleNamespace(extract_text=lambda: "page")]
+    )
+    fake_pdfplumber = SimpleNamespace(open=MagicMock(return_value=pdf))
+
+    with (
+        _managed_workspace_service(name="extract-pdf-cache") as managed,
+        patch.object(workspace_service_module, "pdfplumber", fake_pdfplumber),
+        patch.object(workspace_service_module, "_PDFPLUMBER_AVAILABLE", True),
+    ):
+        service = managed.workspace_service
+        pdf_path = managed.workspace_dir / "report.pdf"
+        pdf_path.write_bytes(b"v1")
+
+        assert service.extract_pdf_text(pdf_path) == "--- 第 1 页 ---\npage"
+        assert service.extract_pdf_text(pdf_path) == "--- 第 1 页 ---\npage"
+        assert fake_pdfplumber.open.call_count == 1
+
+        pdf_path.write_bytes(b"version-2")
+        service.extract_pdf_text(pdf_path)
+        assert fake_pdfplumber.open.call_count == 2
+
+
+def test_workspace_service_pre_check_rejects_recently_missing_file():
+    with _managed_workspace_service(name="missing-cache") as managed:
+        service = managed.workspace_service
+        target = managed.workspace_dir / "ghost.txt"
+        service.remember_missing_file(target.resolve())
+
+        def _pre_check():
+            return service.pre_check(
+                _build_event(),
+                "ghost.txt",
+                reject_recently_missing=True,
+                is_group_feature_enabled=lambda _event: True,
+                check_permission_fn=lambda _event: True,
+                group_feature_disabled_error=lambda: "group disabled",
+            )
+
+        ok, resolved_path, err = _pre_check()
+        assert not ok
+        assert resolved_path is None
+        assert "错误：文件 'ghost.txt' 不存在。" in err
+
+        source = managed.workspace_dir / "upload.tmp"
+        source.write_text("hello", encoding="utf-8")
+        service.store_uploaded_file(source, "ghost.txt")
+
+        ok, resolved_path, err = _pre_check()
+        assert ok
+        assert resolved_path == target.resolve()
+        assert err is None
+
+
+def test_workspace_service_read_text_file_sync_truncates_by_bytes(workspace_root):
+    text_file = workspace_root / "notes.txt"
+    text_file.write_bytes("第一行\r\nsecond line\rthird\r\n".encode())
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        service = WorkspaceService(
+            plugin_data_path=workspace_root,
+            executor=executor,
+            office_libs={},
+            max_file_size=1024,
+            feature_settings={},
+        )
+        full = service.read_text_file_sync(text_file, 1024, 4)
+        truncated = service.read_text_file_sync(text_file, 9, 4)
+    finally:
+        executor.shutdown(wait=False)
+
+    assert full == "第一行\nsecond line\nthird\n"
+    assert truncated.startswith("第一行\n\n[警告: 文件内容已截断")
+
+
+def test_workspace_service_extract_pdf_text_skips_empty_pages():
+    import astrbot_plugin_office_assistant.services.workspace_service as ws_module
+
+    pages = [
+        SimpleNamespace(extract_text=lambda: "first"),
+        SimpleNamespace(extract_text=lambda: ""),
+        SimpleNamespace(extract_text=lambda: "third"),
+    ]
+    pdf = MagicMock()
+    pdf.__enter__.return_value = SimpleNamespace(pages=pages)
+    fake_pdfplumber = SimpleNamespace(open=MagicMock(return_value=pdf))
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        service = WorkspaceService(
+            plugin_data_path=Path(__file__).resolve().parent / "workspace-root",
+            executor=executor,
+            office_libs={},
+            max_file_size=1024,
+            feature_settings={},
+        )
+        with (
+            patch.object(ws_module, "pdfplumber", fake_pdfplumber),
+            patch.object(ws_module, "_PDFPLUMBER_AVAILABLE", True),
+        ):
+            text = service.extract_pdf_text(Path("report.pdf"))
+    finally:
+        executor.shutdown(wait=False)
+
+    assert text == "--- 第 1 页 ---\nfirst\n\n--- 第 3 页 ---\nthird"
+
+
+def test_workspace_service_runs_extractors_on_extract_executor_except_legacy():
+    executor = ThreadPoolExecutor(max_workers=1)
+    extract_executor = MagicMock(wraps=ThreadPoolExecutor(max_workers=1))
+    extractor = MagicMock(return_value="text")
+    try:
+        service = WorkspaceService(
+            plugin_data_path=Path(__file__).resolve().parent / "workspace-root",
+            executor=executor,
+            office_libs={},
+            max_file_size=1024,
+            extract_executor=extract_executor,
+        )
+        assert service._run_extractor(extractor, Path("book.xlsx")) == "text"
+        assert service._run_extractor(extractor, Path("legacy.XLS")) == "text"
+    finally:
+        executor.shutdown(wait=False)
+        extract_executor.shutdown(wait=False)
+
+    extract_executor.submit.assert_called_once_with(extractor, Path("book.xlsx"))
+    assert extractor.call_count == 2
+
+
+def test_workspace_service_extracts_inline_when_extract_pool_cannot_run_task():
+    import pickle
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    extract_executor = MagicMock()
+    extract_executor.submit.return_value.result.side_effect = pickle.PicklingError(
+        "cannot pickle"
+    )
+    extractor = MagicMock(return_value="text")
+    try:
+        service = WorkspaceService(
+            plugin_data_path=Path(__file__).resolve().parent / "workspace-root",
+            executor=executor,
+            office_libs={},
+            max_file_size=1024,
+            extract_executor=extract_executor,
+        )
+        assert service._run_extractor(extractor, Path("book.xlsx")) == "text"
+    finally:
+        executor.shutdown(wait=False)
+
+    extract_executor.submit.assert_called_once_with(extractor, Path("book.xlsx"))
+    extractor.assert_called_once_with(Path("book.xlsx"))
+
+
+def test_workspace_service_extracts_inline_after_extract_pool_shutdown():
+    executor = ThreadPoolExecutor(max_workers=1)
+    extract_executor = ProcessPoolExecutor(max_workers=1)
+    extract_executor.shutdown(wait=False)
+    extractor = MagicMock(return_value="text")
+    try:
+        service = WorkspaceService(
+            plugin_data_path=Path(__file__).resolve().parent / "workspace-root",
+            executor=executor,
+            office_libs={},
+            max_file_size=1024,
+            extract_executor=extract_executor,
+        )
+        assert service._run_extractor(extractor, Path("deck.pptx")) == "text"
+    finally:
+        executor.shutdown(wait=False)
+
+    extractor.assert_called_once_with(Path("deck.pptx"))
+
+
+def test_write_table_rows_xlsxwriter_keeps_text_cells_verbatim(tmp_path):
+    xlsxwriter = pytest.importorskip("xlsxwriter")
+    openpyxl = pytest.importorskip("openpyxl")
+    import astrbot_plugin_office_assistant.services.pdf_converter as pdf_module
+
+    output_path = tmp_path / "tables.xlsx"
+    rows = [["名称", "值", None], ["a", "=1+1", "http://example.com"]]
+    with patch.object(pdf_module, "xlsxwriter", xlsxwriter, create=True):
+        pdf_module._write_table_rows_xlsxwriter(
+            output_path, [("页1_表1", rows), ("页2_表2", [["提示"], ["无"]])]
+        )
+
+    workbook = openpyxl.load_workbook(output_path)
+    assert workbook.sheetnames == ["页1_表1", "页2_表2"]
+    sheet = workbook["页1_表1"]
+    assert list(sheet.values) == [
+        ("名称", "值", None),
+        ("a", "=1+1", "http://example.com"),
+    ]
+    assert sheet["A1"].font.b is True
+    assert sheet["B2"].data_type == "s"
+
+
 def test_upload_session_service_preserves_input_upload_infos_when_caching():
     service = UploadSessionService(
         context=MagicMock(),
@@ -4969,6 +5321,9 @@ async def test_upload_session_service_requeues_file_only_buffered_upload_in_frie
     assert upload_infos[0]["file_id"] == "f1"
     assert "[用户指令]" not in prompt_text
     assert "用户意图尚不明确时，再用中文询问用户想要如何处理" in prompt_text
+    assert is_buffered_event(queued_event)
+    assert get_buffer_reentry_count(queued_event) == 1
+    assert not is_buffered_event(event)
 
 
 @pytest.mark.asyncio
@@ -5665,6 +6020,95 @@ async def test_delivery_service_sends_message_and_file_for_existing_path():
     assert event.send.await_count == 2
 
 
+@pytest.mark.asyncio
+async def test_delivery_service_renders_preview_on_render_executor():
+    import astrbot_plugin_office_assistant.services.preview_generator as preview_module
+
+    event = _build_event()
+    event.send = AsyncMock()
+    render_executor = ThreadPoolExecutor(max_workers=1)
+    service = DeliveryService(
+        executor=ThreadPoolExecutor(max_workers=1),
+        preview_generator=SimpleNamespace(dpi=96, cache_dir=None, grayscale=True),
+        render_executor=render_executor,
+        enable_preview=True,
+        auto_delete=False,
+        reply_to_user=False,
+    )
+    file_path = Path(__file__).resolve()
+    render_preview = MagicMock(return_value=None)
+    try:
+        with patch.object(preview_module, "render_preview", render_preview):
+            await service.send_file_with_preview(event, file_path, "✅ 已发送")
+    finally:
+        service._executor.shutdown(wait=False)
+        render_executor.shutdown(wait=False)
+
+    render_preview.assert_called_once_with(str(file_path), 96, None, True)
+    assert event.send.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_delivery_service_falls_back_to_thread_when_render_pool_is_broken():
+    from concurrent.futures.process import BrokenProcessPool
+
+    event = _build_event()
+    event.send = AsyncMock()
+    render_executor = MagicMock()
+    render_executor.submit.side_effect = BrokenProcessPool("worker died")
+    preview_generator = MagicMock(dpi=96, cache_dir=None)
+    preview_generator.generate_preview.return_value = None
+    service = DeliveryService(
+        executor=ThreadPoolExecutor(max_workers=1),
+        preview_generator=preview_generator,
+        render_executor=render_executor,
+        enable_preview=True,
+        auto_delete=False,
+        reply_to_user=False,
+    )
+    file_path = Path(__file__).resolve()
+    try:
+        await service.send_file_with_preview(event, file_path, "✅ 已发送")
+        await service.send_file_with_preview(event, file_path, "✅ 已发送")
+    finally:
+        service._executor.shutdown(wait=False)
+
+    assert render_executor.submit.call_count == 2
+    assert preview_generator.generate_preview.call_count == 2
+    preview_generator.generate_preview.assert_called_with(file_path, None)
+    assert event.send.await_count == 4
+
+
+@pytest.mark.asyncio
+async def test_delivery_service_falls_back_to_thread_when_render_pool_is_shut_down():
+    from astrbot_plugin_office_assistant._executor_mixin import (
+        LazyProcessPoolExecutor,
+    )
+
+    event = _build_event()
+    event.send = AsyncMock()
+    render_executor = LazyProcessPoolExecutor(max_workers=1)
+    render_executor.shutdown(wait=False)
+    preview_generator = MagicMock(dpi=96, cache_dir=None)
+    preview_generator.generate_preview.return_value = None
+    service = DeliveryService(
+        executor=ThreadPoolExecutor(max_workers=1),
+        preview_generator=preview_generator,
+        render_executor=render_executor,
+        enable_preview=True,
+        auto_delete=False,
+        reply_to_user=False,
+    )
+    file_path = Path(__file__).resolve()
+    try:
+        await service.send_file_with_preview(event, file_path, "✅ 已发送")
+    finally:
+        service._executor.shutdown(wait=False)
+
+    preview_generator.generate_preview.assert_called_once_with(file_path, None)
+    assert event.send.await_count == 2
+
+
 @pytest.mark.asyncio
 async def test_delivery_service_returns_missing_message_for_absent_export():
     event = _build_event()
@@ -5748,6 +6192,40 @@ async def test_generated_file_delivery_service_rejects_oversized_output():
     delivery_service.send_file_with_preview.assert_not_called()
 
 
+@pytest.mark.asyncio
+async def test_generated_file_delivery_service_clears_missing_file_record():
+    workspace_dir = _make_workspace("generated-file-delivery-miss-cache")
+    event = _build_event()
+    delivery_service = MagicMock()
+    delivery_service.send_file_with_preview = AsyncMock()
+    executor = ThreadPoolExecutor(max_workers=1)
+
+    try:
+        workspace_service = WorkspaceService(
+            plugin_data_path=workspace_dir,
+            executor=executor,
+            office_libs={},
+            max_file_size=64,
+            feature_settings={},
+        )
+        service = GeneratedFileDeliveryService(
+            workspace_service=workspace_service,
+            delivery_service=delivery_service,
+        )
+        _, output_path, _ = workspace_service.validate_path("report.pdf")
+        workspace_service.remember_missing_file(output_path)
+        output_path.write_bytes(b"small-pdf")
+
+        result = await service.deliver_generated_file(event, output_path)
+        recently_missing = workspace_service.is_recently_missing(output_path)
+    finally:
+        executor.shutdown(wait=False)
+        shutil.rmtree(workspace_dir, ignore_errors=True)
+
+    assert result.status == "sent"
+    assert recently_missing is False
+
+
 @pytest.mark.asyncio
 async def test_generated_file_delivery_service_sends_existing_output_with_expected_args():
     workspace_dir = _make_workspace("generated-file-delivery-sent")
@@ -6750,8 +7228,8 @@ async def test_message_buffer_restarts_timer_when_wait_override_changes():
 
     assert await buffer.add_message(event, wait_seconds=30)
     key = buffer._get_buffer_key(event)
-    first_task = buffer._buffers[key].timer_task
-    assert first_task is not None
+    first_handle = buffer._buffers[key].timer_handle
+    assert first_handle is not None
 
     follow_up = _build_event()
     follow_up.message_obj.message = [Comp.Plain("补充说明")]
@@ -6759,8 +7237,8 @@ async def test_message_buffer_restarts_timer_when_wait_override_changes():
 
     updated = buffer._buffers[key]
     assert updated.wait_seconds == 5
-    assert updated.timer_task is not first_task
-    assert first_task.done()
+    assert updated.timer_handle is not first_handle
+    assert first_handle.cancelled()
 
     await buffer.cancel_buffer(event)
 
@@ -6822,6 +7300,80 @@ async def test_message_buffer_pop_images_removes_image_only_buffer():
     assert key not in buffer._buffers
 
 
+@pytest.mark.asyncio
+async def test_message_buffer_dispatches_concurrent_completions_together():
+    buffer = MessageBuffer(wait_seconds=0.01)
+    completed: list[object] = []
+
+    async def on_complete(buf):
+        completed.append(buf.event)
+
+    buffer.set_complete_callback(on_complete)
+    first = _build_event(sender_id="user-1")
+    first.message_obj.message = [Comp.File(name="a.docx", file="a.docx")]
+    second = _build_event(sender_id="user-2")
+    second.message_obj.message = [Comp.File(name="b.docx", file="b.docx")]
+
+    assert await buffer.add_message(first)
+    assert await buffer.add_message(second)
+    await asyncio.sleep(0.1)
+
+    assert completed == [first, second]
+    assert buffer._completion_batch == []
+
+
+@pytest.mark.asyncio
+async def test_message_buffer_batched_callbacks_do_not_wait_for_each_other():
+    buffer = MessageBuffer(wait_seconds=0.01)
+    release_first = asyncio.Event()
+    completed: list[object] = []
+
+    first = _build_event(sender_id="user-1")
+    first.message_obj.message = [Comp.File(name="a.docx", file="a.docx")]
+    second = _build_event(sender_id="user-2")
+    second.message_obj.message = [Comp.File(name="b.docx", file="b.docx")]
+
+    async def on_complete(buf):
+        if buf.event is first:
+            await release_first.wait()
+        completed.append(buf.event)
+
+    buffer.set_complete_callback(on_complete)
+    assert await buffer.add_message(first)
+    assert await buffer.add_message(second)
+    await asyncio.sleep(0.1)
+
+    assert completed == [second]
+    release_first.set()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert completed == [second, first]
+
+
+@pytest.mark.asyncio
+async def test_message_buffer_completes_oldest_buffer_when_full():
+    buffer = MessageBuffer(wait_seconds=30, max_buffers=1)
+    completed: list[object] = []
+
+    async def on_complete(buf):
+        completed.append(buf.event)
+
+    buffer.set_complete_callback(on_complete)
+    first = _build_event(sender_id="user-1")
+    first.message_obj.message = [Comp.File(name="a.docx", file="a.docx")]
+    second = _build_event(sender_id="user-2")
+    second.message_obj.message = [Comp.File(name="b.docx", file="b.docx")]
+
+    assert await buffer.add_message(first)
+    assert await buffer.add_message(second)
+    await asyncio.sleep(0.05)
+
+    assert completed == [first]
+    assert list(buffer._buffers) == [buffer._get_buffer_key(second)]
+
+    await buffer.cancel_buffer(second)
+
+
 @pytest.mark.asyncio
 async def test_error_hook_service_uses_event_session_when_target_not_configured():
     context = MagicMock()
@@ -6980,6 +7532,71 @@ def test_extract_word_content_returns_structured_result_for_legacy_doc(
     )
 
 
+def test_extract_word_content_falls_back_to_libreoffice_for_legacy_doc(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+):
+    doc_path = tmp_path / "legacy.doc"
+    doc_path.write_bytes(b"legacy")
+    convert_calls = []
+
+    def fake_convert(file_path, convert_to, output_suffix, output_dir):
+        convert_calls.append((file_path, convert_to))
+        output_path = output_dir / f"{file_path.stem}{output_suffix}"
+        output_path.write_text("\ufeffLibreOffice text\n", encoding="utf-8")
+        return output_path
+
+    monkeypatch.setattr(office_utils, "_ANTIWORD_AVAILABLE", True)
+    monkeypatch.setattr(office_utils, "_WIN32COM_AVAILABLE", False)
+    monkeypatch.setattr(office_utils, "_extract_doc_text_antiword", lambda _path: None)
+    monkeypatch.setattr(office_utils, "_find_libreoffice", lambda: "soffice")
+    monkeypatch.setattr(office_utils, "_convert_via_libreoffice", fake_convert)
+
+    extracted = office_utils.extract_word_content(doc_path)
+
+    assert extracted == ExtractedWordContent(text="LibreOffice text")
+    assert convert_calls == [(doc_path, "txt:Text (encoded):UTF8")]
+
+
+def test_extract_ppt_text_converts_legacy_ppt_with_libreoffice(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+):
+    pptx = pytest.importorskip("pptx")
+    ppt_path = tmp_path / "legacy.ppt"
+    ppt_path.write_bytes(b"legacy")
+    converted = pptx.Presentation()
+    slide = converted.slides.add_slide(converted.slide_layouts[0])
+    slide.shapes.title.text = "Converted slide"
+
+    def fake_convert(file_path, convert_to, output_suffix, output_dir):
+        assert (convert_to, output_suffix) == ("pptx", ".pptx")
+        output_path = output_dir / f"{file_path.stem}{output_suffix}"
+        converted.save(output_path)
+        return output_path
+
+    monkeypatch.setattr(office_utils, "_WIN32COM_AVAILABLE", False)
+    monkeypatch.setattr(office_utils, "_find_libreoffice", lambda: "soffice")
+    monkeypatch.setattr(office_utils, "_convert_via_libreoffice", fake_convert)
+
+    assert office_utils.extract_ppt_text(ppt_path) == "Converted slide"
+
+
+def test_parse_antiword_docbook_keeps_paragraphs_and_table_rows():
+    docbook = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        "<book><bookinfo><title>属性标题</title></bookinfo>"
+        "<chapter><title>第一章</title>"
+        "<para>Hello <emphasis>world</emphasis></para>"
+        "<informaltable><tgroup cols='2'><tbody>"
+        "<row><entry>A</entry><entry><para>B</para></entry></row>"
+        "</tbody></tgroup></informaltable>"
+        "<para>结束</para></chapter></book>"
+    ).encode("utf-8")
+
+    text = office_utils._parse_antiword_docbook(docbook)
+
+    assert text == "第一章\nHello world\nA\tB\n结束"
+
+
 def test_workspace_service_extract_office_text_reads_legacy_doc(
     monkeypatch: pytest.MonkeyPatch,
 ):
@@ -7448,7 +8065,7 @@ async def test_file_tool_service_returns_error_when_stat_fails():
 
     with patch(
         "astrbot_plugin_office_assistant.services.file_read_service.asyncio.to_thread",
-        side_effect=FileNotFoundError("gone"),
+        side_effect=PermissionError("denied"),
     ):
         results = [
             result
@@ -7460,6 +8077,38 @@ async def test_file_tool_service_returns_error_when_stat_fails():
     assert results == ["错误：无法读取文件信息 (missing.txt)"]
 
 
+@pytest.mark.asyncio
+async def test_file_tool_service_reports_missing_file_from_stat():
+    event = _build_event()
+    workspace_service = MagicMock()
+    workspace_service.pre_check.return_value = (True, Path("missing.txt"), None)
+    workspace_service.display_name.return_value = "missing.txt"
+    workspace_service.missing_file_error.return_value = "missing guidance"
+    service = FileReadService(
+        workspace_service=workspace_service,
+        word_read_service=MagicMock(),
+        allow_external_input_files=False,
+        is_group_feature_enabled=lambda _event: True,
+        check_permission=lambda _event: True,
+        group_feature_disabled_error=lambda: "group disabled",
+    )
+
+    with patch(
+        "astrbot_plugin_office_assistant.services.file_read_service.asyncio.to_thread",
+        side_effect=FileNotFoundError("gone"),
+    ):
+        results = [
+            result
+            async for result in service.iter_read_file_tool_results(
+                event, "missing.txt"
+            )
+        ]
+
+    assert results == ["missing guidance"]
+    workspace_service.missing_file_error.assert_called_once_with("missing.txt")
+    assert workspace_service.pre_check.call_args.kwargs["require_exists"] is False
+
+
 @pytest.mark.asyncio
 async def test_file_tool_service_offloads_office_text_extraction_to_thread():
     event = _build_event()
@@ -7535,8 +8184,6 @@ async def test_file_tool_service_reads_workbook_with_sheet_sections():
 
 
 def test_extract_excel_sheets_closes_openpyxl_workbook(monkeypatch):
-    import openpyxl
-
     worksheet = SimpleNamespace(title="Sheet1")
     workbook = SimpleNamespace(
         worksheets=[worksheet],
@@ -7544,7 +8191,7 @@ def test_extract_excel_sheets_closes_openpyxl_workbook(monkeypatch):
     )
 
     monkeypatch.setattr(
-        openpyxl,
+        office_utils,
         "load_workbook",
         lambda *_args, **_kwargs: workbook,
     )
@@ -7562,6 +8209,56 @@ def test_extract_excel_sheets_closes_openpyxl_workbook(monkeypatch):
     workbook.close.assert_called_once()
 
 
+def test_extract_ppt_text_streams_slides_in_presentation_order(workspace_root):
+    pptx = pytest.importorskip("pptx")
+    from pptx.util import Inches
+
+    deck_path = workspace_root / "deck.pptx"
+    presentation = pptx.Presentation()
+    for index in range(11):
+        slide = presentation.slides.add_slide(presentation.slide_layouts[1])
+        slide.shapes.title.text = f"Slide {index}"
+        body = slide.shapes.placeholders[1].text_frame
+        body.text = "first"
+        body.add_paragraph().text = "second"
+        table = slide.shapes.add_table(1, 1, Inches(1), Inches(1), Inches(2), Inches(1))
+        table.table.cell(0, 0).text = "cell"
+    presentation.save(deck_path)
+
+    expected = "\n".join(
+        shape.text
+        for slide in pptx.Presentation(deck_path).slides
+        for shape in slide.shapes
+        if hasattr(shape, "text") and shape.text.strip()
+    )
+
+    result = office_utils.extract_ppt_text(deck_path)
+
+    assert result == expected
+    assert result.startswith("Slide 0\nfirst\nsecond\nSlide 1\n")
+    assert "cell" not in result
+
+    truncated = office_utils.extract_ppt_text(deck_path, max_chars=10)
+
+    assert truncated == "Slide 0\nfi\n\n[内容已截断，仅显示前 10 个字符]"
+
+
+def test_join_text_parts_limited_stops_consuming_parts():
+    consumed: list[str] = []
+
+    def parts():
+        for part in ("abc", "def", "ghi"):
+            consumed.append(part)
+            yield part
+
+    assert office_utils._join_text_parts_limited(parts(), "\n", 11) == "abc\ndef\nghi"
+    assert (
+        office_utils._join_text_parts_limited(parts(), "\n", 5)
+        == "abc\nd\n\n[内容已截断，仅显示前 5 个字符]"
+    )
+    assert consumed == ["abc", "def", "ghi", "abc", "def"]
+
+
 @pytest.mark.asyncio
 async def test_file_tool_service_read_workbook_escapes_cell_newlines_and_tabs():
     event = _build_event()
@@ -7589,6 +8286,70 @@ async def test_file_tool_service_read_workbook_escapes_cell_newlines_and_tabs():
     assert "Column\tinside\tcell" not in result
 
 
+def test_build_excel_sheet_preview_formats_non_string_and_multiline_cells():
+    preview = office_utils._build_excel_sheet_preview(
+        [
+            ("ID", None, "Note"),
+            (1, 2.5, "a\r\nb\rc"),
+            (True, "plain", "tab\there"),
+        ]
+    )
+
+    assert preview == "ID\t\tNote\n1\t2.5\ta\\nb\\nc\nTrue\tplain\ttab\\there"
+
+
+def test_extract_excel_sheets_calamine_matches_openpyxl(tmp_path):
+    pytest.importorskip("python_calamine")
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook_path = tmp_path / "calamine.xlsx"
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "数据"
+    sheet.append(["ID", "Text", "Ratio"])
+    sheet.append([1, "Line one\nLine two", 2.5])
+    sheet["E5"] = "far"
+    workbook.create_sheet("Second").append([2, "B"])
+    workbook.save(workbook_path)
+
+    calamine_sheets = office_utils.extract_excel_sheets(workbook_path)
+    with patch.object(office_utils, "_CALAMINE_AVAILABLE", False):
+        openpyxl_sheets = office_utils.extract_excel_sheets(workbook_path)
+
+    assert calamine_sheets == openpyxl_sheets
+    assert calamine_sheets[0].text.startswith("ID\tText\tRatio\t\t\n1\t")
+
+
+def test_com_application_reuses_cached_app_on_com_thread(monkeypatch):
+    fake_pythoncom = MagicMock()
+    apps = [MagicMock(), MagicMock()]
+    dispatch = MagicMock(side_effect=apps)
+    monkeypatch.setattr(office_utils, "_WIN32COM_AVAILABLE", True)
+    monkeypatch.setattr(office_utils, "pythoncom", fake_pythoncom, raising=False)
+    monkeypatch.setattr(office_utils, "_dispatch_com_application", dispatch)
+
+    def use_app(fail=False):
+        with office_utils.com_application("Word.Application") as app:
+            if fail:
+                raise RuntimeError("boom")
+            return app
+
+    try:
+        first = office_utils._run_on_com_thread(use_app)
+        second = office_utils._run_on_com_thread(use_app)
+        with pytest.raises(RuntimeError, match="boom"):
+            office_utils._run_on_com_thread(use_app, fail=True)
+        third = office_utils._run_on_com_thread(use_app)
+    finally:
+        office_utils.shutdown_com_applications()
+
+    assert first is second is apps[0]
+    apps[0].Quit.assert_called_once()
+    assert third is apps[1]
+    apps[1].Quit.assert_called_once()
+    fake_pythoncom.CoInitialize.assert_called_once()
+    fake_pythoncom.CoUninitialize.assert_called_once()
+
+
 @pytest.mark.asyncio
 async def test_file_tool_service_read_workbook_truncates_large_sheet_preview():
     event = _build_event()
@@ -10265,6 +11026,48 @@ def test_command_service_lists_office_files_in_workspace():
     assert "report.docx" in result
 
 
+def test_command_service_delete_file_reports_missing_and_deletes_existing(
+    workspace_root,
+):
+    target = workspace_root / "report.docx"
+    target.write_text("demo", encoding="utf-8")
+
+    with _managed_workspace_service(plugin_data_path=workspace_root) as managed:
+        service = _build_command_service(
+            workspace_service=managed.workspace_service,
+            plugin_data_path=workspace_root,
+        )
+        deleted = service.delete_file(_build_event(), "/delete_file report.docx")
+        missing = service.delete_file(_build_event(), "/delete_file report.docx")
+
+    assert deleted == "成功：文件 'report.docx' 已删除。"
+    assert missing == "错误：找不到文件 'report.docx'"
+    assert not target.exists()
+
+
+def test_command_service_lists_office_files_newest_first(workspace_root):
+    older = workspace_root / "older.xlsx"
+    newer = workspace_root / "newer.docx"
+    older.write_text("old", encoding="utf-8")
+    newer.write_text("newer", encoding="utf-8")
+    os.utime(older, (1_000_000, 1_000_000))
+    os.utime(newer, (2_000_000, 2_000_000))
+    (workspace_root / "notes.txt").write_text("skip", encoding="utf-8")
+    (workspace_root / "folder.docx").mkdir()
+
+    with _managed_workspace_service(plugin_data_path=workspace_root) as managed:
+        service = _build_command_service(
+            workspace_service=managed.workspace_service,
+            plugin_data_path=workspace_root,
+        )
+        result = service.list_files(_build_event())
+
+    lines = result.splitlines()
+    assert len(lines) == 3
+    assert lines[1].startswith("- newer.docx (")
+    assert lines[2].startswith("- older.xlsx (")
+
+
 def test_command_service_builds_pdf_status_summary():
     with _managed_workspace_service(
         plugin_data_path=Path(__file__).resolve().parent
@@ -1,31 +1,155 @@
+import atexit
 import hashlib
+import io
+import os
+import posixpath
 import re
 import subprocess
-from collections.abc import Generator
+import tempfile
+import threading
+import xml.etree.ElementTree as ET
+import zipfile
+from collections.abc import Callable, Generator, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager, suppress
 from dataclasses import dataclass, field
+from functools import wraps
 from pathlib import Path
-from typing import Literal
+from typing import Literal, TypeVar
 
 from astrbot.api import logger
 
-from .compat import _ANTIWORD_AVAILABLE, _IS_WINDOWS, _WIN32COM_AVAILABLE
+from .compat import (
+    _ANTIWORD_AVAILABLE,
+    _IS_WINDOWS,
+    _WIN32COM_AVAILABLE,
+    _discover_libreoffice,
+)
 from .constants import (
     DEFAULT_MAX_EXCEL_PREVIEW_CHARS,
     DEFAULT_MAX_EXCEL_PREVIEW_ROWS,
     DEFAULT_MAX_EXCEL_PREVIEW_SHEETS,
+    DEFAULT_MAX_EXTRACTED_TEXT_CHARS,
 )
 
 if _WIN32COM_AVAILABLE:
     import pythoncom
     import win32com.client
 
+# python-calamine（Rust 实现）解析 Excel 比 openpyxl 快一个数量级，可用时优先使用
+_CALAMINE_AVAILABLE = False
+
+try:
+    from python_calamine import CalamineWorkbook
+
+    _CALAMINE_AVAILABLE = True
+except ImportError:
+    pass
+
+# openpyxl / xlrd 在模块加载时绑定一次，提取函数内不再重复执行 import
+_OPENPYXL_AVAILABLE = False
+
+try:
+    from openpyxl import load_workbook
+
+    _OPENPYXL_AVAILABLE = True
+except ImportError:
+    pass
+
+_XLRD_AVAILABLE = False
+
+try:
+    import xlrd
+
+    _XLRD_AVAILABLE = True
+except ImportError:
+    pass
+
+
+_T = TypeVar("_T")
+
+# makepy 早绑定包装类生成失败的应用（例如 gen_py 缓存目录不可写），之后直接晚绑定
+_COM_EARLY_BINDING_UNAVAILABLE: set[str] = set()
+
+
+def _dispatch_com_application(app_name: str):
+    """优先使用 gencache 生成的早绑定包装类，属性访问不再逐次查询类型信息"""
+    if app_name not in _COM_EARLY_BINDING_UNAVAILABLE:
+        try:
+            return win32com.client.gencache.EnsureDispatch(app_name)
+        except Exception as e:
+            _COM_EARLY_BINDING_UNAVAILABLE.add(app_name)
+            logger.debug(f"{app_name} 早绑定不可用，改用晚绑定: {e}")
+    return win32com.client.Dispatch(app_name)
+
+
+# 文本提取用到的 Office 应用常驻在一个专用 COM 线程（单线程单元）中，
+# 跨调用复用，只在插件卸载或进程退出时退出，避免每个文件都冷启动 Office
+_com_thread_lock = threading.Lock()
+_com_thread_executor: ThreadPoolExecutor | None = None
+_com_thread_state = threading.local()
+
+
+def _init_com_extract_thread() -> None:
+    pythoncom.CoInitialize()
+    _com_thread_state.apps = {}
+
+
+def _run_on_com_thread(func: Callable[..., _T], *args, **kwargs) -> _T:
+    """在专用 COM 线程中执行 func 并等待结果；已在该线程中时直接调用"""
+    if not _WIN32COM_AVAILABLE or hasattr(_com_thread_state, "apps"):
+        return func(*args, **kwargs)
+    global _com_thread_executor
+    with _com_thread_lock:
+        if _com_thread_executor is None:
+            _com_thread_executor = ThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix="office_com_extract",
+                initializer=_init_com_extract_thread,
+            )
+            atexit.register(shutdown_com_applications)
+        executor = _com_thread_executor
+    return executor.submit(func, *args, **kwargs).result()
+
+
+def _on_com_thread(func: Callable[..., _T]) -> Callable[..., _T]:
+    @wraps(func)
+    def wrapper(*args, **kwargs) -> _T:
+        return _run_on_com_thread(func, *args, **kwargs)
+
+    return wrapper
+
+
+def _quit_cached_com_applications() -> None:
+    apps = getattr(_com_thread_state, "apps", None) or {}
+    for app in apps.values():
+        with suppress(Exception):
+            app.Quit()
+    apps.clear()
+    with suppress(Exception):
+        pythoncom.CoUninitialize()
+
+
+def shutdown_com_applications() -> None:
+    """退出常驻的 Office 应用并关闭 COM 线程（插件卸载时调用）"""
+    global _com_thread_executor
+    with _com_thread_lock:
+        executor = _com_thread_executor
+        _com_thread_executor = None
+    if executor is None:
+        return
+    with suppress(Exception):
+        executor.submit(_quit_cached_com_applications).result()
+    executor.shutdown(wait=False)
+
 
 @contextmanager
 def com_application(app_name: str) -> Generator:
     """Windows COM 应用上下文管理器
 
-    自动处理 COM 初始化/反初始化和应用退出，避免资源泄漏。
+    在专用 COM 线程中获取常驻的 Office 应用，应用跨调用复用；
+    使用过程中出错时退出并丢弃该应用，下次重新启动。
+    需在 _run_on_com_thread 调度的函数中使用。
 
     Args:
         app_name: COM 应用名称，如 "Word.Application"
@@ -41,31 +165,62 @@ def com_application(app_name: str) -> Generator:
     if not _WIN32COM_AVAILABLE:
         raise RuntimeError("win32com 不可用，请安装 pywin32: pip install pywin32")
 
-    app = None
-    try:
-        pythoncom.CoInitialize()
-        app = win32com.client.Dispatch(app_name)
-        app.Visible = False
+    apps = getattr(_com_thread_state, "apps", None)
+    if apps is None:
+        raise RuntimeError("com_application 需要在 COM 线程中使用")
+
+    app = apps.get(app_name)
+    if app is None:
+        app = _dispatch_com_application(app_name)
+        # PowerPoint 不允许隐藏窗口，设置失败时忽略
+        with suppress(Exception):
+            app.Visible = False
         if hasattr(app, "DisplayAlerts"):
             app.DisplayAlerts = False
+        apps[app_name] = app
+    try:
         yield app
-    finally:
-        if app:
-            with suppress(Exception):
-                app.Quit()
+    except BaseException:
+        # 应用可能已失去响应，丢弃缓存
+        apps.pop(app_name, None)
         with suppress(Exception):
-            pythoncom.CoUninitialize()
+            app.Quit()
+        raise
+
+
+_FILE_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+# 错误信息中需要隐藏的路径：Windows 盘符路径与常见 Unix 目录
+_WINDOWS_PATH_RE = re.compile(r"[A-Za-z]:\\[^\s'\"]+")
+_UNIX_PATH_RE = re.compile(r"/(?:home|tmp|var|usr|opt|data)[^\s'\"]*")
 
 
 def format_file_size(size: int | float) -> str:
     """格式化文件大小"""
     if size <= 0:
         return "0 B"
-    for unit in ("B", "KB", "MB", "GB"):
-        if size < 1024:
-            return f"{size:.2f} {unit}"
-        size /= 1024
-    return f"{size:.2f} TB"
+    # bit_length 直接得到 1024 的幂次，无需逐级相除
+    index = min(max(0, (int(size).bit_length() - 1) // 10), 4)
+    return f"{size / (1 << (10 * index)):.2f} {_FILE_SIZE_UNITS[index]}"
+
+
+def _join_text_parts_limited(
+    parts: Iterable[str], separator: str, max_chars: int | None
+) -> str:
+    """拼接文本片段，超过 max_chars 后不再消费剩余片段，截断并追加提示
+
+    max_chars 为 None 或 0 时不限制。
+    """
+    collected: list[str] = []
+    total = 0
+    for part in parts:
+        if collected:
+            total += len(separator)
+        collected.append(part)
+        total += len(part)
+        if max_chars and total > max_chars:
+            text = separator.join(collected)[:max_chars]
+            return f"{text}\n\n[内容已截断，仅显示前 {max_chars} 个字符]"
+    return separator.join(collected)
 
 
 def safe_error_message(error: Exception, context: str = "") -> str:
@@ -84,12 +239,8 @@ def safe_error_message(error: Exception, context: str = "") -> str:
     # 移除可能包含路径的信息
     # 常见模式: 'D:\\path\\to\\file' 或 '/path/to/file'
 
-    # Windows 路径模式
-    error_str = re.sub(r"[A-Za-z]:\\[^\s'\"]+", "[路径已隐藏]", error_str)
-    # Unix 路径模式
-    error_str = re.sub(
-        r"/(?:home|tmp|var|usr|opt|data)[^\s'\"]*", "[路径已隐藏]", error_str
-    )
+    error_str = _WINDOWS_PATH_RE.sub("[路径已隐藏]", error_str)
+    error_str = _UNIX_PATH_RE.sub("[路径已隐藏]", error_str)
 
     if context:
         return f"{context}: {error_str}"
@@ -194,18 +345,22 @@ def extract_word_content(
     suffix = file_path.suffix.lower()
 
     if suffix == ".doc":
+        text = None
         if _ANTIWORD_AVAILABLE:
             text = _extract_doc_text_antiword(file_path)
         elif _WIN32COM_AVAILABLE:
             text = _extract_doc_text_win32com(file_path)
-        else:
+        # antiword 不支持较新的 .doc 变体，失败或缺少前两者时交给 LibreOffice
+        if not text and _find_libreoffice():
+            text = _extract_doc_text_libreoffice(file_path)
+        elif not (_ANTIWORD_AVAILABLE or _WIN32COM_AVAILABLE):
             if _IS_WINDOWS:
                 logger.warning(
-                    "读取 .doc 文件需要 pywin32 和 Microsoft Word，请安装: pip install pywin32"
+                    "读取 .doc 文件需要 pywin32 和 Microsoft Word 或 LibreOffice，请安装: pip install pywin32"
                 )
             else:
                 logger.warning(
-                    "读取 .doc 文件需要 antiword，请安装: apt install antiword (Linux) 或 brew install antiword (macOS)"
+                    "读取 .doc 文件需要 antiword 或 LibreOffice，请安装: apt install antiword (Linux) 或 brew install antiword (macOS)"
                 )
             return None
         if not text:
@@ -213,22 +368,23 @@ def extract_word_content(
         return ExtractedWordContent(text=text)
 
     try:
-        from docx import Document
-
-        doc = Document(file_path)
-        image_parts = _collect_docx_image_parts(doc)
-        image_count = len(image_parts)
-        image_rel_paths = _extract_docx_images(
-            image_parts,
-            file_path,
-            workspace_root,
-            include_images=include_images,
-        )
-        items = _extract_docx_items(
-            doc,
-            image_rel_paths,
-            include_images=include_images,
-        )
+        # 直接流式解析主文档 XML，无需构建完整的 python-docx Document 对象
+        with zipfile.ZipFile(file_path) as archive:
+            main_part = _find_docx_main_part(archive)
+            image_parts = _collect_docx_image_parts(archive, main_part)
+            image_count = len(image_parts)
+            image_rel_paths = _extract_docx_images(
+                image_parts,
+                file_path,
+                workspace_root,
+                include_images=include_images,
+            )
+            with archive.open(main_part) as stream:
+                items = _extract_docx_items(
+                    _iter_docx_body_children(stream),
+                    image_rel_paths,
+                    include_images=include_images,
+                )
         if not items and image_count == 0:
             return None
         image_paths = [
@@ -236,10 +392,9 @@ def extract_word_content(
             for item in items
             if item.type == WORD_ITEM_IMAGE and item.image_path is not None
         ]
+        # 段落文本在提取时已去除首尾空白并丢弃空段落，无需再次 strip
         text_items = [
-            item.text.strip()
-            for item in items
-            if item.type == WORD_ITEM_TEXT and item.text and item.text.strip()
+            item.text for item in items if item.type == WORD_ITEM_TEXT and item.text
         ]
         text = "\n".join(text_items) if text_items else None
         return ExtractedWordContent(
@@ -248,8 +403,6 @@ def extract_word_content(
             items=items,
             image_count=image_count,
         )
-    except ImportError:
-        return None
     except Exception as e:
         logger.warning(f"Word 文本提取失败: {e}", exc_info=True)
         return None
@@ -269,19 +422,74 @@ def extract_word_text(
     )
 
 
-def _collect_docx_image_parts(doc) -> list[tuple[str, bytes, str]]:
+_WORDML_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_DOCX_MAIN_PART = "word/document.xml"
+_OFFICE_DOCUMENT_REL_TYPE_SUFFIX = "/officeDocument"
+
+
+def _resolve_part_target(base_dir: str, target: str) -> str:
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join(base_dir, target))
+
+
+def _find_docx_main_part(archive: zipfile.ZipFile) -> str:
+    """从包关系中查找主文档部件，缺失时使用默认的 word/document.xml"""
+    try:
+        rels_root = ET.fromstring(archive.read("_rels/.rels"))
+    except (KeyError, ET.ParseError):
+        return _DOCX_MAIN_PART
+    for rel in rels_root.iter(f"{_PACKAGE_REL_NS}Relationship"):
+        if rel.get("Type", "").endswith(_OFFICE_DOCUMENT_REL_TYPE_SUFFIX):
+            return _resolve_part_target("", rel.get("Target", ""))
+    return _DOCX_MAIN_PART
+
+
+def _iter_docx_body_children(stream) -> Iterator[ET.Element]:
+    """逐个产出 w:body 的直接子元素，处理完即清空，内存只保留当前块"""
+    body_tag = f"{_WORDML_NS}body"
+    depth = 0
+    in_body = False
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            if depth == 2:
+                in_body = elem.tag == body_tag
+            continue
+        depth -= 1
+        if depth == 2 and in_body:
+            yield elem
+            elem.clear()
+
+
+def _collect_docx_image_parts(
+    archive: zipfile.ZipFile, main_part: str
+) -> list[tuple[str, bytes, str]]:
+    part_dir, part_name = posixpath.split(main_part)
+    try:
+        rels_root = ET.fromstring(
+            archive.read(posixpath.join(part_dir, "_rels", f"{part_name}.rels"))
+        )
+    except KeyError:
+        return []
+
+    names = set(archive.namelist())
     image_parts = []
-    for rel_id, rel in doc.part.rels.items():
-        if "image" not in rel.reltype:
+    for rel in rels_root.iter(f"{_PACKAGE_REL_NS}Relationship"):
+        if "image" not in rel.get("Type", ""):
+            continue
+        # 外链图片没有包内部件
+        if rel.get("TargetMode") == "External":
             continue
-        target_part = getattr(rel, "target_part", None)
-        if target_part is None:
+        partname = _resolve_part_target(part_dir, rel.get("Target", ""))
+        if partname not in names:
             continue
-        blob = getattr(target_part, "blob", None)
-        partname = getattr(target_part, "partname", "")
+        blob = archive.read(partname)
         if not blob:
             continue
-        image_parts.append((rel_id, blob, Path(str(partname)).suffix or ".bin"))
+        image_parts.append(
+            (rel.get("Id"), blob, posixpath.splitext(partname)[1] or ".bin")
+        )
 
     return image_parts
 
@@ -316,20 +524,20 @@ def _extract_docx_images(
 
 
 def _extract_docx_items(
-    doc,
+    body_children: Iterable[ET.Element],
     image_rel_paths: dict[str, Path],
     *,
     include_images: bool,
 ) -> list[ExtractedWordItem]:
     items: list[ExtractedWordItem] = []
 
-    for body_child in doc.element.body.iterchildren():
+    for body_child in body_children:
         local_name = body_child.tag.rsplit("}", 1)[-1]
         if local_name != "p":
             continue
 
         paragraph_buffer: list[str] = []
-        for child in body_child.iterchildren():
+        for child in body_child:
             child_name = child.tag.rsplit("}", 1)[-1]
             if child_name in {"r", "hyperlink", "smartTag", "sdt", "ins"}:
                 _collect_paragraph_items(
@@ -363,7 +571,7 @@ def _collect_paragraph_items(
     local_name = element.tag.rsplit("}", 1)[-1]
 
     if local_name == "r":
-        for child in element.iterchildren():
+        for child in element:
             child_name = child.tag.rsplit("}", 1)[-1]
             if child_name == "t":
                 if child.text:
@@ -391,7 +599,7 @@ def _collect_paragraph_items(
                         )
         return
 
-    for child in element.iterchildren():
+    for child in element:
         child_name = child.tag.rsplit("}", 1)[-1]
         if child_name in {"r", "hyperlink", "smartTag", "sdt", "ins"}:
             _collect_paragraph_items(
@@ -428,20 +636,109 @@ def _build_docx_asset_dir(file_path: Path, workspace_root: Path) -> Path:
     return workspace_root / ".read_assets" / f"{file_path.stem}_{digest}"
 
 
+# antiword DocBook 输出中按块收集文本的元素；bookinfo 为文档属性，不计入正文
+_DOCBOOK_BLOCK_TAGS = frozenset({"title", "para", "entry"})
+
+
+def _parse_antiword_docbook(xml_bytes: bytes) -> str | None:
+    """流式解析 antiword -x db 输出，按段落/表格行还原文本"""
+    lines: list[str] = []
+    row_cells: list[str] | None = None
+    bookinfo_depth = 0
+    for event, elem in ET.iterparse(io.BytesIO(xml_bytes), events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            if tag == "bookinfo":
+                bookinfo_depth += 1
+            elif tag == "row":
+                row_cells = []
+            continue
+        if tag == "bookinfo":
+            bookinfo_depth -= 1
+        elif tag == "row":
+            if row_cells and any(row_cells):
+                lines.append("\t".join(row_cells))
+            row_cells = None
+        elif row_cells is not None:
+            # 表格行内只在单元格结束时收集，单元格内的段落并入该格
+            if tag != "entry":
+                continue
+            row_cells.append(" ".join(elem.itertext()).strip())
+        elif tag in _DOCBOOK_BLOCK_TAGS and not bookinfo_depth:
+            text = "".join(elem.itertext()).strip()
+            if text:
+                lines.append(text)
+        else:
+            continue
+        elem.clear()
+    return "\n".join(lines) if lines else None
+
+
+def _run_antiword(*args: str, timeout: float = 30) -> tuple[int, bytes, bytes]:
+    """运行 antiword 并以字节形式返回 (returncode, stdout, stderr)
+
+    直接读取管道字节，由调用方一次性解码，避免 text 模式的换行转换和中间字符串。
+    超时时终止进程后抛出 subprocess.TimeoutExpired。
+    """
+    with subprocess.Popen(
+        ["antiword", *args],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    ) as proc:
+        try:
+            stdout, stderr = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            raise
+    return proc.returncode, stdout, stderr
+
+
+def _extract_doc_text_antiword_docbook(file_path: Path) -> str | None:
+    """使用 antiword 的 DocBook 输出提取 .doc 文本，保留段落与表格结构"""
+    try:
+        returncode, stdout, _stderr = _run_antiword(
+            "-x", "db", "-m", "UTF-8.txt", str(file_path.resolve())
+        )
+    except subprocess.TimeoutExpired:
+        logger.warning("antiword 执行超时")
+        raise
+    except Exception as e:
+        logger.debug(f"antiword DocBook 输出失败: {e}")
+        return None
+    if returncode != 0 or not stdout:
+        return None
+    try:
+        return _parse_antiword_docbook(stdout)
+    except ET.ParseError as e:
+        logger.debug(f"antiword DocBook 解析失败，回退纯文本输出: {e}")
+        return None
+
+
 def _extract_doc_text_antiword(file_path: Path) -> str | None:
-    """使用 antiword 提取 .doc 文件文本（Linux/macOS）"""
+    """使用 antiword 提取 .doc 文件文本（Linux/macOS）
+
+    优先解析 DocBook 输出，失败时回退到纯文本输出。
+    """
     try:
-        result = subprocess.run(
-            ["antiword", str(file_path.resolve())],
-            capture_output=True,
-            text=True,
-            errors="replace",
-            timeout=30,
+        text = _extract_doc_text_antiword_docbook(file_path)
+    except subprocess.TimeoutExpired:
+        # 同一文件再以纯文本模式运行大概率仍会超时
+        return None
+    if text:
+        return text
+    try:
+        returncode, stdout, stderr = _run_antiword(
+            "-m", "UTF-8.txt", str(file_path.resolve())
         )
-        if result.returncode == 0:
-            return result.stdout.strip() if result.stdout else None
+        if returncode == 0:
+            text = stdout.decode("utf-8", errors="replace").strip()
+            return text or None
         else:
-            logger.warning(f"antiword 执行失败: {result.stderr}")
+            logger.warning(
+                f"antiword 执行失败: {stderr.decode('utf-8', errors='replace')}"
+            )
             return None
     except subprocess.TimeoutExpired:
         logger.warning("antiword 执行超时")
@@ -451,6 +748,68 @@ def _extract_doc_text_antiword(file_path: Path) -> str | None:
         return None
 
 
+def _find_libreoffice() -> str | None:
+    return _discover_libreoffice(os.environ.get("PATH", os.defpath))
+
+
+def _convert_via_libreoffice(
+    file_path: Path, convert_to: str, output_suffix: str, output_dir: Path
+) -> Path | None:
+    """使用 LibreOffice 无界面转换文件，返回输出文件路径
+
+    每次转换使用临时用户配置目录，避免并发转换争用同一配置而失败。
+    """
+    libreoffice = _find_libreoffice()
+    if not libreoffice:
+        return None
+    cmd = [
+        libreoffice,
+        f"-env:UserInstallation={(output_dir / 'profile').as_uri()}",
+        "--headless",
+        "--invisible",
+        "--nologo",
+        "--nofirststartwizard",
+        "--convert-to",
+        convert_to,
+        "--outdir",
+        str(output_dir),
+        str(file_path.resolve()),
+    ]
+    try:
+        result = subprocess.run(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            timeout=60,
+        )
+    except subprocess.TimeoutExpired:
+        logger.warning("LibreOffice 转换超时")
+        return None
+    except Exception as e:
+        logger.warning(f"LibreOffice 转换出错: {e}")
+        return None
+    output_path = output_dir / f"{file_path.stem}{output_suffix}"
+    if result.returncode != 0 or not output_path.is_file():
+        stderr = result.stderr.decode("utf-8", errors="replace")
+        logger.warning(f"LibreOffice 转换失败: {stderr}")
+        return None
+    return output_path
+
+
+def _extract_doc_text_libreoffice(file_path: Path) -> str | None:
+    """使用 LibreOffice 将 .doc 转为 UTF-8 纯文本后读取（跨平台）"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_path = _convert_via_libreoffice(
+            file_path, "txt:Text (encoded):UTF8", ".txt", Path(temp_dir)
+        )
+        if output_path is None:
+            return None
+        text = output_path.read_text(encoding="utf-8-sig", errors="replace")
+    return text.strip() or None
+
+
+@_on_com_thread
 def _extract_doc_text_win32com(file_path: Path) -> str | None:
     """使用 win32com 提取 .doc 文件文本（仅 Windows）"""
     try:
@@ -467,16 +826,17 @@ def _extract_doc_text_win32com(file_path: Path) -> str | None:
         return None
 
 
-def extract_excel_text(file_path: Path) -> str | None:
-    """提取 Excel 表格文本（支持 .xlsx 和 .xls）"""
+def extract_excel_text(
+    file_path: Path, *, max_chars: int | None = DEFAULT_MAX_EXTRACTED_TEXT_CHARS
+) -> str | None:
+    """提取 Excel 表格文本（支持 .xlsx 和 .xls），总长度超过 max_chars 时截断"""
     extracted_sheets = extract_excel_sheets(file_path)
     if not extracted_sheets:
         return None
-    lines: list[str] = []
-    for sheet in extracted_sheets:
-        if sheet.text:
-            lines.append(sheet.text)
-    return "\n".join(lines) if lines else None
+    text = _join_text_parts_limited(
+        (sheet.text for sheet in extracted_sheets if sheet.text), "\n", max_chars
+    )
+    return text or None
 
 
 def extract_excel_sheets(
@@ -489,6 +849,17 @@ def extract_excel_sheets(
     """提取 Excel 工作簿中每个 Sheet 的文本内容。"""
     suffix = file_path.suffix.lower()
 
+    # calamine 原生解析 .xlsx 与旧格式 .xls，可用时优先使用
+    if _CALAMINE_AVAILABLE:
+        extracted_sheets = _extract_excel_sheets_calamine(
+            file_path,
+            max_rows=max_rows,
+            max_chars=max_chars,
+            max_sheets=max_sheets,
+        )
+        if extracted_sheets is not None:
+            return extracted_sheets
+
     if suffix == ".xls":
         extracted_sheets = _extract_xls_sheets_xlrd(
             file_path,
@@ -513,9 +884,9 @@ def extract_excel_sheets(
             )
         return None
 
+    if not _OPENPYXL_AVAILABLE:
+        return None
     try:
-        from openpyxl import load_workbook
-
         workbook = load_workbook(file_path, read_only=True, data_only=True)
         try:
             extracted_sheets: list[ExtractedExcelSheet] = []
@@ -547,13 +918,68 @@ def extract_excel_sheets(
         finally:
             with suppress(Exception):
                 workbook.close()
-    except ImportError:
-        return None
     except Exception as e:
         logger.warning(f"Excel 文本提取失败: {e}", exc_info=True)
         return None
 
 
+def _extract_excel_sheets_calamine(
+    file_path: Path,
+    *,
+    max_rows: int | None = None,
+    max_chars: int | None = None,
+    max_sheets: int | None = None,
+) -> list[ExtractedExcelSheet] | None:
+    """使用 python-calamine 提取工作簿文本，失败时返回 None 以回退到 openpyxl/xlrd"""
+    try:
+        workbook = CalamineWorkbook.from_path(str(file_path))
+        try:
+            extracted_sheets: list[ExtractedExcelSheet] = []
+            sheet_names = workbook.sheet_names
+            sheet_limit = _resolve_excel_preview_limit(
+                max_sheets,
+                _MAX_EXCEL_PREVIEW_SHEETS,
+            )
+            for sheet_index, sheet_name in enumerate(sheet_names, start=1):
+                if sheet_limit and sheet_index > sheet_limit:
+                    extracted_sheets.append(
+                        _build_omitted_excel_sheets_notice(
+                            omitted_count=len(sheet_names) - sheet_limit,
+                            max_sheets=sheet_limit,
+                        )
+                    )
+                    break
+                # 保留前导空行/空列，与 openpyxl 的输出保持一致
+                rows = workbook.get_sheet_by_name(sheet_name).to_python(
+                    skip_empty_area=False
+                )
+                extracted_sheets.append(
+                    ExtractedExcelSheet(
+                        name=sheet_name,
+                        text=_build_excel_sheet_preview(
+                            map(_normalize_calamine_row, rows),
+                            max_rows=max_rows,
+                            max_chars=max_chars,
+                        ),
+                    )
+                )
+            return extracted_sheets
+        finally:
+            with suppress(Exception):
+                workbook.close()
+    except Exception as e:
+        logger.debug(f"calamine 读取 Excel 失败，改用其他解析方式: {e}")
+        return None
+
+
+def _normalize_calamine_row(row: list) -> list:
+    # calamine 把所有数字读成 float，整数值还原为 int，避免预览中出现 "1.0"
+    return [
+        int(value) if type(value) is float and value.is_integer() else value
+        for value in row
+    ]
+
+
 def _resolve_excel_preview_limit(value: int | None, default: int) -> int:
     if value is None:
         value = default
@@ -579,7 +1005,12 @@ def _format_excel_preview_limit(value: int) -> str:
 
 
 def _format_excel_cell_preview(value) -> str:
-    text = "" if value is None else str(value)
+    if value is None:
+        return ""
+    text = value if type(value) is str else str(value)
+    # 绝大多数单元格不含制表符和换行，直接返回，省去四次 replace
+    if "\t" not in text and "\n" not in text and "\r" not in text:
+        return text
     text = text.replace("\r\n", "\n").replace("\r", "\n")
     return text.replace("\t", "\\t").replace("\n", "\\n")
 
@@ -591,10 +1022,7 @@ def _extract_openpyxl_sheet_preview(
     max_chars: int | None = None,
 ) -> str:
     return _build_excel_sheet_preview(
-        (
-            [_format_excel_cell_preview(value) for value in row]
-            for row in worksheet.iter_rows(values_only=True)
-        ),
+        worksheet.iter_rows(values_only=True),
         max_rows=max_rows,
         max_chars=max_chars,
     )
@@ -606,18 +1034,22 @@ def _build_excel_sheet_preview(
     max_rows: int | None = None,
     max_chars: int | None = None,
 ) -> str:
+    """按行生成预览文本，rows 为原始单元格值的可迭代对象，达到上限后不再继续读取"""
     lines: list[str] = []
     total_chars = 0
     truncated = False
     row_limit = _resolve_excel_preview_limit(max_rows, _MAX_EXCEL_PREVIEW_ROWS)
     char_limit = _resolve_excel_preview_limit(max_chars, _MAX_EXCEL_PREVIEW_CHARS)
 
+    join_cells = "\t".join
+    format_cell = _format_excel_cell_preview
+
     for row_index, row in enumerate(rows, start=1):
         if row_limit and row_index > row_limit:
             truncated = True
             break
 
-        line = "\t".join(_format_excel_cell_preview(value) for value in row)
+        line = join_cells(map(format_cell, row))
         newline_cost = 1 if lines else 0
         remaining_chars = char_limit - total_chars - newline_cost
         if char_limit and remaining_chars < len(line):
@@ -671,9 +1103,9 @@ def _extract_xls_sheets_xlrd(
     max_chars: int | None = None,
     max_sheets: int | None = None,
 ) -> list[ExtractedExcelSheet] | None:
+    if not _XLRD_AVAILABLE:
+        return None
     try:
-        import xlrd
-
         workbook = xlrd.open_workbook(str(file_path))
         extracted_sheets: list[ExtractedExcelSheet] = []
         sheets = workbook.sheets()
@@ -695,10 +1127,7 @@ def _extract_xls_sheets_xlrd(
                     name=sheet.name,
                     text=_build_excel_sheet_preview(
                         (
-                            [
-                                _format_excel_cell_preview(cell.value)
-                                for cell in sheet.row(row_idx)
-                            ]
+                            sheet.row_values(row_idx)
                             for row_idx in range(sheet.nrows)
                         ),
                         max_rows=max_rows,
@@ -707,13 +1136,12 @@ def _extract_xls_sheets_xlrd(
                 )
             )
         return extracted_sheets
-    except ImportError:
-        return None
     except Exception as e:
         logger.warning(f"xlrd 读取 .xls 失败: {e}")
         return None
 
 
+@_on_com_thread
 def _extract_xls_sheets_win32com(
     file_path: Path,
     *,
@@ -741,15 +1169,10 @@ def _extract_xls_sheets_win32com(
                         )
                         break
                     used_range = worksheet.UsedRange
-                    rows = []
-                    if used_range:
-                        for row in used_range.Rows:
-                            rows.append(
-                                [
-                                    _format_excel_cell_preview(cell.Value)
-                                    for cell in row.Cells
-                                ]
-                            )
+                    # 一次 COM 调用取回整个区域的值（嵌套元组），不再逐单元格跨进程访问
+                    values = used_range.Value if used_range else ()
+                    # 单个单元格的区域返回标量
+                    rows = values if isinstance(values, tuple) else ((values,),)
                     extracted_sheets.append(
                         ExtractedExcelSheet(
                             name=str(worksheet.Name),
@@ -769,33 +1192,168 @@ def _extract_xls_sheets_win32com(
         return None
 
 
-def extract_ppt_text(file_path: Path) -> str | None:
-    """提取 PPT 幻灯片文本（支持 .pptx 和 .ppt）"""
+def extract_pdf_pages_text(pdf, max_chars: int | None = None) -> str:
+    """按页拼接已打开的 pdfplumber PDF 文本，无文本时返回空字符串
+
+    超过 max_chars 后不再解析后续页面，截断并追加提示。
+    """
+    buffer = io.StringIO()
+    for index, page in enumerate(pdf.pages, 1):
+        if max_chars and buffer.tell() > max_chars:
+            break
+        page_text = page.extract_text()
+        if not page_text:
+            continue
+        if buffer.tell():
+            buffer.write("\n\n")
+        buffer.write(f"--- 第 {index} 页 ---\n")
+        buffer.write(page_text)
+    text = buffer.getvalue()
+    if max_chars and len(text) > max_chars:
+        return f"{text[:max_chars]}\n\n[内容已截断，仅显示前 {max_chars} 个字符]"
+    return text
+
+
+def extract_ppt_text(
+    file_path: Path, *, max_chars: int | None = DEFAULT_MAX_EXTRACTED_TEXT_CHARS
+) -> str | None:
+    """提取 PPT 幻灯片文本（支持 .pptx 和 .ppt），总长度超过 max_chars 时截断"""
     suffix = file_path.suffix.lower()
 
-    # 旧格式 .ppt 需要 win32com
+    # 旧格式 .ppt 优先使用 win32com，不可用或失败时由 LibreOffice 转为 .pptx 再解析
     if suffix == ".ppt":
-        return _extract_ppt_text_win32com(file_path)
-
-    # 新格式 .pptx 使用 python-pptx
+        libreoffice = _find_libreoffice()
+        if _WIN32COM_AVAILABLE or not libreoffice:
+            # 两者都不可用时由 win32com 分支给出安装提示
+            text = _extract_ppt_text_win32com(file_path, max_chars=max_chars)
+            if text or not libreoffice:
+                return text
+        return _extract_ppt_text_libreoffice(file_path, max_chars=max_chars)
+
+    # 新格式 .pptx 直接流式解析幻灯片 XML，无需构建完整的 Presentation 对象
     try:
-        from pptx import Presentation
-
-        prs = Presentation(file_path)
-        texts = []
-        for slide in prs.slides:
-            for shape in slide.shapes:
-                if hasattr(shape, "text") and shape.text.strip():
-                    texts.append(shape.text)
-        return "\n".join(texts)
-    except ImportError:
-        return None
+        with zipfile.ZipFile(file_path) as archive:
+            return _join_text_parts_limited(
+                (
+                    text
+                    for payload in _iter_prefetched_zip_parts(
+                        archive, _list_pptx_slide_parts(archive)
+                    )
+                    for text in _iter_pptx_shape_texts(payload)
+                ),
+                "\n",
+                max_chars,
+            )
     except Exception as e:
         logger.warning(f"PPT 文本提取失败: {e}", exc_info=True)
         return None
 
 
-def _extract_ppt_text_win32com(file_path: Path) -> str | None:
+def _extract_ppt_text_libreoffice(
+    file_path: Path, *, max_chars: int | None = None
+) -> str | None:
+    """使用 LibreOffice 将 .ppt 转为 .pptx 后流式解析（Impress 没有纯文本导出）"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pptx_path = _convert_via_libreoffice(file_path, "pptx", ".pptx", Path(temp_dir))
+        if pptx_path is None:
+            return None
+        return extract_ppt_text(pptx_path, max_chars=max_chars)
+
+
+_DRAWINGML_NS = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+_PRESENTATIONML_NS = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+_OFFICE_REL_NS = (
+    "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+)
+_PACKAGE_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_PPTX_SLIDE_PART_RE = re.compile(r"ppt/slides/slide(\d+)\.xml")
+
+
+def _list_pptx_slide_parts(archive: zipfile.ZipFile) -> list[str]:
+    """按演示文稿中的幻灯片顺序返回幻灯片 XML 部件名"""
+    names = set(archive.namelist())
+    try:
+        rels_root = ET.fromstring(archive.read("ppt/_rels/presentation.xml.rels"))
+        targets = {
+            rel.get("Id"): rel.get("Target", "")
+            for rel in rels_root.iter(f"{_PACKAGE_REL_NS}Relationship")
+        }
+        presentation_root = ET.fromstring(archive.read("ppt/presentation.xml"))
+        parts = []
+        for slide_id in presentation_root.iter(f"{_PRESENTATIONML_NS}sldId"):
+            target = targets.get(slide_id.get(f"{_OFFICE_REL_NS}id"), "")
+            if target.startswith("/"):
+                part = target.lstrip("/")
+            else:
+                part = posixpath.normpath(posixpath.join("ppt", target))
+            if part in names:
+                parts.append(part)
+        if parts:
+            return parts
+    except (KeyError, ET.ParseError):
+        pass
+
+    # 关系文件缺失或损坏时按文件名编号排序
+    numbered = [
+        (int(match.group(1)), name)
+        for name in names
+        if (match := _PPTX_SLIDE_PART_RE.fullmatch(name))
+    ]
+    return [name for _, name in sorted(numbered)]
+
+
+def _iter_prefetched_zip_parts(
+    archive: zipfile.ZipFile, parts: list[str]
+) -> Iterator[bytes]:
+    """按顺序读取压缩包成员，调用方解析当前成员时由后台线程预取下一个
+
+    同一时刻最多多持有一个成员的原始字节。
+    """
+    if len(parts) <= 1:
+        for part in parts:
+            yield archive.read(part)
+        return
+
+    # 只有预取线程访问压缩包，调用方只处理已读出的字节
+    with ThreadPoolExecutor(max_workers=1) as prefetcher:
+        pending = prefetcher.submit(archive.read, parts[0])
+        for next_part in parts[1:]:
+            payload = pending.result()
+            pending = prefetcher.submit(archive.read, next_part)
+            yield payload
+        yield pending.result()
+
+
+def _iter_pptx_shape_texts(payload: bytes) -> Iterator[str]:
+    """流式遍历幻灯片中各形状的文本，与 python-pptx 的 shape.text 格式一致"""
+    runs: list[str] = []
+    paragraphs: list[str] = []
+    with io.BytesIO(payload) as stream:
+        for _, elem in ET.iterparse(stream, events=("end",)):
+            tag = elem.tag
+            if tag == f"{_DRAWINGML_NS}t":
+                runs.append(elem.text or "")
+            elif tag == f"{_DRAWINGML_NS}br":
+                runs.append("\v")
+            elif tag == f"{_DRAWINGML_NS}p":
+                paragraphs.append("".join(runs))
+                runs = []
+                elem.clear()
+            elif tag == f"{_DRAWINGML_NS}txBody":
+                # 表格单元格等非形状文本框，python-pptx 的 shape.text 不包含
+                paragraphs = []
+            elif tag == f"{_PRESENTATIONML_NS}txBody":
+                text = "\n".join(paragraphs)
+                paragraphs = []
+                elem.clear()
+                if text.strip():
+                    yield text
+
+
+@_on_com_thread
+def _extract_ppt_text_win32com(
+    file_path: Path, *, max_chars: int | None = None
+) -> str | None:
     """使用 win32com 提取 .ppt 文件文本（仅 Windows）"""
     if not _WIN32COM_AVAILABLE:
         if _IS_WINDOWS:
@@ -804,7 +1362,7 @@ def _extract_ppt_text_win32com(file_path: Path) -> str | None:
             )
         else:
             logger.warning(
-                "读取 .ppt 旧格式文件仅支持 Windows 环境，请将文件另存为 .pptx 格式"
+                "读取 .ppt 旧格式文件需要 Windows 环境或 LibreOffice，或将文件另存为 .pptx 格式"
             )
         return None
 
@@ -812,14 +1370,17 @@ def _extract_ppt_text_win32com(file_path: Path) -> str | None:
         with com_application("PowerPoint.Application") as app:
             ppt = app.Presentations.Open(str(file_path.resolve()), WithWindow=False)
             try:
-                texts = []
-                for slide in ppt.Slides:
-                    for shape in slide.Shapes:
-                        if shape.HasTextFrame:
-                            text_frame = shape.TextFrame
-                            if text_frame.HasText:
-                                texts.append(text_frame.TextRange.Text)
-                return "\n".join(texts) if texts else None
+                text = _join_text_parts_limited(
+                    (
+                        shape.TextFrame.TextRange.Text
+                        for slide in ppt.Slides
+                        for shape in slide.Shapes
+                        if shape.HasTextFrame and shape.TextFrame.HasText
+                    ),
+                    "\n",
+                    max_chars,
+                )
+                return text or None
             finally:
                 with suppress(Exception):
                     ppt.Close()